@@ -0,0 +1,221 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageOps, ImageTk
+
+# Every minigame pulls its sprites from here
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "minigames", "assets")
+# Pre-scaled variants written by buildAssets.py
+BUILD_DIR = os.path.join(ASSET_DIR, "build")
+MANIFEST_NAME = "manifest.json"
+DEFAULT_BUDGET_MB = 64
+# Name fragments of sprites that aren't a standalone character: hooks, run frames, dead skins, mirrored poses
+NON_CHARACTER = ("hook", "run", "dead", "crouch_right", "jump_right")
+
+
+def variant_key(name, size=None, transform=None):
+    """Stable manifest key for one (file, size, transform) sprite."""
+    return f"{name}|{size!r}|{transform}"
+
+
+def variant_filename(name, size=None, transform=None):
+    stem = os.path.splitext(name)[0]
+    if size is None:
+        size_code = "native"
+    elif isinstance(size, int):
+        size_code = f"sub{size}"
+    elif size[1] is None:
+        size_code = f"w{size[0]}"
+    else:
+        size_code = f"{size[0]}x{size[1]}"
+    suffix = f"_{transform}" if transform else ""
+    return f"{stem}__{size_code}{suffix}.png"
+
+
+def sprite_files(exclude=(), asset_dir=ASSET_DIR):
+    """Every .png in the asset folder whose name contains none of the exclude substrings, sorted."""
+    try:
+        names = os.listdir(asset_dir)
+    except FileNotFoundError:
+        return []
+    return sorted(f for f in names if f.endswith(".png") and not any(part in f for part in exclude))
+
+
+def load_manifest(build_dir=BUILD_DIR):
+    try:
+        with open(os.path.join(build_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"sources": {}, "variants": {}}
+
+
+class AssetCache:
+    """
+    Decoded, scaled sprites shared by every minigame for the life of the process.
+
+    Entries are keyed on (file, size, transform):
+      size      - None (native), (w, h), (w, None) to keep the aspect ratio,
+                  or an int n meaning 1/n of the source like PhotoImage.subsample(n)
+      transform - None or "mirror"
+    Once the decoded pixels go over the budget the least recently used entries are dropped.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_MB * 1024 * 1024, asset_dir=ASSET_DIR, build_dir=BUILD_DIR):
+        self.budget_bytes = budget_bytes
+        self.asset_dir = asset_dir
+        self.build_dir = build_dir
+        self._manifest = None
+        self._entries = OrderedDict()  # key -> (object, size in bytes)
+        self._used_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prebuilt_loads = 0
+
+    # --- PUBLIC API ---
+    def photo(self, name, size=None, transform=None):
+        """Returns a Tk-ready PhotoImage. Must be called from the Tk thread."""
+        key = ("photo", name, size, transform)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        img = self._image(name, size, transform, count=False)
+        photo = ImageTk.PhotoImage(img)
+        self._store(key, photo, img.width * img.height * 4)
+        return photo
+
+    def image(self, name, size=None, transform=None):
+        """Returns the decoded PIL image, for games that still post-process it (rotate, etc.)."""
+        return self._image(name, size, transform)
+
+    def warm(self, name, size=None, transform=None):
+        """
+        Decodes a sprite ahead of time without touching Tk, so it is safe on a worker thread.
+        The Tk-side photo() call that follows only has to wrap the already scaled pixels.
+        """
+        self._image(name, size, transform, count=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "used_mb": round(self._used_bytes / (1024 * 1024), 1),
+                "budget_mb": round(self.budget_bytes / (1024 * 1024), 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "prebuilt": self.prebuilt_loads,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._used_bytes = 0
+
+    # --- INTERNALS ---
+    def _image(self, name, size, transform, count=True):
+        key = ("image", name, size, transform)
+        cached = self._lookup(key, count)
+        if cached is not None:
+            return cached
+        img = self._decode(name, size, transform)
+        self._store(key, img, img.width * img.height * 4)
+        return img
+
+    def _lookup(self, key, count=True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[0]
+
+    def _store(self, key, obj, nbytes):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._used_bytes -= old[1]
+            self._entries[key] = (obj, nbytes)
+            self._used_bytes += nbytes
+
+            # Evict the coldest sprites, but never the one we just made
+            while self._used_bytes > self.budget_bytes and len(self._entries) > 1:
+                _, (_, old_bytes) = self._entries.popitem(last=False)
+                self._used_bytes -= old_bytes
+                self.evictions += 1
+
+    def _decode(self, name, size, transform):
+        prebuilt = self._prebuilt_path(name, size, transform)
+        if prebuilt is not None:
+            try:
+                img = Image.open(prebuilt).convert("RGBA")
+                self.prebuilt_loads += 1
+                return img
+            except OSError:
+                pass  # Fall back to the full-size source below
+
+        return self.render_variant(name, size, transform)
+
+    def _prebuilt_path(self, name, size, transform):
+        """Path of the pre-scaled copy, if the manifest says it still matches its source."""
+        if self._manifest is None:
+            self._manifest = load_manifest(self.build_dir)
+
+        variant = self._manifest["variants"].get(variant_key(name, size, transform))
+        source = self._manifest["sources"].get(name)
+        if variant is None or source is None:
+            return None
+
+        # A stat is enough at runtime; the build step is what compares content hashes
+        try:
+            st = os.stat(os.path.join(self.asset_dir, name))
+        except OSError:
+            return None
+        if st.st_size != source["bytes"] or st.st_mtime_ns != source["mtime_ns"]:
+            return None
+        return os.path.join(self.build_dir, variant["file"])
+
+    def render_variant(self, name, size=None, transform=None):
+        """Decodes the full-size source and applies size/transform. Used by the cache and the build step."""
+        img = Image.open(os.path.join(self.asset_dir, name)).convert("RGBA")
+
+        if isinstance(size, int):
+            # Matches PhotoImage.subsample(n): keep every nth pixel
+            w, h = img.size
+            img = img.resize(((w + size - 1) // size, (h + size - 1) // size), Image.Resampling.NEAREST)
+        elif size is not None:
+            w, h = size
+            if h is None:
+                h = max(1, int(img.height * (w / img.width)))
+            if (w, h) != img.size:
+                img = img.resize((w, h), Image.Resampling.LANCZOS)
+
+        if transform == "mirror":
+            img = ImageOps.mirror(img)
+        elif transform is not None:
+            raise ValueError(f"Unknown asset transform: {transform}")
+        return img
+
+
+# --- SHARED INSTANCE ---
+# The hub installs its own cache at startup. Debug runners fall back to a default one.
+_shared = None
+
+
+def install(cache):
+    global _shared
+    _shared = cache
+
+
+def shared():
+    global _shared
+    if _shared is None:
+        _shared = AssetCache()
+    return _shared
@@ -0,0 +1,99 @@
+# Offline asset build: writes pre-scaled / pre-mirrored copies of every sprite the minigames ask for,
+# so the hub loads small files at runtime instead of decoding and resizing the full-size PNGs.
+#
+#   python buildAssets.py            rebuild whatever is missing or stale
+#   python buildAssets.py --force    rebuild everything
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+
+import assetCache
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "minigames")
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def collect_references():
+    """Gathers the ASSETS declared by every module in minigames/. Returns {variant key: spec}."""
+    specs = {}
+    game_names = sorted(f[:-3] for f in os.listdir(GAMES_DIR) if f.endswith(".py") and f != "__init__.py")
+    for game in game_names:
+        try:
+            module = importlib.import_module(f"minigames.{game}")
+        except Exception as e:
+            print(f"BUILD: skipping {game}, import failed: {e}")
+            continue
+        for name, size, transform in getattr(module, "ASSETS", []):
+            specs[assetCache.variant_key(name, size, transform)] = (name, size, transform)
+    return specs
+
+
+def build(force=False, build_dir=assetCache.BUILD_DIR):
+    os.makedirs(build_dir, exist_ok=True)
+    old = assetCache.load_manifest(build_dir)
+    manifest = {"sources": {}, "variants": {}}
+    renderer = assetCache.AssetCache(build_dir=build_dir)
+    built = skipped = 0
+
+    for key, (name, size, transform) in sorted(collect_references().items()):
+        source_path = os.path.join(assetCache.ASSET_DIR, name)
+        if not os.path.exists(source_path):
+            print(f"BUILD: missing source {name}")
+            continue
+
+        if name not in manifest["sources"]:
+            st = os.stat(source_path)
+            manifest["sources"][name] = {
+                "sha256": file_sha256(source_path),
+                "bytes": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+            }
+        source = manifest["sources"][name]
+
+        out_name = assetCache.variant_filename(name, size, transform)
+        out_path = os.path.join(build_dir, out_name)
+        previous = old["variants"].get(key)
+        fresh = (previous is not None and previous.get("source_sha256") == source["sha256"]
+                 and os.path.exists(out_path))
+
+        if fresh and not force:
+            skipped += 1
+        else:
+            renderer.render_variant(name, size, transform).save(out_path, optimize=True)
+            built += 1
+        manifest["variants"][key] = {"file": out_name, "source": name, "source_sha256": source["sha256"]}
+
+    # Drop variants nobody references any more
+    keep = {v["file"] for v in manifest["variants"].values()}
+    removed = 0
+    for f in os.listdir(build_dir):
+        if f.endswith(".png") and f not in keep:
+            os.remove(os.path.join(build_dir, f))
+            removed += 1
+
+    with open(os.path.join(build_dir, assetCache.MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    print(f"BUILD: {built} built, {skipped} up to date, {removed} removed -> {build_dir}")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-scale minigame sprites into the asset build cache.")
+    parser.add_argument("--force", action="store_true", help="rebuild every variant even if its source is unchanged")
+    args = parser.parse_args(argv)
+    build(force=args.force)
+
+
+if __name__ == "__main__":
+    main()
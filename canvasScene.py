@@ -0,0 +1,134 @@
+import tkinter as tk
+
+DEFAULT_LAYERS = ("background", "world", "sprites", "hud")
+
+
+class Scene:
+    """
+    Retained-mode drawing on top of a tk.Canvas, instead of canvas.delete("all") and redrawing every frame.
+
+    Each frame, draw everything that should be visible with a key that names the logical object:
+
+        scene.begin()
+        scene.oval(("token", i), x - r, y - r, x + r, y + r, fill=color, layer="sprites")
+        scene.text("timer", 400, 35, text=f"{timer:.1f}", fill="white", layer="hud")
+        scene.end()
+
+    The first time a key is drawn its canvas item is created. After that only what changed is sent to Tk
+    (coords() when it moved, itemconfig() for the options that differ), and keys that were not drawn this
+    frame are deleted in end(). Things that never change go in with add() once and are left alone.
+
+    Layers stack bottom to top in the order given, regardless of when their items were created.
+    """
+
+    def __init__(self, canvas, layers=DEFAULT_LAYERS):
+        self.canvas = canvas
+        self.layers = tuple(layers)
+        self._items = {}  # key -> [item id, kind, coords, options]
+        self._seen = set()
+        self.created = 0
+        self.updated = 0
+        self.deleted = 0
+
+        # One hidden marker per layer; a layer's items always sit just below its marker
+        self._markers = {}
+        for name in self.layers:
+            self._markers[name] = canvas.create_line(0, 0, 0, 0, state="hidden", tags=(self._tag(name),))
+
+    # --- FRAME API ---
+    def begin(self):
+        self._seen = set()
+
+    def end(self):
+        """Deletes every keyed item that was not drawn since begin()."""
+        gone = [key for key in self._items if key not in self._seen]
+        for key in gone:
+            self.canvas.delete(self._items.pop(key)[0])
+        self.deleted += len(gone)
+
+    def rect(self, key, *coords, layer="world", **options):
+        return self._draw(key, "rectangle", coords, layer, options)
+
+    def oval(self, key, *coords, layer="world", **options):
+        return self._draw(key, "oval", coords, layer, options)
+
+    def line(self, key, *coords, layer="world", **options):
+        return self._draw(key, "line", coords, layer, options)
+
+    def polygon(self, key, *coords, layer="world", **options):
+        return self._draw(key, "polygon", coords, layer, options)
+
+    def text(self, key, *coords, layer="hud", **options):
+        return self._draw(key, "text", coords, layer, options)
+
+    def image(self, key, *coords, layer="sprites", **options):
+        return self._draw(key, "image", coords, layer, options)
+
+    # --- STATIC ITEMS ---
+    def add(self, kind, *coords, layer="background", **options):
+        """Creates an item that is never diffed or removed by end(), e.g. arena borders and peg fields."""
+        tags = options.pop("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        item = getattr(self.canvas, f"create_{kind}")(*coords, tags=tuple(tags) + ("static",), **options)
+        self.canvas.tag_lower(item, self._markers[layer])
+        return item
+
+    def clear_static(self):
+        self.canvas.delete("static")
+
+    def clear(self):
+        """Drops every item the scene made (keyed and static), leaving an empty canvas with the same layers."""
+        for item, *_ in self._items.values():
+            self.canvas.delete(item)
+        self._items.clear()
+        self.clear_static()
+
+    def item(self, key):
+        entry = self._items.get(key)
+        return entry[0] if entry else None
+
+    def __len__(self):
+        return len(self._items)
+
+    # --- INTERNALS ---
+    def _draw(self, key, kind, coords, layer, options):
+        self._seen.add(key)
+        coords = tuple(coords[0]) if len(coords) == 1 and isinstance(coords[0], (list, tuple)) else coords
+        entry = self._items.get(key)
+
+        if entry is None or entry[1] != kind:
+            if entry is not None:
+                self.canvas.delete(entry[0])
+            item = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+            self.canvas.tag_lower(item, self._markers[layer])
+            self._items[key] = [item, kind, coords, dict(options)]
+            self.created += 1
+            return item
+
+        item, _, old_coords, old_options = entry
+        if coords != old_coords:
+            self.canvas.coords(item, *coords)
+            entry[2] = coords
+            self.updated += 1
+        changed = {k: v for k, v in options.items() if old_options.get(k, _MISSING) != v}
+        if changed:
+            self.canvas.itemconfig(item, **changed)
+            old_options.update(changed)
+            self.updated += 1
+        return item
+
+    @staticmethod
+    def _tag(layer):
+        return f"layer:{layer}"
+
+
+_MISSING = object()
+
+
+def item_count(canvas):
+    """Live canvas items, for the perf overlay."""
+    try:
+        return len(canvas.find_all())
+    except tk.TclError:
+        return 0
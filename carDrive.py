@@ -0,0 +1,271 @@
+import bisect
+import multiprocessing
+import select
+import socket
+import threading
+import time
+
+import drive_protocol
+import inputService
+
+# The joystick -> UDP drive stream for the cars. By default it runs as a thread inside the hub; with
+# start_process() it gets its own interpreter (and its own controller polling), so a minigame that holds the
+# GIL for a whole frame can't delay the cars. Everything the loop reads from the hub (which controller drives
+# which car) and everything it reports back lives in shared memory on the DriveLink.
+#
+# The loop sends from a socket of its own and reads the cars' ECHO replies off it, which gives per-car
+#   rtt      - hub sent the command -> echo back at the hub
+#   one_way  - estimated hub -> ESC time: half the network round trip plus however long the car held it
+
+DRIVE_TICK_S = 0.02  # How often the car sticks are read; a changed command goes out on the next tick
+DRIVE_HEARTBEAT_S = 0.08  # An unchanged command is only resent this often, to keep the Pi's 200 ms watchdog fed
+STICK_DEADZONE = 0.20
+
+# Pacing histograms, per car. Bucket i counts samples up to edge i (ms); the last bucket catches the rest.
+#   interval - time between two consecutive ticks reading that car's stick (should sit at DRIVE_TICK_S)
+#   late     - how long after its deadline that car's command was handled
+INTERVAL_BUCKETS_MS = (5, 10, 15, 18, 19, 20, 21, 22, 25, 30, 40, 60, 100, 250, float("inf"))
+LATE_BUCKETS_MS = (0.5, 1, 2, 3, 5, 10, 20, 50, 100, float("inf"))
+
+LATENCY_WINDOW = 256  # Echoes kept per car for the rolling percentiles
+IN_FLIGHT_LIMIT = 512  # Sent commands remembered while waiting for their echo (older ones count as lost)
+
+# Never fork the hub: Tk and the input thread are already running in it
+_mp = multiprocessing.get_context("spawn")
+
+
+def stick_command(x, y):
+    """
+    The (x, y) a DRIVE packet carries for one car stick: the raw stick, deadzoned and rounded so a resting hand
+    doesn't count as a change. The car does the arcade mix and caps it at the power level the hub last pushed.
+    """
+    x = 0.0 if abs(x) < STICK_DEADZONE else round(x, 2)
+    y = 0.0 if abs(y) < STICK_DEADZONE else round(y, 2)
+    return x, y
+
+
+class DriveLink:
+    """What the hub and the drive loop share. Safe to hand to another process."""
+
+    def __init__(self, cars, joysticks):
+        """cars is {team: (ip, port)}, joysticks is {team: controller index}."""
+        self.teams = list(cars)
+        self.cars = dict(cars)
+        self.joysticks = _mp.Array("i", [joysticks[team] for team in self.teams])
+        self.running = _mp.Value("b", 0)
+        # Per car: packets sent, and ticks where sending every DRIVE_TICK_S would have sent a duplicate
+        self._counts = _mp.Array("q", 2 * len(self.teams))
+        # Per car: INTERVAL_BUCKETS_MS counts followed by LATE_BUCKETS_MS counts
+        self._pacing = _mp.Array("q", len(self.teams) * (len(INTERVAL_BUCKETS_MS) + len(LATE_BUCKETS_MS)))
+        # Per car: a ring of the last LATENCY_WINDOW rtt samples, then one of one_way samples (ms)
+        self._latency = _mp.Array("d", len(self.teams) * 2 * LATENCY_WINDOW)
+        self._echoes = _mp.Array("q", len(self.teams))  # Echoes recorded per car; the ring position
+
+        self.thread = None
+        self.process = None
+
+    # --- HUB SIDE ---
+    def start_thread(self, snapshot, senders):
+        """Runs the loop in this process, on the hub's input snapshots and packet builders."""
+        self.running.value = 1
+        self.thread = threading.Thread(target=run, args=(self, snapshot, senders), daemon=True)
+        self.thread.start()
+        return self
+
+    def start_process(self):
+        """Runs the loop in a child process that polls the controllers itself."""
+        self.running.value = 1
+        process = _mp.Process(target=_process_main, args=(self,), name="car-drive", daemon=True)
+        process.start()
+        self.process = process
+        return self
+
+    def stop(self):
+        self.running.value = 0
+        if self.process is not None:
+            self.process.join(timeout=1.0)
+            self.process = None
+
+    def set_joystick(self, team, joy):
+        self.joysticks[self.teams.index(team)] = joy
+
+    def take_counts(self):
+        """Returns {team: (sent, saved)} since the last call and starts counting again."""
+        with self._counts.get_lock():
+            counts = list(self._counts)
+            for i in range(len(counts)):
+                self._counts[i] = 0
+        return {team: (counts[2 * i], counts[2 * i + 1]) for i, team in enumerate(self.teams)}
+
+    def take_pacing(self):
+        """Returns {team: (interval counts, late counts)} since the last call and starts counting again."""
+        per_car = len(INTERVAL_BUCKETS_MS) + len(LATE_BUCKETS_MS)
+        with self._pacing.get_lock():
+            counts = list(self._pacing)
+            for i in range(len(counts)):
+                self._pacing[i] = 0
+        result = {}
+        for i, team in enumerate(self.teams):
+            car = counts[i * per_car:(i + 1) * per_car]
+            result[team] = (car[:len(INTERVAL_BUCKETS_MS)], car[len(INTERVAL_BUCKETS_MS):])
+        return result
+
+    def latency(self, pcts=(50, 95, 99)):
+        """
+        Rolling percentiles over each car's last LATENCY_WINDOW echoes:
+        {team: {"samples": echoes so far, "rtt": {pct: ms}, "one_way": {pct: ms}}}. Empty dicts before any echo.
+        """
+        result = {}
+        with self._latency.get_lock():
+            latency = list(self._latency)
+            echoes = list(self._echoes)
+        for i, team in enumerate(self.teams):
+            n = min(echoes[i], LATENCY_WINDOW)
+            base = i * 2 * LATENCY_WINDOW
+            rtt = sorted(latency[base:base + n])
+            one_way = sorted(latency[base + LATENCY_WINDOW:base + LATENCY_WINDOW + n])
+            result[team] = {
+                "samples": echoes[i],
+                "rtt": {pct: percentile(rtt, pct) for pct in pcts} if n else {},
+                "one_way": {pct: percentile(one_way, pct) for pct in pcts} if n else {},
+            }
+        return result
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["thread"] = state["process"] = None  # Only the shared values cross into the child
+        return state
+
+    # --- LOOP SIDE ---
+    def _count(self, index, sent):
+        with self._counts.get_lock():
+            self._counts[2 * index + (0 if sent else 1)] += 1
+
+    def _record_pacing(self, index, interval_ms, late_ms):
+        base = index * (len(INTERVAL_BUCKETS_MS) + len(LATE_BUCKETS_MS))
+        with self._pacing.get_lock():
+            if interval_ms is not None:
+                self._pacing[base + bisect.bisect_left(INTERVAL_BUCKETS_MS, interval_ms)] += 1
+            self._pacing[base + len(INTERVAL_BUCKETS_MS) + bisect.bisect_left(LATE_BUCKETS_MS, late_ms)] += 1
+
+    def _record_latency(self, index, rtt_ms, one_way_ms):
+        with self._latency.get_lock():
+            slot = self._echoes[index] % LATENCY_WINDOW
+            base = index * 2 * LATENCY_WINDOW
+            self._latency[base + slot] = rtt_ms
+            self._latency[base + LATENCY_WINDOW + slot] = one_way_ms
+            self._echoes[index] += 1
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def bucket_percentile(counts, edges, pct):
+    """Upper edge (ms) of the bucket holding the pct-th percentile sample, or None with no samples."""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = pct / 100 * total
+    seen = 0
+    for count, edge in zip(counts, edges):
+        seen += count
+        if seen >= rank:
+            return edge
+    return edges[-1]
+
+
+def run(link, snapshot, senders):
+    """The drive loop. snapshot() returns an inputService.InputSnapshot; senders is {team: drive_protocol.Sender}."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    last_sent = {}  # team -> (command, monotonic time it went out)
+    last_handled = {}  # team -> monotonic time its previous tick was handled
+    in_flight = {}  # (session, seq) -> (car index, sent_ns), oldest first
+
+    # Paced against absolute deadlines, so work time and sleep overshoot don't add up into drift
+    deadline = time.monotonic()
+    try:
+        while link.running.value:
+            snap = snapshot()
+
+            for index, team in enumerate(link.teams):
+                joy = link.joysticks[index]
+                if joy >= len(snap.controllers):
+                    continue
+                command = stick_command(snap.axis(joy, 0), snap.axis(joy, 1))
+                # A motor wired backwards is fixed on its car (LEFT_SIDE_FLIP / RIGHT_SIDE_FLIP), not here
+
+                now = time.monotonic()
+                previous_tick = last_handled.get(team)
+                link._record_pacing(index, None if previous_tick is None else (now - previous_tick) * 1000,
+                                    max(0.0, now - deadline) * 1000)
+                last_handled[team] = now
+
+                # Send on change, otherwise only as a heartbeat
+                previous = last_sent.get(team)
+                if previous is not None and previous[0] == command and now - previous[1] < DRIVE_HEARTBEAT_S:
+                    link._count(index, sent=False)
+                    continue
+                data = senders[team].drive(*command)
+                try:
+                    sock.sendto(data, link.cars[team])
+                except OSError:
+                    pass
+                last_sent[team] = (command, now)
+                link._count(index, sent=True)
+
+                packet = drive_protocol.unpack(data)
+                in_flight[(packet.session, packet.seq)] = (index, packet.sent_ns)
+                if len(in_flight) > IN_FLIGHT_LIMIT:
+                    del in_flight[next(iter(in_flight))]
+
+            deadline += DRIVE_TICK_S
+            if deadline - time.monotonic() < -DRIVE_TICK_S:
+                deadline = time.monotonic()  # Missed a whole tick (process stalled); carry on from now, no burst
+
+            # Wait out the tick on the socket, so echoes are timestamped as they arrive
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                ready, _, _ = select.select([sock], [], [], remaining)
+                if ready:
+                    _read_echoes(link, sock, in_flight)
+    finally:
+        sock.close()
+
+
+def _read_echoes(link, sock, in_flight):
+    while True:
+        try:
+            data = sock.recv(1024)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            continue  # ICMP unreachable from a car that is off; keep draining
+        received_ns = time.time_ns()
+        packet = drive_protocol.unpack(data)
+        if packet is None or packet.type != drive_protocol.ECHO:
+            continue
+        sent = in_flight.pop((packet.session, packet.seq), None)
+        if sent is None:
+            continue  # Too old, or from before a restart
+        index, sent_ns = sent
+        rtt_ms = (received_ns - sent_ns) / 1e6
+        held_ms = min(packet.a, rtt_ms)
+        # The car's clock isn't synced with ours, so only durations it measured itself are used
+        link._record_latency(index, rtt_ms, (rtt_ms - held_ms) / 2 + held_ms)
+
+
+def _process_main(link):
+    inputs = inputService.InputService()
+    inputs.start()
+    # A session of its own: the Pi tracks drive and control sequence numbers separately
+    senders = {team: drive_protocol.Sender() for team in link.teams}
+    print(f"DRIVE: running in process {multiprocessing.current_process().pid}")
+    try:
+        run(link, inputs.snapshot, senders)
+    finally:
+        inputs.stop()
@@ -0,0 +1,190 @@
+# Stand-in for the car Pis, so the hub's network path can be tested with no hardware.
+#
+# Each virtual car is the real motor_controller.main on gpiozero's mock pins, in a process of its own
+# (motor_controller keeps its state in module globals). In front of each one sits a small UDP relay that binds
+# the address the hub sends to and plays a bad network in both directions: packet loss, extra latency with
+# jitter, and reordering.
+#
+#   python car_sim.py                                   both cars, clean network
+#   python car_sim.py --loss 0.05 --latency-ms 30 --jitter-ms 15 --reorder 0.02 --log motors.csv
+#   python minigameRunner.py --sim                      hub pointed at the simulator
+#
+# The cars listen on different loopback addresses (all of 127.0.0.0/8 is local on Linux), so the hub's
+# one-port-per-car setup works unchanged.
+
+import argparse
+import heapq
+import itertools
+import multiprocessing
+import random
+import select
+import socket
+import threading
+import time
+
+SIM_CARS = {"Team A": "127.0.0.1", "Team B": "127.0.0.2"}  # Same as minigameRunner.SIM_IPS
+UDP_PORT = 5005
+CAR_PORT_BASE = 15005  # Where the relays hand packets to the car processes (one port per car)
+STATUS_INTERVAL = 1.0
+
+
+class Impairment:
+    """What the relay does to each packet, in either direction."""
+
+    def __init__(self, loss=0.0, latency_ms=0.0, jitter_ms=0.0, reorder=0.0, reorder_ms=40.0, seed=None):
+        self.loss = loss
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.reorder = reorder
+        self.reorder_ms = reorder_ms
+        self.random = random.Random(seed)
+
+    def delay(self):
+        """Seconds to hold a packet, or None to drop it."""
+        if self.random.random() < self.loss:
+            return None
+        ms = self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)
+        if self.random.random() < self.reorder:
+            ms += self.reorder_ms  # Held back long enough for the packets behind it to overtake
+        return max(0.0, ms) / 1000
+
+
+class Relay:
+    """
+    Binds the address the hub sends to and forwards, impaired, to one car process and back. Like a NAT, each
+    hub socket gets its own socket toward the car, so acks and echoes find their way back to the right one.
+    """
+
+    def __init__(self, name, public, car, impairment):
+        self.name = name
+        self.car = car
+        self.impairment = impairment
+        self.counts = {"in": 0, "out": 0, "dropped": 0, "delayed": 0}
+
+        self.public = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.public.bind(public)
+        self._flows = {}  # hub address -> socket toward the car
+        self._hubs = {}  # socket toward the car -> hub address its replies go back to
+        self._queue = []  # (due, order, socket, data, address)
+        self._order = itertools.count()
+
+    def run(self, stop):
+        while not stop.is_set():
+            timeout = 0.1
+            if self._queue:
+                timeout = min(timeout, max(0.0, self._queue[0][0] - time.monotonic()))
+            ready, _, _ = select.select([self.public, *self._hubs], [], [], timeout)
+
+            for sock in ready:
+                try:
+                    data, addr = sock.recvfrom(1024)
+                except OSError:
+                    continue
+                if sock is self.public:
+                    self.counts["in"] += 1
+                    self._schedule(self._flow(addr), data, self.car)
+                else:
+                    self.counts["out"] += 1
+                    self._schedule(self.public, data, self._hubs[sock])
+
+            now = time.monotonic()
+            while self._queue and self._queue[0][0] <= now:
+                _, _, sock, data, addr = heapq.heappop(self._queue)
+                try:
+                    sock.sendto(data, addr)
+                except OSError:
+                    pass
+
+    def _flow(self, hub):
+        inner = self._flows.get(hub)
+        if inner is None:
+            inner = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            inner.bind(("127.0.0.1", 0))
+            self._flows[hub] = inner
+            self._hubs[inner] = hub
+        return inner
+
+    def _schedule(self, sock, data, addr):
+        delay = self.impairment.delay()
+        if delay is None:
+            self.counts["dropped"] += 1
+            return
+        if delay:
+            self.counts["delayed"] += 1
+        heapq.heappush(self._queue, (time.monotonic() + delay, next(self._order), sock, data, addr))
+
+
+def run_car(name, port, log_path):
+    """One virtual car: motor_controller on mock pins, listening on 127.0.0.1:port."""
+    from gpiozero.pins.mock import MockFactory, MockPWMPin
+
+    import motor_controller
+
+    motor_controller.TEAM_NAME = name
+    motor_controller.ARM_TIME = 0.0
+    log = open(log_path, "a", buffering=1) if log_path else None
+    latest = {"left": 0.0, "right": 0.0, "seq": None}
+
+    def on_write(left, right, command):
+        latest.update(left=left, right=right, seq=command.seq if command else None)
+        if log:
+            log.write(f"{time.time():.4f},{name},{left:.4f},{right:.4f},{latest['seq'] or ''}\n")
+
+    def status():
+        while True:
+            time.sleep(STATUS_INTERVAL)
+            stats = motor_controller.stats
+            print(f"SIM: {name} L {latest['left']:+.2f} R {latest['right']:+.2f} "
+                  f"| ceiling {motor_controller.speed_ceiling:.2f} | packets {stats['received']} "
+                  f"| superseded {stats['skipped']} out-of-order {stats['stale']} repeats {stats['duplicate']}")
+
+    motor_controller.add_listener(on_write)
+    threading.Thread(target=status, daemon=True).start()
+    try:
+        motor_controller.main(pin_factory=MockFactory(pin_class=MockPWMPin), port=port, host="127.0.0.1")
+    finally:
+        if log:
+            log.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the car Pis on this machine for the hub to drive.")
+    parser.add_argument("--cars", nargs="+", metavar="NAME=IP",
+                        default=[f"{name}={ip}" for name, ip in SIM_CARS.items()])
+    parser.add_argument("--port", type=int, default=UDP_PORT)
+    parser.add_argument("--loss", type=float, default=0.0, help="fraction of packets dropped, each way")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added one-way delay")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="+/- random spread on the delay")
+    parser.add_argument("--reorder", type=float, default=0.0, help="fraction of packets held back to arrive late")
+    parser.add_argument("--reorder-ms", type=float, default=40.0, help="how far a reordered packet is held back")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--log", default=None, help="append every ESC write to this CSV (time,car,left,right,seq)")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    stop = threading.Event()
+    relays = []
+    for i, spec in enumerate(args.cars):
+        name, ip = spec.split("=", 1)
+        car_port = CAR_PORT_BASE + i
+        ctx.Process(target=run_car, args=(name, car_port, args.log), name=f"sim-{name}", daemon=True).start()
+        impairment = Impairment(args.loss, args.latency_ms, args.jitter_ms, args.reorder, args.reorder_ms,
+                                None if args.seed is None else args.seed + i)
+        relay = Relay(name, (ip, args.port), ("127.0.0.1", car_port), impairment)
+        threading.Thread(target=relay.run, args=(stop,), daemon=True).start()
+        relays.append(relay)
+        print(f"SIM: {name} on {ip}:{args.port}")
+
+    try:
+        while True:
+            time.sleep(STATUS_INTERVAL * 5)
+            for relay in relays:
+                c = relay.counts
+                print(f"SIM: {relay.name} network in {c['in']} | out {c['out']} | dropped {c['dropped']} "
+                      f"| delayed {c['delayed']}")
+    except KeyboardInterrupt:
+        stop.set()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,13 @@ import importlib
 import os
 import sys
 
+import gameSession
+import perfOverlay
+
+# Development tool: re-import the game on every Load / Restart so code edits show up immediately.
+# The hub runs with this off and launches from its preloaded registry instead.
+RELOAD_ON_LAUNCH = True
+
 
 class GameDebugger:
     def __init__(self, root):
@@ -25,15 +32,28 @@ class GameDebugger:
         self.btn_run = tk.Button(self.controls, text="Load / Restart", command=self.load_game, bg="#4CAF50", fg="white")
         self.btn_run.pack(pady=10, fill="x", padx=10)
 
+        self.reload_var = tk.BooleanVar(value=RELOAD_ON_LAUNCH)
+        tk.Checkbutton(self.controls, text="Reload on launch", variable=self.reload_var, fg="white", bg="#333",
+                       selectcolor="#222", activebackground="#333").pack(pady=5)
+
+        self.perf = perfOverlay.PerfOverlay(self.root)
+        tk.Button(self.controls, text="Perf Overlay (F3)", command=self.perf.toggle, bg="#555", fg="white").pack(
+            pady=5, fill="x", padx=10)
+
         self.status_label = tk.Label(self.controls, text="Status: Idle", fg="gray", bg="#333")
         self.status_label.pack(side="bottom", pady=10)
 
         # --- Game Display Area ---
         self.game_container = tk.Frame(self.root, bg="black", highlightbackground="white", highlightthickness=1)
         self.game_container.pack(side="right", expand=True, fill="both", padx=20, pady=20)
+        self.session = None
 
     def load_game(self):
-        # 1. Clear existing game
+        # 1. Stop the existing game (cancels its pending after() loop) and clear it
+        if self.session is not None:
+            self.session.destroy()
+            print(f"DEBUG: Stopped {self.session.name}, cancelled {self.session.cancelled} pending callback(s)")
+            self.session = None
         for widget in self.game_container.winfo_children():
             widget.destroy()
 
@@ -52,11 +72,14 @@ class GameDebugger:
                 full_module_path = f"minigames.{module_name}"
 
             game_module = importlib.import_module(full_module_path)
-            importlib.reload(game_module)  # Force reload to catch latest code changes
+            if self.reload_var.get():
+                importlib.reload(game_module)  # Force reload to catch latest code changes
 
             # 3. Start the game
             # We pass a dummy 'handle_winner' so it doesn't try to loop the whole handler
-            game_module.start_game(self.game_container, self.dummy_callback)
+            self.session = gameSession.GameSession(self.game_container, game_module, self.dummy_callback,
+                                                   name=module_name, log_prefix="DEBUG")
+            self.session.start()
 
             self.status_label.config(text=f"Status: Playing {module_name}", fg="#4CAF50")
             print(f"DEBUG: Successfully loaded {module_name}")
@@ -0,0 +1,218 @@
+# Wire format shared by the hub (minigameRunner.py) and the car Pis (motor_controller.py).
+#
+# Every datagram is one fixed 24-byte packet, network byte order:
+#
+#   type     u8    DRIVE, POWER, ACK
+#   version  u8    PROTOCOL_VERSION; anything else is dropped
+#   session  u16   random per hub start, so a restarted hub is not mistaken for a stale one
+#   seq      u32   per-sender counter, wraps
+#   sent_ns  u64   sender's time.time_ns() when the packet was built
+#   a, b     f32   payload (DRIVE: deadzoned stick x, y, -1..1, up is -y; the car mixes them into left/right and
+#                  scales by its ceiling. POWER: speed ceiling. ECHO: ms the car held the command)
+#
+# Parsing is a single struct.unpack, so nothing string-shaped is left in the Pi's receive loop.
+#
+# DRIVE is a lossy stream: only the newest one matters. Everything else is a control message, which the car
+# ACKs (same session and seq, sent back to where it came from) and the hub's ControlChannel resends until it
+# is acked. A control message's seq is its id, so a resend is recognised and never applied twice.
+#
+# A car can also ECHO each drive command when it reaches the ESCs: same session and seq, sent_ns = the car's
+# clock at that moment, a = how long it sat on the car between arriving and being applied.
+
+import itertools
+import random
+import select
+import socket
+import struct
+import threading
+import time
+from collections import namedtuple
+
+PROTOCOL_VERSION = 2
+
+# Message types
+DRIVE = 1
+POWER = 2  # Hub -> car: a = the car's speed ceiling. Absolute, so the newest one is all that counts
+ACK = 3  # Car -> hub: the control message with this session/seq arrived
+ECHO = 4  # Car -> hub: the drive command with this session/seq was just written to the ESCs
+
+# Control message resend timing (doubles each try up to the max, forever until acked or superseded)
+RETRY_S = 0.05
+MAX_RETRY_S = 1.0
+
+PACKET = struct.Struct("!BBHIQff")
+PACKET_SIZE = PACKET.size  # 24 bytes
+
+SEQ_MOD = 1 << 32
+
+
+class Packet(namedtuple("Packet", ["type", "session", "seq", "sent_ns", "a", "b"])):
+    __slots__ = ()
+
+
+def pack(msg_type, session, seq, a=0.0, b=0.0, sent_ns=None):
+    if sent_ns is None:
+        sent_ns = time.time_ns()
+    return PACKET.pack(msg_type, PROTOCOL_VERSION, session, seq % SEQ_MOD, sent_ns, a, b)
+
+
+def unpack(data):
+    """Returns a Packet, or None for anything that is not a well-formed packet of this version."""
+    if len(data) != PACKET_SIZE:
+        return None
+    msg_type, version, session, seq, sent_ns, a, b = PACKET.unpack(data)
+    if version != PROTOCOL_VERSION:
+        return None
+    return Packet(msg_type, session, seq, sent_ns, a, b)
+
+
+def ack(packet):
+    """The reply a car sends for a control packet."""
+    return pack(ACK, packet.session, packet.seq)
+
+
+def echo(packet, applied_ns, held_ms):
+    """The reply a car sends when a drive packet is applied."""
+    return pack(ECHO, packet.session, packet.seq, held_ms, 0.0, sent_ns=applied_ns)
+
+
+def seq_newer(seq, last):
+    """True if seq comes after last, allowing for the u32 counter wrapping around."""
+    return 0 < (seq - last) % SEQ_MOD < SEQ_MOD // 2
+
+
+class Sender:
+    """Builds packets for one car. Safe to share between the drive thread and the Tk thread."""
+
+    def __init__(self, session=None):
+        self.session = random.getrandbits(16) if session is None else session
+        self._seq = itertools.count(1)
+
+    def drive(self, x, y):
+        return pack(DRIVE, self.session, next(self._seq), x, y)
+
+    def control(self, msg_type, a=0.0, b=0.0):
+        return pack(msg_type, self.session, next(self._seq), a, b)
+
+
+class SequenceTracker:
+    """
+    Receiver side: accepts a packet only if it is newer than the last one accepted from the same session.
+    A packet from a new session (hub restarted) resets the tracker.
+    """
+
+    def __init__(self):
+        self.session = None
+        self.last_seq = None
+        self.stale = 0
+
+    def accept(self, packet):
+        if packet.session != self.session or self.last_seq is None:
+            self.session = packet.session
+            self.last_seq = packet.seq
+            return True
+        if not seq_newer(packet.seq, self.last_seq):
+            self.stale += 1
+            return False
+        self.last_seq = packet.seq
+        return True
+
+
+class ControlChannel:
+    """
+    Hub side of the control messages. One socket for the life of the hub (the drive stream can send on it
+    too) and one thread that reads ACKs and resends whatever is still unacked.
+    """
+
+    def __init__(self, sock=None, retry_s=RETRY_S, max_retry_s=MAX_RETRY_S):
+        self.sock = sock or socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.retry_s = retry_s
+        self.max_retry_s = max_retry_s
+        self.running = False
+        self.sent = 0
+        self.retransmits = 0
+        self.acked = 0
+        self.superseded = 0
+
+        self._lock = threading.Lock()
+        self._pending = {}  # (addr, session, seq) -> [data, msg_type, next try, retry interval]
+        self._thread = None
+
+    # --- PUBLIC API ---
+    def start(self):
+        if not self.running:
+            self.running = True
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+
+    def send(self, addr, sender, msg_type, a=0.0, b=0.0):
+        """
+        Sends a control message and keeps resending it until addr acks. An unacked message of the same type
+        to the same car is dropped first: these messages carry state, so only the newest needs to arrive.
+        """
+        data = sender.control(msg_type, a, b)
+        seq = unpack(data).seq
+        with self._lock:
+            for key in [k for k, v in self._pending.items() if k[0] == addr and v[1] == msg_type]:
+                del self._pending[key]
+                self.superseded += 1
+            self._pending[(addr, sender.session, seq)] = [data, msg_type, time.monotonic() + self.retry_s,
+                                                          self.retry_s]
+        self.sent += 1
+        self._transmit(data, addr)
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    # --- INTERNALS ---
+    def _transmit(self, data, addr):
+        try:
+            self.sock.sendto(data, addr)
+        except OSError:
+            pass  # Car unreachable right now; the resend timer keeps trying
+
+    def _run(self):
+        while self.running:
+            with self._lock:
+                due = min((entry[2] for entry in self._pending.values()), default=None)
+            timeout = 0.1 if due is None else min(0.1, max(0.0, due - time.monotonic()))
+            try:
+                ready, _, _ = select.select([self.sock], [], [], timeout)
+            except (OSError, ValueError):
+                return  # Socket closed
+            if ready:
+                self._read_all()
+            self._resend_due()
+
+    def _read_all(self):
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(1024, socket.MSG_DONTWAIT)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return  # e.g. ICMP port unreachable from a car that is off
+            packet = unpack(data)
+            if packet is None or packet.type != ACK:
+                continue
+            with self._lock:
+                if self._pending.pop((addr, packet.session, packet.seq), None) is not None:
+                    self.acked += 1
+
+    def _resend_due(self):
+        now = time.monotonic()
+        resend = []
+        with self._lock:
+            for key, entry in self._pending.items():
+                if entry[2] <= now:
+                    entry[3] = min(entry[3] * 2, self.max_retry_s)
+                    entry[2] = now + entry[3]
+                    resend.append((entry[0], key[0]))
+        for data, addr in resend:
+            self.retransmits += 1
+            self._transmit(data, addr)
@@ -0,0 +1,134 @@
+import time
+from collections import namedtuple
+
+STEP_HZ = 60  # Simulation rate every game's per-step constants were tuned for
+FRAME_BUDGET_MS = 1000 / STEP_HZ  # A frame taking longer than this counts as late (round report, perf overlay)
+MAX_STEPS_PER_FRAME = 5  # Catch-up cap; anything further behind is dropped instead of spiralling
+
+
+class FrameTiming(namedtuple("FrameTiming", ["steps", "update_ms", "render_ms", "idle_ms", "frame_ms", "alpha"])):
+    """
+    What one Tk callback of a GameLoop cost.
+      steps     - fixed updates run this frame (0 when rendering faster than simulating, >1 when catching up)
+      update_ms - time spent in update(dt)
+      render_ms - time spent in render(alpha)
+      idle_ms   - time Tk had to itself between the previous frame and this one
+      frame_ms  - wall time since the previous frame started
+    """
+    __slots__ = ()
+
+
+class GameLoop:
+    """
+    Fixed-timestep runner for a minigame.
+
+    update(dt) is always called with the same dt (1 / step_hz), as many times as real time requires,
+    so gameplay speed no longer depends on how late Tk fires the callback. render(alpha) is called once
+    per Tk frame at render_hz; alpha in [0, 1) is how far we are between the last step and the next,
+    for games that want to interpolate.
+    """
+
+    def __init__(self, widget, update, render=None, step_hz=STEP_HZ, render_hz=None,
+                 max_steps=MAX_STEPS_PER_FRAME):
+        self.widget = widget
+        self.update = update
+        self.render = render
+        self.dt = 1.0 / step_hz
+        self.render_interval = 1.0 / (render_hz or step_hz)
+        self.max_steps = max_steps
+
+        self.running = False
+        self.frames = 0
+        self.steps = 0
+        self.dropped_steps = 0
+        self.timing = None  # FrameTiming of the most recent frame
+
+        self._accumulator = 0.0
+        self._last_start = 0.0
+        self._last_end = 0.0
+        self._after_id = None
+
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self._last_start = self._last_end = time.perf_counter()
+        self._accumulator = self.dt  # First frame always runs one step so it has something to show
+        # Deferred to Tk so the caller has its loop reference before update() first runs
+        self._after_id = self.widget.after(0, self._frame)
+        return self
+
+    def stop(self):
+        """Stops stepping. Safe to call from inside update/render or after the widget is gone."""
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _frame(self):
+        self._after_id = None
+        if not self.running:
+            return
+        if not self.widget.winfo_exists():
+            self.running = False  # The hub tore the game's frame down without telling us
+            return
+
+        start = time.perf_counter()
+        idle = start - self._last_end
+        elapsed = start - self._last_start
+        self._last_start = start
+        self._accumulator += elapsed
+
+        steps = 0
+        while self._accumulator >= self.dt and self.running:
+            if steps == self.max_steps:
+                # Too far behind (window dragged, hub busy loading); drop the backlog rather than fast-forward
+                behind = int(self._accumulator / self.dt)
+                self.dropped_steps += behind
+                self._accumulator -= behind * self.dt
+                break
+            self.update(self.dt)
+            self._accumulator -= self.dt
+            steps += 1
+        self.steps += steps
+
+        updated = time.perf_counter()
+        if self.running and self.render is not None:
+            self.render(self._accumulator / self.dt)
+        end = time.perf_counter()
+
+        self.frames += 1
+        self.timing = FrameTiming(steps, (updated - start) * 1000, (end - updated) * 1000, idle * 1000,
+                                  elapsed * 1000, self._accumulator / self.dt)
+        for listener in list(_listeners):
+            listener(self, self.timing)
+
+        self._last_end = end
+        if self.running:
+            # Aim for the next render slot, counting from when this frame started
+            delay = self.render_interval - (time.perf_counter() - start)
+            self._after_id = self.widget.after(max(1, int(delay * 1000)), self._frame)
+
+
+def run(widget, update, render=None, **options):
+    """Creates and starts a GameLoop. Keep the returned loop and stop() it when the game ends."""
+    return GameLoop(widget, update, render, **options).start()
+
+
+# --- TIMING HOOKS ---
+# The hub (and the perf overlay) subscribe here to see every frame of every running loop.
+_listeners = []
+
+
+def add_listener(listener):
+    """listener(loop, timing) is called after each frame of any GameLoop."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
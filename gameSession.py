@@ -0,0 +1,145 @@
+import time
+import tkinter as tk
+
+# Lifecycle contract for minigames:
+#   start_game(parent_frame, on_game_over) draws into parent_frame and drives itself with parent_frame.after().
+#   The hub and the debug runners never call start_game directly; they wrap it in a GameSession, which hands the
+#   game a frame that remembers every after() id it schedules. stop() cancels all of them, so a game whose loop
+#   is still queued (or whose state["active"] was never cleared) cannot keep running once it has been replaced.
+#   A game may also define prefetch(): no Tk calls, run on a worker thread at hub startup and while the game is
+#   queued, for content worth building before the round starts. Games with optional modes take them as keyword
+#   arguments after on_game_over (defaulting to off); a session's options are passed straight through.
+
+
+class SessionFrame(tk.Frame):
+    """The parent_frame a game receives. Same as a tk.Frame, except after() calls are tracked by the session."""
+
+    def __init__(self, master, session, **kwargs):
+        super().__init__(master, **kwargs)
+        self._session = session
+
+    def after(self, ms, func=None, *args):
+        if func is None:
+            return super().after(ms)  # Plain sleep, nothing to track
+        return self._session._schedule(lambda cb, *a: super(SessionFrame, self).after(ms, cb, *a), func, args)
+
+    def after_idle(self, func, *args):
+        return self._session._schedule(lambda cb, *a: super(SessionFrame, self).after_idle(cb, *a), func, args)
+
+    def after_cancel(self, after_id):
+        self._session._pending.pop(after_id, None)
+        super().after_cancel(after_id)
+
+
+class GameSession:
+    """One run of one minigame. start() launches it; stop() cancels everything it still has scheduled."""
+
+    def __init__(self, parent, module, on_game_over, name=None, log_prefix="HUB", options=None):
+        self.parent = parent
+        self.module = module
+        self.options = options or {}  # Extra keyword arguments for start_game
+        self.name = name or getattr(module, "__name__", "game").rsplit(".", 1)[-1]
+        self.on_game_over = on_game_over
+        self.log_prefix = log_prefix
+
+        self.frame = None
+        self.result = None
+        self.stopped = False
+        self.cancelled = 0  # Callbacks still queued when the session was stopped
+        self.leaked = 0  # Callbacks the game tried to schedule after it was stopped
+        self._pending = {}  # after id -> callback
+
+    # --- PUBLIC API ---
+    def start(self):
+        self.frame = SessionFrame(self.parent, self, bg=self.parent.cget("bg"))
+        self.frame.pack(expand=True, fill="both")
+        try:
+            self.module.start_game(self.frame, self._report, **self.options)
+        except Exception:
+            self.stop()
+            raise
+        return self
+
+    def stop(self):
+        """Cancels every callback the game still has queued. Safe to call more than once."""
+        if self.stopped:
+            return {}
+        self.stopped = True
+        pending, self._pending = self._pending, {}
+        for after_id in pending:
+            try:
+                tk.Frame.after_cancel(self.frame, after_id)
+            except (tk.TclError, ValueError):
+                pass
+        self.cancelled = len(pending)
+        return pending
+
+    def destroy(self):
+        """stop() and remove the game's widgets."""
+        self.stop()
+        if self.frame is not None:
+            try:
+                self.frame.destroy()
+            except tk.TclError:
+                pass
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    # --- INTERNALS ---
+    def _report(self, winner):
+        if self.result is not None or self.stopped:
+            print(f"{self.log_prefix}: WARNING {self.name} reported '{winner}' after it had already finished, ignored")
+            return
+        self.result = winner
+
+        # A finished game should have nothing left queued; anything that is would have kept firing
+        leftovers = self.stop()
+        if leftovers:
+            names = ", ".join(sorted({_callback_name(f) for f in leftovers.values()}))
+            print(f"{self.log_prefix}: WARNING {self.name} left {len(leftovers)} callback(s) running at game over "
+                  f"({names}), cancelled")
+        self.on_game_over(winner)
+
+    def _schedule(self, tk_schedule, func, args):
+        if self.stopped:
+            self.leaked += 1
+            print(f"{self.log_prefix}: WARNING {self.name} scheduled {_callback_name(func)} after it was stopped, "
+                  f"ignored")
+            return None
+
+        def fire(*fire_args):
+            self._pending.pop(after_id, None)
+            start = time.perf_counter()
+            try:
+                func(*fire_args)
+            finally:
+                if _listeners:
+                    end = time.perf_counter()
+                    for listener in list(_listeners):
+                        listener(self, start, end)
+
+        after_id = tk_schedule(fire, *args)
+        self._pending[after_id] = func
+        return after_id
+
+
+# --- TIMING HOOKS ---
+# Every callback a game runs through its frame is timed here, whether or not the game uses gameLoop.
+_listeners = []
+
+
+def add_listener(listener):
+    """listener(session, start, end) is called after each of a game's after() callbacks (perf_counter seconds)."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _callback_name(func):
+    return getattr(func, "__qualname__", None) or getattr(func, "__name__", None) or repr(func)
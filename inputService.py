@@ -0,0 +1,204 @@
+import threading
+import time
+from collections import Counter, deque, namedtuple
+
+import pygame
+
+POLL_HZ = 250  # Well above the 60 FPS games, so a snapshot is never more than 4 ms old
+EVENT_BUFFER = 4096  # Raw button/axis events kept for readers that fall behind
+
+# Event kinds recorded in the ring buffer
+BUTTON_DOWN = "down"
+BUTTON_UP = "up"
+AXIS = "axis"
+
+
+class InputEvent(namedtuple("InputEvent", ["seq", "time_ns", "kind", "joy", "control", "value"])):
+    """
+    One button edge or axis change. time_ns is time.perf_counter_ns() when the poll thread
+    pulled it off SDL's queue; seq increases by one per event.
+    """
+    __slots__ = ()
+
+
+class ControllerState(namedtuple("ControllerState", ["axes", "buttons"])):
+    """One controller at one poll tick. Has the same getters games used on pygame's Joystick."""
+    __slots__ = ()
+
+    def get_axis(self, axis):
+        return self.axes[axis] if axis < len(self.axes) else 0.0
+
+    def get_button(self, button):
+        return self.buttons[button] if button < len(self.buttons) else 0
+
+
+class InputSnapshot(namedtuple("InputSnapshot", ["tick", "time", "controllers"])):
+    """Immutable view of every controller, published once per poll tick."""
+    __slots__ = ()
+
+    def axis(self, joy, axis):
+        return self.controllers[joy].get_axis(axis) if joy < len(self.controllers) else 0.0
+
+    def button(self, joy, button):
+        return self.controllers[joy].get_button(button) if joy < len(self.controllers) else 0
+
+
+class InputReader:
+    """
+    A game's cursor into the event ring. Call tick() once per frame, then ask what happened
+    since the previous tick. Every press SDL saw is counted, even ones shorter than a frame.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.cursor = service.last_seq()
+        self.events = ()
+        self.dropped = 0
+        self._presses = Counter()
+
+    def tick(self):
+        self.events, lost = self.service.events_since(self.cursor)
+        self.dropped += lost
+        if self.events:
+            self.cursor = self.events[-1].seq
+        self._presses = Counter((e.joy, e.control) for e in self.events if e.kind == BUTTON_DOWN)
+        return self.events
+
+    def presses(self, joy, button):
+        """How many times the button went down since the last tick."""
+        return self._presses[(joy, button)]
+
+    def pressed(self, joy, button):
+        return self._presses[(joy, button)] > 0
+
+    def button_downs(self, joy):
+        """Buttons pressed on one controller since the last tick, in the order they happened."""
+        return [e.control for e in self.events if e.kind == BUTTON_DOWN and e.joy == joy]
+
+
+class InputService:
+    """
+    The only code that talks to pygame. A single thread polls every controller at a fixed rate
+    and swaps in a fresh InputSnapshot; games and the drive loop just read snapshot().
+    """
+
+    def __init__(self, poll_hz=POLL_HZ):
+        self.poll_hz = poll_hz
+        self.joysticks = []
+        self._snapshot = InputSnapshot(0, time.monotonic(), ())
+        self._events = deque(maxlen=EVENT_BUFFER)
+        self._events_lock = threading.Lock()
+        self._seq = 0
+        self._joy_index = {}  # SDL instance id -> our controller index
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._running:
+            return
+        pygame.init()
+        pygame.joystick.init()
+        self.refresh_joysticks()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def snapshot(self):
+        # Reference swap is atomic, so readers never see a half-built snapshot
+        return self._snapshot
+
+    def reader(self):
+        """New event cursor starting from now, so presses made before the game started are ignored."""
+        return InputReader(self)
+
+    def last_seq(self):
+        return self._seq
+
+    def events_since(self, seq):
+        """Returns (events after seq, how many of those already fell out of the buffer)."""
+        with self._events_lock:
+            if not self._events or self._events[-1].seq <= seq:
+                return (), 0
+            newer = []
+            for event in reversed(self._events):
+                if event.seq <= seq:
+                    break
+                newer.append(event)
+        newer.reverse()
+        return tuple(newer), newer[0].seq - seq - 1
+
+    def refresh_joysticks(self):
+        self.joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
+        for joy in self.joysticks:
+            joy.init()
+        self._joy_index = {joy.get_instance_id(): i for i, joy in enumerate(self.joysticks)}
+        print(f"HUB: {len(self.joysticks)} Controllers detected.")
+
+    def _run(self):
+        period = 1.0 / self.poll_hz
+        next_tick = time.perf_counter()
+        while self._running:
+            try:
+                self._poll()
+            except pygame.error:
+                break  # pygame was shut down underneath us (interpreter exit)
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()  # Fell behind, don't try to catch up
+
+    def _poll(self):
+        # SDL queues every edge, so draining it here catches presses shorter than the poll period
+        now_ns = time.perf_counter_ns()
+        for event in pygame.event.get():
+            if event.type == pygame.JOYBUTTONDOWN:
+                self._record(now_ns, BUTTON_DOWN, event.instance_id, event.button, 1)
+            elif event.type == pygame.JOYBUTTONUP:
+                self._record(now_ns, BUTTON_UP, event.instance_id, event.button, 0)
+            elif event.type == pygame.JOYAXISMOTION:
+                self._record(now_ns, AXIS, event.instance_id, event.axis, event.value)
+            elif event.type in (pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED):
+                if pygame.joystick.get_count() != len(self.joysticks):
+                    self.refresh_joysticks()
+
+        controllers = tuple(
+            ControllerState(
+                tuple(joy.get_axis(a) for a in range(joy.get_numaxes())),
+                tuple(joy.get_button(b) for b in range(joy.get_numbuttons()))
+            )
+            for joy in self.joysticks
+        )
+        self._snapshot = InputSnapshot(self._snapshot.tick + 1, time.monotonic(), controllers)
+
+    def _record(self, time_ns, kind, instance_id, control, value):
+        joy = self._joy_index.get(instance_id)
+        if joy is None:
+            return
+        with self._events_lock:
+            self._seq += 1
+            self._events.append(InputEvent(self._seq, time_ns, kind, joy, control, value))
+
+
+# --- SHARED INSTANCE ---
+# The hub installs and starts its own service. Debug runners get a default one on first use.
+_shared = None
+
+
+def install(service):
+    global _shared
+    _shared = service
+
+
+def shared():
+    global _shared
+    if _shared is None:
+        _shared = InputService()
+        _shared.start()
+    return _shared
@@ -2,35 +2,69 @@ import tkinter as tk
 import importlib
 import os
 import random
-import pygame
 import socket
+import sys
 import threading
 import time
 
+import assetCache
+import carDrive
+import drive_protocol
+import gameLoop
+import gameSession
+import inputService
+import perfOverlay
+
 # --- NETWORK CONFIGURATION ---
 PI_IPS = {
     "Team A": "10.35.147.5",  # Blue Car Pi
     "Team B": "10.35.147.199"  # Pink Car Pi
 }
 UDP_PORT = 5005
+# --sim: car_sim.py's virtual cars on this machine instead (same as car_sim.SIM_CARS)
+SIM_IPS = {"Team A": "127.0.0.1", "Team B": "127.0.0.2"}
+# Controllers 0/1 play the minigames, these two drive the cars
+CAR_JOYSTICKS = {"Team A": 3, "Team B": 2}
+DRIVE_LATE_WARN_MS = 5  # A car whose drive tick runs later than this (p99) is flagged in the round report
+CAR_LATENCY_WARN_MS = 60  # Stick-to-ESC estimate (p95 of the last echoes) that counts as a laggy car
+CAR_LATENCY_CHECK_MS = 1000
+
+# --- ASSET CONFIGURATION ---
+ASSET_BUDGET_MB = 64  # Decoded sprite memory kept warm between rounds
+WINNER_BANNER_MS = 2000  # Next game is prefetched in the background while the banner is up
 
 
 class GameHandler:
-    def __init__(self, root):
+    def __init__(self, root, reload_on_launch=False, drive_process=False, game_options=None):
         self.root = root
+        # Development only: re-execute each game module on launch to pick up code edits
+        self.reload_on_launch = reload_on_launch
+        self.game_options = game_options or {}  # game name -> keyword arguments for its start_game
         self.root.title("Hardware Race Hub: minigameRunner.py")
         self.root.attributes("-fullscreen", True)  # Fullscreen for the hackathon
         self.root.configure(bg="black")
 
-        pygame.init()
-        pygame.joystick.init()
-        self.refresh_joysticks()
+        # The only owner of pygame: one thread polls every controller, everyone else reads snapshots
+        self.inputs = inputService.InputService()
+        self.inputs.start()
+        inputService.install(self.inputs)
+
+        # One sprite cache for the whole rotation so no round decodes the same PNG twice
+        self.assets = assetCache.AssetCache(budget_bytes=ASSET_BUDGET_MB * 1024 * 1024)
+        assetCache.install(self.assets)
+
+        # Every game running on gameLoop reports its frame timing here
+        self.current_game = None
+        self.session = None  # The running minigame; stopped before anything else takes the frame
+        self.frame_report = None
+        gameLoop.add_listener(self.on_game_frame)
 
         self.total_wins = {"Team A": 0, "Team B": 0}
         self.current_power = 0.4  # Starts low
         self.games_dir = "minigames"
         self.game_weights = {}
         self.initialize_weights()
+        self.load_game_registry()
 
         # UI Layout
         self.header = tk.Frame(self.root, bg="#111", height=80)
@@ -47,76 +81,30 @@ class GameHandler:
         self.game_frame = tk.Frame(self.root, bg="black")
         self.game_frame.pack(expand=True, fill="both")
 
-        # --- START NETWORK DRIVE THREAD ---
-        self.drive_active = True
-        self.drive_thread = threading.Thread(target=self.network_drive_loop, daemon=True)
-        self.drive_thread.start()
-
-        self.show_calibration()
-
-    def refresh_joysticks(self):
-        self.joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-        for joy in self.joysticks:
-            joy.init()
-        print(f"HUB: {len(self.joysticks)} Controllers detected.")
-
-    def network_drive_loop(self):
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-
-        def apply_deadzone(value, deadzone=0.20):
-            return 0.0 if abs(value) < deadzone else value
-
-        while self.drive_active:
-            pygame.event.pump()
-
-            # --- TEAM A (BLUE CAR) - Using Joystick 0 ---
-            if len(self.joysticks) > 0:
-                joy_x = apply_deadzone(self.joysticks[3].get_axis(0))
-                joy_y = apply_deadzone(self.joysticks[3].get_axis(1))
-
-                l_a, r_a = 0, 0
-                if joy_y < -0.2:
-                    l_a, r_a = -self.current_power, -self.current_power  # Forward
-                elif joy_y > 0.2:
-                    l_a, r_a = self.current_power, self.current_power  # Backward
+        # F3 shows per-frame timing for whatever game is running
+        self.perf = perfOverlay.PerfOverlay(self.root)
+
+        # --- START NETWORK DRIVE ---
+        # One packet builder per car, shared by the drive stream and control messages so sequence numbers stay ordered
+        self.car_senders = {team: drive_protocol.Sender() for team in PI_IPS}
+        # One socket for every control message to the cars; the control channel also reads the cars' acks off it
+        self.car_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.car_control = drive_protocol.ControlChannel(self.car_sock).start()
+        for team in PI_IPS:
+            self.push_car_power(team)  # A Pi that restarted mid-event starts back at the right speed
+
+        self.car_drive = carDrive.DriveLink({team: (ip, UDP_PORT) for team, ip in PI_IPS.items()}, CAR_JOYSTICKS)
+        if drive_process:
+            # Own process and own controller polling: heavy games can't hold up the cars
+            self.car_drive.start_process()
+        else:
+            self.car_drive.start_thread(self.inputs.snapshot, self.car_senders)
 
-                if joy_x > 0.2:
-                    r_a = 0  # Turn Right
-                elif joy_x < -0.2:
-                    l_a = 0  # Turn Left
+        # Watches the cars' echoed latency while games are running
+        self.car_lagging = {team: False for team in PI_IPS}
+        self.root.after(CAR_LATENCY_CHECK_MS, self.check_car_latency)
 
-                packet = f"{l_a:.2f},{r_a:.2f}".encode('utf-8')
-                try:
-                    sock.sendto(packet, (PI_IPS["Team A"], UDP_PORT))
-                except:
-                    pass
-
-            # --- TEAM B (PINK CAR) - Using Joystick 1 ---
-            if len(self.joysticks) > 1:
-                joy_x = apply_deadzone(self.joysticks[2].get_axis(0))
-                joy_y = apply_deadzone(self.joysticks[2].get_axis(1))
-
-                l_b, r_b = 0.0, 0.0
-                # FIXED: Changed l_b to match r_b so they spin the same way for straight flight
-                if joy_y < -0.2:
-                    l_b, r_b = -self.current_power, -self.current_power  # Forward
-                elif joy_y > 0.2:
-                    l_b, r_b = self.current_power, self.current_power  # Backward
-
-                if joy_x > 0.2:
-                    r_b = 0  # Turn Right
-                elif joy_x < -0.2:
-                    l_b = 0  # Turn Left
-
-                # Note: If the motor is physically wired backwards,
-                # you can flip the sign here: f"{-l_b:.2f},{r_b:.2f}"
-                packet = f"{l_b:.2f},{r_b:.2f}".encode('utf-8')
-                try:
-                    sock.sendto(packet, (PI_IPS["Team B"], UDP_PORT))
-                except:
-                    pass
-
-            time.sleep(0.02)
+        self.show_calibration()
 
     def initialize_weights(self):
         if not os.path.exists(self.games_dir): os.makedirs(self.games_dir)
@@ -124,16 +112,121 @@ class GameHandler:
         for game in all_games:
             if game not in self.game_weights: self.game_weights[game] = 10
 
+    def load_game_registry(self):
+        """Imports and validates every minigame once at startup so rounds launch straight from memory."""
+        self.game_registry = {}
+        for game in sorted(self.game_weights):
+            try:
+                module = importlib.import_module(f"{self.games_dir}.{game}")
+            except Exception as e:
+                print(f"HUB: Skipping {game}, import failed: {e}")
+                continue
+            if not callable(getattr(module, "start_game", None)):
+                print(f"HUB: Skipping {game}, it has no start_game(parent_frame, on_game_over)")
+                continue
+            self.game_registry[game] = module
+        print(f"HUB: {len(self.game_registry)} games loaded.")
+
+        # Games that build expensive content ahead of time (e.g. pacman's maze pool) start on it right away.
+        # Not with --dev: launches reload the modules on the Tk thread, which must not race a worker running them
+        if not self.reload_on_launch:
+            warm = [m for m in self.game_registry.values() if callable(getattr(m, "prefetch", None))]
+            threading.Thread(target=self.run_game_prefetches, args=(warm,), daemon=True).start()
+
+    def run_game_prefetches(self, modules):
+        for module in modules:
+            try:
+                module.prefetch()
+            except Exception as e:
+                print(f"HUB: {module.__name__}.prefetch() failed: {e}")
+
     def pick_next_game(self):
         if getattr(self, 'game_deck', None) is None or len(self.game_deck) == 0:
-            self.game_deck = [
-                f[:-3] for f in os.listdir(self.games_dir)
-                if f.endswith(".py") and f != "__init__.py"
-            ]
+            self.game_deck = list(self.game_registry)
             random.shuffle(self.game_deck)
         return self.game_deck.pop() if self.game_deck else None
 
+    def on_game_frame(self, loop, timing):
+        report = self.frame_report
+        if report is None:
+            return
+        report["frames"] += 1
+        report["steps"] += timing.steps
+        report["dropped"] = max(report["dropped"], loop.dropped_steps)
+        busy_ms = timing.update_ms + timing.render_ms
+        report["busy_ms"] += busy_ms
+        report["worst_ms"] = max(report["worst_ms"], timing.frame_ms)
+        if busy_ms > gameLoop.FRAME_BUDGET_MS:
+            report["late"] += 1
+
+    def print_frame_report(self):
+        report = self.frame_report
+        if not report or not report["frames"]:
+            return
+        print(f"HUB: {self.current_game} frames {report['frames']} | steps {report['steps']} "
+              f"| avg busy {report['busy_ms'] / report['frames']:.1f} ms | over budget {report['late']} "
+              f"| worst gap {report['worst_ms']:.1f} ms | dropped steps {report['dropped']}")
+
+    def drive_pacing(self):
+        """
+        How steadily each car's commands went out since the last call, from the drive loop's histograms.
+        Values are bucket upper edges in ms (see carDrive.INTERVAL_BUCKETS_MS / LATE_BUCKETS_MS).
+        """
+        report = {}
+        for team, (intervals, late) in self.car_drive.take_pacing().items():
+            if not sum(late):
+                continue  # That car's controller isn't connected
+            report[team] = {
+                "interval_p50": carDrive.bucket_percentile(intervals, carDrive.INTERVAL_BUCKETS_MS, 50) or 0,
+                "interval_p99": carDrive.bucket_percentile(intervals, carDrive.INTERVAL_BUCKETS_MS, 99) or 0,
+                "late_p99": carDrive.bucket_percentile(late, carDrive.LATE_BUCKETS_MS, 99),
+                "intervals": intervals,
+                "late": late,
+            }
+        return report
+
+    def print_drive_report(self):
+        """Per-round count of drive packets sent, against one every carDrive.DRIVE_TICK_S."""
+        parts = []
+        for team, (sent, saved) in self.car_drive.take_counts().items():
+            if sent + saved:
+                parts.append(f"{team} sent {sent} | saved {saved} ({saved * 100 // (sent + saved)}%)")
+        if parts:
+            print(f"HUB: drive packets {' || '.join(parts)}")
+        for team, pacing in self.drive_pacing().items():
+            flag = "  DEGRADED" if pacing["late_p99"] > DRIVE_LATE_WARN_MS else ""
+            print(f"HUB: drive pacing {team} interval p50 {pacing['interval_p50']:g} ms "
+                  f"p99 {pacing['interval_p99']:g} ms | late p99 {pacing['late_p99']:g} ms{flag}")
+        for team, latency in self.car_drive.latency().items():
+            if latency["one_way"]:
+                print(f"HUB: car latency {team} one-way p50 {latency['one_way'][50]:.1f} ms "
+                      f"p95 {latency['one_way'][95]:.1f} ms p99 {latency['one_way'][99]:.1f} ms "
+                      f"| rtt p50 {latency['rtt'][50]:.1f} ms p99 {latency['rtt'][99]:.1f} ms")
+        control = self.car_control
+        print(f"HUB: car control messages sent {control.sent} | acked {control.acked} | resent {control.retransmits} "
+              f"| superseded {control.superseded} | waiting {control.pending}")
+
+    def check_car_latency(self):
+        """Flags a car whose input-to-motor latency crosses CAR_LATENCY_WARN_MS during a race, and when it recovers."""
+        if self.session is not None:
+            for team, latency in self.car_drive.latency().items():
+                if not latency["one_way"]:
+                    continue
+                p95 = latency["one_way"][95]
+                lagging = p95 > CAR_LATENCY_WARN_MS
+                if lagging != self.car_lagging[team]:
+                    self.car_lagging[team] = lagging
+                    if lagging:
+                        print(f"HUB: WARNING {team} car latency p95 {p95:.0f} ms (over {CAR_LATENCY_WARN_MS} ms) "
+                              f"during {self.current_game}")
+                    else:
+                        print(f"HUB: {team} car latency back to p95 {p95:.0f} ms")
+        self.root.after(CAR_LATENCY_CHECK_MS, self.check_car_latency)
+
     def handle_winner(self, winner):
+        self.print_frame_report()
+        self.print_drive_report()
+        self.frame_report = None
         self.clear_frame()
 
         if "Tie" in winner:
@@ -166,20 +259,86 @@ class GameHandler:
             bg="black"
         ).pack(expand=True)
 
-        self.root.after(2000, self.launch_game)
+        self.queue_next_game(WINNER_BANNER_MS)
+
+    def queue_next_game(self, delay_ms):
+        """Picks the next game now and warms it on a worker thread until the launch deadline."""
+        next_game = self.pick_next_game()
+        if next_game:
+            self.start_prefetch(next_game)
+        self.root.after(delay_ms, lambda: self.launch_game(next_game))
+
+    def start_prefetch(self, game):
+        self.prefetch = {
+            "game": game, "module": None, "assets_total": 0, "assets_done": 0,
+            "started": time.perf_counter(), "finished": None
+        }
+        threading.Thread(target=self.prefetch_worker, args=(self.prefetch,), daemon=True).start()
+
+    def prefetch_worker(self, job):
+        # Runs off the Tk thread: PNG decoding and the game's own prefetch(), never any Tk calls. With --dev the
+        # module is reloaded on the Tk thread at launch, so nothing here may execute game code that reload replaces
+        try:
+            module = self.game_registry[job["game"]]
+            job["module"] = module
+
+            specs = getattr(module, "ASSETS", [])
+            job["assets_total"] = len(specs)
+            for name, size, transform in specs:
+                try:
+                    self.assets.warm(name, size, transform)
+                except Exception as e:
+                    print(f"HUB: Prefetch of {name} failed: {e}")
+                job["assets_done"] += 1
+
+            if not self.reload_on_launch and callable(getattr(module, "prefetch", None)):
+                module.prefetch()  # Game content built ahead (pacman tops up its maze pool)
+        except Exception as e:
+            print(f"HUB: Prefetch of {job['game']} failed: {e}")
+        job["finished"] = time.perf_counter()
+
+    def finish_prefetch(self, game):
+        """Reports how much of the prefetch beat the deadline and returns the warmed module, if any."""
+        job = getattr(self, "prefetch", None)
+        if not job or job["game"] != game:
+            return None
+        self.prefetch = None
+
+        done_in_time = job["finished"] is not None
+        elapsed_ms = ((job["finished"] if done_in_time else time.perf_counter()) - job["started"]) * 1000
+        print(f"HUB: Prefetch {game}: {job['assets_done']}/{job['assets_total']} sprites decoded, "
+              f"{'finished' if done_in_time else 'still running'} after {elapsed_ms:.0f} ms")
+
+        # Wrap the decoded pixels for Tk here, so start_game only gets cache hits
+        module = job["module"]
+        if module is not None:
+            for name, size, transform in getattr(module, "ASSETS", [])[:job["assets_done"]]:
+                try:
+                    self.assets.photo(name, size, transform)
+                except Exception:
+                    pass  # The game reports its own missing assets
+        return module
+
+    def push_car_power(self, team):
+        """
+        current_power is the one speed setting: the drive stream is full scale and the car caps it at this.
+        Resent until the Pi acks, so the hub and the car can't disagree on it.
+        """
+        self.car_control.send((PI_IPS[team], UDP_PORT), self.car_senders[team], drive_protocol.POWER,
+                              self.current_power)
 
     def send_win_network_signal(self, winner):
-        if winner in PI_IPS:
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                sock.sendto(b"WIN", (PI_IPS[winner], UDP_PORT))
-            except Exception as e:
-                print(f"WIN SIGNAL ERROR: {e}")
+        # The power level is shared, so every car gets the new one
+        for team in PI_IPS:
+            self.push_car_power(team)
 
     def update_score_display(self):
         self.score_label.config(text=f"BLUE: {self.total_wins['Team A']}  |  PINK: {self.total_wins['Team B']}")
 
     def clear_frame(self):
+        if self.session is not None:
+            self.session.stop()
+            self.session = None
         for widget in self.game_frame.winfo_children(): widget.destroy()
 
     def show_calibration(self):
@@ -197,15 +356,13 @@ class GameHandler:
         self.check_calibration_input()
 
     def check_calibration_input(self):
-        pygame.event.pump()
-        for event in pygame.event.get():
-            if event.type == pygame.JOYBUTTONDOWN and event.button == 0:
-                if event.joy == 0:
-                    self.ready_state["Team A"] = True
-                    self.status_a.config(text="BLUE LINKED", fg="cyan")
-                if event.joy == 1:
-                    self.ready_state["Team B"] = True
-                    self.status_b.config(text="PINK LINKED", fg="magenta")
+        snap = self.inputs.snapshot()
+        if snap.button(0, 0) and not self.ready_state["Team A"]:
+            self.ready_state["Team A"] = True
+            self.status_a.config(text="BLUE LINKED", fg="cyan")
+        if snap.button(1, 0) and not self.ready_state["Team B"]:
+            self.ready_state["Team B"] = True
+            self.status_b.config(text="PINK LINKED", fg="magenta")
 
         if self.ready_state["Team A"] and self.ready_state["Team B"]:
             self.root.after(1000, lambda: self.start_one_time_countdown(3))
@@ -220,18 +377,33 @@ class GameHandler:
         else:
             self.launch_game()
 
-    def launch_game(self):
+    def launch_game(self, current_game=None):
         self.clear_frame()
-        current_game = self.pick_next_game()
+        if current_game is None:
+            current_game = self.pick_next_game()
         if not current_game: return
 
-        module_name = f"{self.games_dir}.{current_game}"
-        game_module = importlib.import_module(module_name)
-        importlib.reload(game_module)
-        game_module.start_game(self.game_frame, self.handle_winner)
+        game_module = self.finish_prefetch(current_game) or self.game_registry[current_game]
+        if self.reload_on_launch:
+            game_module = importlib.reload(game_module)  # Only ever here, on the Tk thread
+        self.game_registry[current_game] = game_module
+        self.current_game = current_game
+        self.frame_report = {"frames": 0, "steps": 0, "busy_ms": 0.0, "late": 0, "worst_ms": 0.0, "dropped": 0}
+        self.session = gameSession.GameSession(self.game_frame, game_module, self.handle_winner, name=current_game,
+                                               options=self.game_options.get(current_game))
+        self.session.start()
+        print(f"HUB: Launched {current_game} | assets {self.assets.stats()}")
 
 
 if __name__ == "__main__":
     root = tk.Tk()
-    app = GameHandler(root)
+    # --dev reloads each game on launch (for iterating on a game without restarting the hub)
+    # --drive-process runs the car drive loop in its own process
+    # --sim drives car_sim.py's virtual cars on this machine
+    # --token-rain plays plinko with a held-A stream of tokens per player
+    if "--sim" in sys.argv:
+        PI_IPS.update(SIM_IPS)
+    game_options = {"plinko": {"token_rain": True}} if "--token-rain" in sys.argv else {}
+    app = GameHandler(root, reload_on_launch="--dev" in sys.argv, drive_process="--drive-process" in sys.argv,
+                      game_options=game_options)
     root.mainloop()
\ No newline at end of file
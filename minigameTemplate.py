@@ -1,17 +1,15 @@
 import tkinter as tk
-import pygame
+
+import gameLoop
+import inputService
 
 # Mapping for Xbox Controllers (Standard)
 BUTTON_A = 0
 
 def start_game(parent_frame, on_game_over):
-    # 1. Initialize Pygame Joysticks
-    pygame.init()
-    pygame.joystick.init()
-
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+    # 1. Controllers come from the hub's input service
+    inputs = inputService.shared()
+    reader = inputs.reader()  # Button presses since the last frame
 
     # 2. Setup GUI
     label = tk.Label(parent_frame, text="MASH 'A' TO WIN!", font=("Arial", 24), fg="white", bg="black")
@@ -20,57 +18,45 @@ def start_game(parent_frame, on_game_over):
     score_label = tk.Label(parent_frame, text="Team A: 0 | Team B: 0", font=("Arial", 18), bg="black", fg="yellow")
     score_label.pack()
 
-    # Added prev_a and prev_b for edge detection
     state = {
         "A": 0,
         "B": 0,
         "win_threshold": 20,
-        "active": True,
-        "prev_a": False,
-        "prev_b": False
+        "active": True
     }
 
-    def update_scores():
+    def render(alpha):
+        # Drawing only; runs once per screen frame
         score_label.config(text=f"Team A: {state['A']} | Team B: {state['B']}")
 
-    def check_inputs():
+    def update(dt):
+        # Game logic; always called with the same dt (1/60 s), so per-step constants stay honest.
+        # Prefer per-second rates times dt anyway (e.g. timer -= dt rather than timer -= 0.016).
         if not state["active"]: return
 
-        # A. Refresh internal Pygame state
-        pygame.event.pump()
-
-        # B. Direct Polling for Team A (Joy 0)
-        if len(joysticks) > 0:
-            current_a = joysticks[0].get_button(BUTTON_A)
-            # Edge detection: True NOW, False BEFORE
-            if current_a and not state["prev_a"]:
-                state["A"] += 1
-            state["prev_a"] = current_a
+        # A. Collect every button edge since the last frame
+        #    (use inputs.snapshot().controllers for held buttons and stick axes)
+        reader.tick()
 
-        # C. Direct Polling for Team B (Joy 1)
-        if len(joysticks) > 1:
-            current_b = joysticks[1].get_button(BUTTON_A)
-            if current_b and not state["prev_b"]:
-                state["B"] += 1
-            state["prev_b"] = current_b
+        # B. Presses for Team A (Joy 0)
+        state["A"] += reader.presses(0, BUTTON_A)
 
-        update_scores()
+        # C. Presses for Team B (Joy 1)
+        state["B"] += reader.presses(1, BUTTON_A)
 
         # D. Check for Winner
         if state["A"] >= state["win_threshold"]:
             end_game("Team A")
         elif state["B"] >= state["win_threshold"]:
             end_game("Team B")
-        else:
-            # Re-run this check every 16ms (~60 FPS polling)
-            parent_frame.after(16, check_inputs)
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         # Clear frame and signal the handler
         for widget in parent_frame.winfo_children():
             widget.destroy()
         on_game_over(winner)
 
-    # Start the input polling loop
-    check_inputs()
\ No newline at end of file
+    # Start the fixed-timestep loop (60 updates/s, with catch-up if Tk runs late)
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
@@ -1,21 +1,27 @@
 import tkinter as tk
-import pygame
 import random
 import math
 from PIL import Image, ImageTk
-import os
+
+import assetCache
+import gameLoop
+import inputService
 
 AXIS_X = 0
 AXIS_Y = 1
 
+# Rates are per second; the loop steps them at a fixed 60 Hz
+SPEED = 480  # Full stick, on the road
+GRASS_SLOW = 0.1
+DEADZONE = 0.15
+TURN_MIN_SPEED = 12  # Slower than this the car keeps its heading instead of snapping to the stick
+FINISH_MIN_SPEED = 30  # Crossing speed (backwards along the start straight) that counts as finishing
 
-def start_game(parent_frame, on_game_over):
-    pygame.init()
-    pygame.joystick.init()
+ASSETS = [("blue_car.png", (80, None), None), ("pink_car.png", (80, None), None)]
 
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+
+def start_game(parent_frame, on_game_over):
+    inputs = inputService.shared()
 
     WIDTH = 1100
     HEIGHT = 700
@@ -30,9 +36,6 @@ def start_game(parent_frame, on_game_over):
     state = {"active": True}
 
     ROAD_WIDTH = 140
-    GRASS_SLOW = 0.1
-    SPEED = 8
-    DEADZONE = 0.15
 
     # ---------------- TRACK ----------------
     margin = 100
@@ -123,26 +126,18 @@ def start_game(parent_frame, on_game_over):
     spawn_B_y = mid_y - dy / length * spawn_offset - ny * 40
 
     # ---------------- LOAD CAR IMAGES ----------------
-    BASE_DIR = os.path.dirname(__file__)
-
-    def load_car_image(path, target_width=80):
-        full_path = os.path.join(BASE_DIR, path)
+    def load_car_image(name, target_width=80):
         try:
-            # Convert to RGBA ensures alpha channel for transparency works
-            img = Image.open(full_path).convert("RGBA")
-            w, h = img.size
-            scale = target_width / w
-            new_size = (int(w * scale), int(h * scale))
-            # Use Image.Resampling.LANCZOS (ANTIALIAS is deprecated)
-            return img.resize(new_size, Image.Resampling.LANCZOS)
+            # Scaled RGBA original is shared across rounds; rotation still happens per frame
+            return assetCache.shared().image(name, (target_width, None))
         except Exception as e:
-            print(f"Error loading {path}: {e}")
+            print(f"Error loading {name}: {e}")
             # Return a small placeholder rectangle if file is missing
             return Image.new("RGBA", (target_width, target_width // 2), "red")
 
     # Store originals on the canvas object to prevent garbage collection
-    canvas.orig_A = load_car_image("assets/blue_car.png")
-    canvas.orig_B = load_car_image("assets/pink_car.png")
+    canvas.orig_A = load_car_image("blue_car.png")
+    canvas.orig_B = load_car_image("pink_car.png")
 
     # Create initial PhotoImages
     canvas.tk_A = ImageTk.PhotoImage(canvas.orig_A)
@@ -151,7 +146,11 @@ def start_game(parent_frame, on_game_over):
     car_A = canvas.create_image(spawn_A_x, spawn_A_y, image=canvas.tk_A)
     car_B = canvas.create_image(spawn_B_x, spawn_B_y, image=canvas.tk_B)
 
+    cars = {"A": car_A, "B": car_B}
+    position = {"A": [spawn_A_x, spawn_A_y], "B": [spawn_B_x, spawn_B_y]}
     velocity = {"A": [0, 0], "B": [0, 0]}
+    heading = {"A": None, "B": None}  # Radians, once the car has moved
+    drawn_heading = {"A": None, "B": None}
     crossed_away = {"A": False, "B": False}
 
     # ---------------- TRACK CHECK ----------------
@@ -181,57 +180,60 @@ def start_game(parent_frame, on_game_over):
             return canvas.tk_B
 
     # ---------------- MOVE CAR ----------------
-    def move_car(car, vel, player):
-        coords = canvas.coords(car)
-        cx, cy = coords[0], coords[1]
+    def move_car(player, dt):
+        vel = velocity[player]
+        pos = position[player]
+        cx, cy = pos
 
-        # Rotate the car image based on velocity direction
-        if abs(vel[0]) > 0.2 or abs(vel[1]) > 0.2:
-            angle = math.atan2(vel[1], vel[0])
-            new_img = rotate_car_image(player, angle)
-            canvas.itemconfig(car, image=new_img)
+        # Face the way the car is going
+        if abs(vel[0]) > TURN_MIN_SPEED or abs(vel[1]) > TURN_MIN_SPEED:
+            heading[player] = math.atan2(vel[1], vel[0])
 
         # Move the car
         speed_mult = 1.0 if point_near_track(cx, cy) else GRASS_SLOW
-        canvas.move(car, vel[0] * speed_mult, vel[1] * speed_mult)
+        pos[0] += vel[0] * speed_mult * dt
+        pos[1] += vel[1] * speed_mult * dt
 
         # -------- Finish Detection --------
         if FINISH_BOUNDS[0] <= cx <= FINISH_BOUNDS[2] and FINISH_BOUNDS[1] <= cy <= FINISH_BOUNDS[3]:
             vel_dot = vel[0] * finish_vector[0] + vel[1] * finish_vector[1]
-            if vel_dot < -0.5 and crossed_away[player]:
+            if vel_dot < -FINISH_MIN_SPEED and crossed_away[player]:
                 end_game(f"{'Blue' if player == 'A' else 'Pink'} Wins!")
         else:
             crossed_away[player] = True
 
-    # ---------------- INPUT LOOP ----------------
-    def check_inputs():
+    # ---------------- GAME LOOP ----------------
+    def update(dt):
         if not state["active"]:
             return
 
-        pygame.event.pump()
-
-        # Player A (Joystick 0)
-        if len(joysticks) >= 1:
-            x = joysticks[0].get_axis(AXIS_X)
-            y = joysticks[0].get_axis(AXIS_Y)
-            velocity["A"][0] = 0 if abs(x) < DEADZONE else x * SPEED
-            velocity["A"][1] = 0 if abs(y) < DEADZONE else y * SPEED
-
-        # Player B (Joystick 1)
-        if len(joysticks) >= 2:
-            x = joysticks[1].get_axis(AXIS_X)
-            y = joysticks[1].get_axis(AXIS_Y)
-            velocity["B"][0] = 0 if abs(x) < DEADZONE else x * SPEED
-            velocity["B"][1] = 0 if abs(y) < DEADZONE else y * SPEED
-
-        move_car(car_A, velocity["A"], "A")
-        move_car(car_B, velocity["B"], "B")
-
-        parent_frame.after(16, check_inputs)
+        joysticks = inputs.snapshot().controllers
+
+        # Player A is joystick 0, player B joystick 1
+        for i, player in enumerate(("A", "B")):
+            if len(joysticks) > i:
+                x = joysticks[i].get_axis(AXIS_X)
+                y = joysticks[i].get_axis(AXIS_Y)
+                velocity[player][0] = 0 if abs(x) < DEADZONE else x * SPEED
+                velocity[player][1] = 0 if abs(y) < DEADZONE else y * SPEED
+
+        for player in ("A", "B"):
+            move_car(player, dt)
+            if not state["active"]:
+                return
+
+    def render(alpha):
+        for player, car in cars.items():
+            canvas.coords(car, *position[player])
+            # Rotating the sprite is the expensive part, so only when the heading changed
+            if heading[player] is not None and heading[player] != drawn_heading[player]:
+                canvas.itemconfig(car, image=rotate_car_image(player, heading[player]))
+                drawn_heading[player] = heading[player]
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         canvas.destroy()
         on_game_over(winner)
 
-    check_inputs()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
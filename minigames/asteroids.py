@@ -1,21 +1,28 @@
 import tkinter as tk
-import pygame
 import math
 import random
-import time
+
+import gameLoop
+import inputService
 
 # --- Xbox Controller Mapping ---
 BUTTON_A = 0
 AXIS_LEFT_STICK_X = 0  # -1.0 Left, 1.0 Right
 AXIS_LEFT_STICK_Y = 1  # -1.0 Up, 1.0 Down
 
+# Rates are per second; the loop steps them at a fixed 60 Hz
+ROCK_SPEED = (18, 60)  # Inward speed range of a new rock; it also drifts up to ROCK_DRIFT sideways
+ROCK_DRIFT = 60
+SPLIT_SPEED = 120  # Fragments burst out up to this fast on each axis
+SHIP_THRUST = 1440  # Acceleration at full stick
+SHIP_DRAG = 0.95 ** 60  # Fraction of its speed a coasting ship keeps after one second
+BULLET_SPEED = 720
+BULLET_LIFE = 40 / 60
+
 
 def start_game(parent_frame, on_game_over):
-    pygame.init()
-    pygame.joystick.init()
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+    inputs = inputService.shared()
+    reader = inputs.reader()
 
     canvas_w = 800
     canvas_h = 600
@@ -23,13 +30,13 @@ def start_game(parent_frame, on_game_over):
 
     state = {
         "active": True,
-        "start_time": time.time(),
+        "time_left": game_duration,
         "bullets": [],
         "asteroids": [],
         "ships": {
-            "Team A": {"x": 370, "y": 300, "dx": 0, "dy": 0, "angle": 180, "score": 0, "alive": True, "prev_a": False,
+            "Team A": {"x": 370, "y": 300, "dx": 0, "dy": 0, "angle": 180, "score": 0, "alive": True,
                        "color": "cyan", "joy_idx": 0},
-            "Team B": {"x": 430, "y": 300, "dx": 0, "dy": 0, "angle": 0, "score": 0, "alive": True, "prev_a": False,
+            "Team B": {"x": 430, "y": 300, "dx": 0, "dy": 0, "angle": 0, "score": 0, "alive": True,
                        "color": "magenta", "joy_idx": 1}
         }
     }
@@ -44,20 +51,20 @@ def start_game(parent_frame, on_game_over):
     def spawn_edge_asteroid():
         """Spawns a slow, large asteroid at the edge."""
         edge = random.choice(["top", "bottom", "left", "right"])
-        speed_min, speed_max = 0.3, 1.0  # SLOWED DOWN
+        speed_min, speed_max = ROCK_SPEED  # SLOWED DOWN
 
         if edge == "top":
             x, y = random.uniform(0, canvas_w), -40
-            dx, dy = random.uniform(-1, 1), random.uniform(speed_min, speed_max)
+            dx, dy = random.uniform(-ROCK_DRIFT, ROCK_DRIFT), random.uniform(speed_min, speed_max)
         elif edge == "bottom":
             x, y = random.uniform(0, canvas_w), canvas_h + 40
-            dx, dy = random.uniform(-1, 1), random.uniform(-speed_max, -speed_min)
+            dx, dy = random.uniform(-ROCK_DRIFT, ROCK_DRIFT), random.uniform(-speed_max, -speed_min)
         elif edge == "left":
             x, y = -40, random.uniform(0, canvas_h)
-            dx, dy = random.uniform(speed_min, speed_max), random.uniform(-1, 1)
+            dx, dy = random.uniform(speed_min, speed_max), random.uniform(-ROCK_DRIFT, ROCK_DRIFT)
         else:  # right
             x, y = canvas_w + 40, random.uniform(0, canvas_h)
-            dx, dy = random.uniform(-speed_max, -speed_min), random.uniform(-1, 1)
+            dx, dy = random.uniform(-speed_max, -speed_min), random.uniform(-ROCK_DRIFT, ROCK_DRIFT)
 
         return {
             "x": x, "y": y, "dx": dx, "dy": dy,
@@ -69,8 +76,8 @@ def start_game(parent_frame, on_game_over):
         """Spawns a smaller asteroid bursting from a destroyed one."""
         return {
             "x": x, "y": y,
-            "dx": random.uniform(-2.0, 2.0),  # Bursts out faster
-            "dy": random.uniform(-2.0, 2.0),
+            "dx": random.uniform(-SPLIT_SPEED, SPLIT_SPEED),  # Bursts out faster
+            "dy": random.uniform(-SPLIT_SPEED, SPLIT_SPEED),
             "radius": parent_radius // 2,
             "id": canvas.create_oval(0, 0, 0, 0, outline="gray", width=2)
         }
@@ -88,8 +95,9 @@ def start_game(parent_frame, on_game_over):
     # Initialize Graphics
     for _ in range(12):  # Start with fewer rocks since they split now
         ast = spawn_edge_asteroid()
-        ast["x"] += ast["dx"] * random.uniform(0, 50)
-        ast["y"] += ast["dy"] * random.uniform(0, 50)
+        drift = random.uniform(0, 50 / 60)  # Up to 50 frames' worth of travel already behind it
+        ast["x"] += ast["dx"] * drift
+        ast["y"] += ast["dy"] * drift
         state["asteroids"].append(ast)
 
     ship_gfx = {
@@ -97,13 +105,16 @@ def start_game(parent_frame, on_game_over):
         "Team B": canvas.create_polygon(0, 0, 0, 0, 0, 0, outline="magenta", fill="", width=2)
     }
 
-    def update_game():
+    def update(dt):
         if not state["active"]: return
 
-        time_left = max(0, game_duration - (time.time() - state["start_time"]))
-        pygame.event.pump()
+        state["time_left"] = max(0.0, state["time_left"] - dt)
+        time_left = state["time_left"]
+        joysticks = inputs.snapshot().controllers
+        reader.tick()
 
         # A. Process Inputs & Physics for Ships
+        drag = SHIP_DRAG ** dt
         for team, ship in state["ships"].items():
             if not ship["alive"]: continue
 
@@ -122,49 +133,44 @@ def start_game(parent_frame, on_game_over):
                     ship["angle"] = math.degrees(math.atan2(joy_y, joy_x))
 
                     # Apply thrust based on how hard the stick is pushed
-                    thrust = magnitude * 0.4
+                    thrust = magnitude * SHIP_THRUST * dt
                     rad = math.radians(ship["angle"])
                     ship["dx"] += math.cos(rad) * thrust
                     ship["dy"] += math.sin(rad) * thrust
 
                 # Shooting
-                current_a = joy.get_button(BUTTON_A)
-                if current_a and not ship["prev_a"]:
+                if reader.pressed(joy_idx, BUTTON_A):
                     rad = math.radians(ship["angle"])
                     state["bullets"].append({
                         "x": ship["x"] + math.cos(rad) * 20,
                         "y": ship["y"] + math.sin(rad) * 20,
-                        "dx": math.cos(rad) * 12,
-                        "dy": math.sin(rad) * 12,
+                        "dx": math.cos(rad) * BULLET_SPEED,
+                        "dy": math.sin(rad) * BULLET_SPEED,
                         "owner": team,
-                        "life": 40,
+                        "life": BULLET_LIFE,
                         "id": canvas.create_oval(0, 0, 0, 0, fill=ship["color"])
                     })
-                ship["prev_a"] = current_a
 
             # Apply friction and wrap ships
-            ship["dx"] *= 0.95  # Increased friction so you can stop easier
-            ship["dy"] *= 0.95
-            ship["x"] = (ship["x"] + ship["dx"]) % canvas_w
-            ship["y"] = (ship["y"] + ship["dy"]) % canvas_h
-            canvas.coords(ship_gfx[team], *draw_ship(ship))
+            ship["dx"] *= drag  # Increased friction so you can stop easier
+            ship["dy"] *= drag
+            ship["x"] = (ship["x"] + ship["dx"] * dt) % canvas_w
+            ship["y"] = (ship["y"] + ship["dy"] * dt) % canvas_h
 
         # B. Process Bullets
         for b in state["bullets"][:]:
-            b["x"] = (b["x"] + b["dx"]) % canvas_w
-            b["y"] = (b["y"] + b["dy"]) % canvas_h
-            b["life"] -= 1
+            b["x"] = (b["x"] + b["dx"] * dt) % canvas_w
+            b["y"] = (b["y"] + b["dy"] * dt) % canvas_h
+            b["life"] -= dt
             if b["life"] <= 0:
                 canvas.delete(b["id"])
                 state["bullets"].remove(b)
-            else:
-                canvas.coords(b["id"], b["x"] - 2, b["y"] - 2, b["x"] + 2, b["y"] + 2)
 
         # C. Process Asteroids & Collisions
         new_asteroids = []
         for ast in state["asteroids"][:]:
-            ast["x"] += ast["dx"]
-            ast["y"] += ast["dy"]
+            ast["x"] += ast["dx"] * dt
+            ast["y"] += ast["dy"] * dt
 
             # Remove and replace if it drifts way off screen
             if ast["x"] < -100 or ast["x"] > canvas_w + 100 or ast["y"] < -100 or ast["y"] > canvas_h + 100:
@@ -173,9 +179,6 @@ def start_game(parent_frame, on_game_over):
                 new_asteroids.append(spawn_edge_asteroid())
                 continue
 
-            canvas.coords(ast["id"], ast["x"] - ast["radius"], ast["y"] - ast["radius"], ast["x"] + ast["radius"],
-                          ast["y"] + ast["radius"])
-
             # Asteroid vs Bullet
             hit = False
             for b in state["bullets"][:]:
@@ -210,12 +213,9 @@ def start_game(parent_frame, on_game_over):
 
         state["asteroids"].extend(new_asteroids)
 
-        # D. Update UI
+        # D. Win/Loss Conditions
         score_a = state["ships"]["Team A"]["score"]
         score_b = state["ships"]["Team B"]["score"]
-        canvas.itemconfig(ui_text, text=f"{time_left:.1f}s | A: {score_a} | B: {score_b}")
-
-        # E. Win/Loss Conditions
         a_dead = not state["ships"]["Team A"]["alive"]
         b_dead = not state["ships"]["Team B"]["alive"]
 
@@ -232,11 +232,24 @@ def start_game(parent_frame, on_game_over):
                 end_game("Team B")
             else:
                 end_game("Tie")
-        else:
-            parent_frame.after(16, update_game)
+
+    def render(alpha):
+        for team, ship in state["ships"].items():
+            if ship["alive"]:
+                canvas.coords(ship_gfx[team], *draw_ship(ship))
+        for b in state["bullets"]:
+            canvas.coords(b["id"], b["x"] - 2, b["y"] - 2, b["x"] + 2, b["y"] + 2)
+        for ast in state["asteroids"]:
+            canvas.coords(ast["id"], ast["x"] - ast["radius"], ast["y"] - ast["radius"], ast["x"] + ast["radius"],
+                          ast["y"] + ast["radius"])
+
+        score_a = state["ships"]["Team A"]["score"]
+        score_b = state["ships"]["Team B"]["score"]
+        canvas.itemconfig(ui_text, text=f"{state['time_left']:.1f}s | A: {score_a} | B: {score_b}")
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         canvas.destroy()
         for widget in parent_frame.winfo_children():
             widget.destroy()
@@ -246,4 +259,4 @@ def start_game(parent_frame, on_game_over):
 
         on_game_over(winner)
 
-    update_game()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
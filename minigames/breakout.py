@@ -1,18 +1,26 @@
 import tkinter as tk
-import pygame
 import random
 import math
 
+import canvasScene
+import gameLoop
+import inputService
+
 # Xbox Mapping
 STICK_X = 0
 
+# Rates are per second; the loop steps them at a fixed 60 Hz
+BALL_SPEED = 300  # Each axis, for a respawned or bonus ball
+START_SPEED = 270  # Each axis, for the opening balls
+MAX_SPEED = 840.0
+MULTIBALL_SPREAD = 90  # Sideways kick between the balls out of the hidden multiplier brick
+PADDLE_SPEED = 960
+PADDLE_ENGLISH = 15  # Sideways speed added per pixel the ball lands off the paddle's centre
+POWERUP_FALL = 270
+
 
 def start_game(parent_frame, on_game_over):
-    pygame.init()
-    pygame.joystick.init()
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+    inputs = inputService.shared()
 
     # Constants
     CANVAS_W, CANVAS_H = 800, 600
@@ -22,18 +30,17 @@ def start_game(parent_frame, on_game_over):
     BRICK_ROWS, BRICK_COLS = 4, 5
     POWERUP_RAD = 10
     ACCEL_FACTOR = 1.05
-    MAX_SPEED = 14.0
 
     state = {
         "active": True,
         "Team A": {
             "color": "blue", "paddle_x": 200, "lives": 3,
-            "balls": [{"x": 200, "y": 400, "vx": 4.5, "vy": -4.5}],
+            "balls": [{"x": 200, "y": 400, "vx": START_SPEED, "vy": -START_SPEED}],
             "bricks": [], "powerups": []
         },
         "Team B": {
             "color": "pink", "paddle_x": 600, "lives": 3,
-            "balls": [{"x": 600, "y": 400, "vx": 4.5, "vy": -4.5}],
+            "balls": [{"x": 600, "y": 400, "vx": START_SPEED, "vy": -START_SPEED}],
             "bricks": [], "powerups": []
         }
     }
@@ -63,33 +70,37 @@ def start_game(parent_frame, on_game_over):
     canvas = tk.Canvas(parent_frame, width=CANVAS_W, height=CANVAS_H, bg="black", highlightthickness=0)
     canvas.pack(expand=True)
 
-    def draw_game():
-        if not state["active"]: return
-        canvas.delete("all")
+    # Static Environment (Walls), drawn once
+    scene = canvasScene.Scene(canvas)
+    scene.add("rectangle", 0, 0, WALL_WIDTH, 600, fill="gray30", outline="white")
+    scene.add("rectangle", 400 - WALL_WIDTH / 2, 0, 400 + WALL_WIDTH / 2, 600, fill="gray30", outline="white")
+    scene.add("rectangle", 800 - WALL_WIDTH, 0, 800, 600, fill="gray30", outline="white")
+    scene.add("rectangle", 0, 0, 800, 80, fill="#050505", outline="white")
+
+    def lane(team_name):
+        return (WALL_WIDTH, 400 - WALL_WIDTH / 2) if team_name == "Team A" else (400 + WALL_WIDTH / 2,
+                                                                                 800 - WALL_WIDTH)
 
-        # Static Environment (Walls)
-        canvas.create_rectangle(0, 0, WALL_WIDTH, 600, fill="gray30", outline="white")
-        canvas.create_rectangle(400 - WALL_WIDTH / 2, 0, 400 + WALL_WIDTH / 2, 600, fill="gray30", outline="white")
-        canvas.create_rectangle(800 - WALL_WIDTH, 0, 800, 600, fill="gray30", outline="white")
-        canvas.create_rectangle(0, 0, 800, 80, fill="#050505", outline="white")
+    def update(dt):
+        if not state["active"]: return
+        joysticks = inputs.snapshot().controllers
 
         for i, team_name in enumerate(["Team A", "Team B"]):
             t = state[team_name]
             joy = joysticks[i] if i < len(joysticks) else None
-            lane_min, lane_max = (WALL_WIDTH, 400 - WALL_WIDTH / 2) if team_name == "Team A" else (400 + WALL_WIDTH / 2,
-                                                                                                   800 - WALL_WIDTH)
+            lane_min, lane_max = lane(team_name)
 
             # 1. Paddle Logic
             if joy:
                 axis = joy.get_axis(STICK_X)
                 if abs(axis) > 0.1:
-                    t["paddle_x"] += axis * 16
+                    t["paddle_x"] += axis * PADDLE_SPEED * dt
             t["paddle_x"] = max(lane_min + PADDLE_W / 2, min(lane_max - PADDLE_W / 2, t["paddle_x"]))
 
             # 2. Ball Physics & Collision
             for b in t["balls"][:]:
-                b["x"] += b["vx"]
-                b["y"] += b["vy"]
+                b["x"] += b["vx"] * dt
+                b["y"] += b["vy"] * dt
 
                 # Side Bounce
                 if b["x"] - BALL_RAD < lane_min:
@@ -108,7 +119,7 @@ def start_game(parent_frame, on_game_over):
                 px = t["paddle_x"]
                 if (px - PADDLE_W / 2 < b["x"] < px + PADDLE_W / 2) and (550 < b["y"] + BALL_RAD < 565):
                     b["vy"] = -abs(b["vy"]) * ACCEL_FACTOR
-                    b["vx"] = (b["vx"] + (b["x"] - px) / 4) * ACCEL_FACTOR
+                    b["vx"] = (b["vx"] + (b["x"] - px) * PADDLE_ENGLISH) * ACCEL_FACTOR
 
                     # Cap Speed
                     speed = math.sqrt(b["vx"] ** 2 + b["vy"] ** 2)
@@ -130,8 +141,10 @@ def start_game(parent_frame, on_game_over):
                         # Trigger hidden multiplier OR normal drop
                         if brk.is_hidden_mult:
                             # Spawn 2 new balls with slight trajectory offsets
-                            t["balls"].append({"x": b["x"], "y": b["y"], "vx": b["vx"] + 1.5, "vy": b["vy"]})
-                            t["balls"].append({"x": b["x"], "y": b["y"], "vx": b["vx"] - 1.5, "vy": b["vy"]})
+                            t["balls"].append({"x": b["x"], "y": b["y"], "vx": b["vx"] + MULTIBALL_SPREAD,
+                                               "vy": b["vy"]})
+                            t["balls"].append({"x": b["x"], "y": b["y"], "vx": b["vx"] - MULTIBALL_SPREAD,
+                                               "vy": b["vy"]})
                         elif random.random() < 0.25:
                             t["powerups"].append({"x": brk.x + brk.w / 2, "y": brk.y + brk.h / 2})
                         break
@@ -140,9 +153,10 @@ def start_game(parent_frame, on_game_over):
 
             # 3. Powerup Collection
             for p in t["powerups"][:]:
-                p["y"] += 4.5
+                p["y"] += POWERUP_FALL * dt
                 if (t["paddle_x"] - PADDLE_W / 2 < p["x"] < t["paddle_x"] + PADDLE_W / 2) and (550 < p["y"] < 570):
-                    t["balls"].append({"x": t["paddle_x"], "y": 540, "vx": random.choice([-5, 5]), "vy": -5})
+                    t["balls"].append({"x": t["paddle_x"], "y": 540, "vx": random.choice([-BALL_SPEED, BALL_SPEED]),
+                                       "vy": -BALL_SPEED})
                     t["powerups"].remove(p)
                 elif p["y"] > 600:
                     t["powerups"].remove(p)
@@ -153,40 +167,46 @@ def start_game(parent_frame, on_game_over):
                 if t["lives"] <= 0:
                     end_game("Team B" if team_name == "Team A" else "Team A")
                     return
-                t["balls"].append({"x": (lane_min + lane_max) / 2, "y": 400, "vx": 5, "vy": -5})
+                t["balls"].append({"x": (lane_min + lane_max) / 2, "y": 400, "vx": BALL_SPEED, "vy": -BALL_SPEED})
 
             if not t["bricks"]:
                 end_game(team_name)
                 return
 
-            # --- RENDERING ---
+    def render(alpha):
+        scene.begin()
+        for i, team_name in enumerate(["Team A", "Team B"]):
+            t = state[team_name]
+            lane_min, _ = lane(team_name)
+
             # Paddle & HUD
-            canvas.create_rectangle(t["paddle_x"] - PADDLE_W / 2, 550, t["paddle_x"] + PADDLE_W / 2, 565,
-                                    fill=t["color"], outline="white")
-            canvas.create_text(lane_min + 60, 40, text=f"LIVES: {t['lives']}", fill="white",
-                               font=("Courier", 18, "bold"))
+            scene.rect(("paddle", i), t["paddle_x"] - PADDLE_W / 2, 550, t["paddle_x"] + PADDLE_W / 2, 565,
+                       fill=t["color"], outline="white", layer="sprites")
+            scene.text(("lives", i), lane_min + 60, 40, text=f"LIVES: {t['lives']}", fill="white",
+                       font=("Courier", 18, "bold"))
 
-            # Bricks with Small White Outlines
+            # Bricks with Small White Outlines (a brick only costs a Tk call when it appears or breaks)
             for brk in t["bricks"]:
-                canvas.create_rectangle(brk.x, brk.y, brk.x + brk.w, brk.y + brk.h,
-                                        fill=t["color"], outline="white", width=1)
+                scene.rect(("brick", id(brk)), brk.x, brk.y, brk.x + brk.w, brk.y + brk.h,
+                           fill=t["color"], outline="white", width=1)
 
             # Balls & Powerups
             for b in t["balls"]:
-                canvas.create_oval(b["x"] - BALL_RAD, b["y"] - BALL_RAD, b["x"] + BALL_RAD, b["y"] + BALL_RAD,
-                                   fill="white", outline="gray")
+                scene.oval(("ball", id(b)), b["x"] - BALL_RAD, b["y"] - BALL_RAD, b["x"] + BALL_RAD,
+                           b["y"] + BALL_RAD, fill="white", outline="gray", layer="sprites")
             for p in t["powerups"]:
-                canvas.create_oval(p["x"] - POWERUP_RAD, p["y"] - POWERUP_RAD, p["x"] + POWERUP_RAD,
-                                   p["y"] + POWERUP_RAD, fill="yellow", outline="white")
+                scene.oval(("powerup", id(p)), p["x"] - POWERUP_RAD, p["y"] - POWERUP_RAD, p["x"] + POWERUP_RAD,
+                           p["y"] + POWERUP_RAD, fill="yellow", outline="white", layer="sprites")
 
-        parent_frame.after(16, draw_game)
+        scene.end()
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         canvas.destroy()
         on_game_over(winner)
 
-    draw_game()
+    loop = gameLoop.run(parent_frame, update, render)
 
 
 class tkRect:
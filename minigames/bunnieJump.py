@@ -1,55 +1,52 @@
 import tkinter as tk
-import pygame
 import random
 import math
-from PIL import Image, ImageTk
-import os
+
+import assetCache
+import canvasScene
+import gameLoop
+import inputService
 
 # Mapping for Xbox Controllers
 AXIS_X = 0
 
+ASSETS = [(f"{color}_{pose}.png", (60, 60), None)
+          for color in ["blue", "pink"] for pose in ["crouch_left", "jump_left", "crouch_right", "jump_right"]]
 
-def start_game(parent_frame, on_game_over):
-    # 1. Anchor the path to the directory where this script lives
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-    # 2. Attach sprites to parent_frame to prevent Tkinter garbage collection
+def start_game(parent_frame, on_game_over):
+    # Attach sprites to parent_frame to prevent Tkinter garbage collection
     parent_frame.sprites = {"blue": {}, "pink": {}}
 
     def load_all_assets():
-        """Attempts to load images with absolute pathing."""
+        """Pulls the 60x60 poses from the hub's shared sprite cache."""
         colors = ["blue", "pink"]
         poses = ["crouch_left", "jump_left", "crouch_right", "jump_right"]
 
         for color in colors:
             for pose in poses:
-                # Use BASE_DIR to build the absolute path
-                file_path = os.path.join(BASE_DIR, "assets", f"{color}_{pose}.png")
-                if os.path.exists(file_path):
-                    try:
-                        # Resampling.LANCZOS added for cleaner scaling
-                        img = Image.open(file_path).convert("RGBA").resize((60, 60), Image.Resampling.LANCZOS)
-                        parent_frame.sprites[color][pose] = ImageTk.PhotoImage(img)
-                    except Exception as e:
-                        print(f"Error rendering {file_path}: {e}")
-                else:
-                    print(f"FILE NOT FOUND: {file_path}")
+                file_name = f"{color}_{pose}.png"
+                try:
+                    parent_frame.sprites[color][pose] = assetCache.shared().photo(file_name, (60, 60))
+                except FileNotFoundError:
+                    print(f"FILE NOT FOUND: {file_name}")
+                except Exception as e:
+                    print(f"Error rendering {file_name}: {e}")
 
     # Load assets securely onto the frame before starting
     load_all_assets()
 
-    pygame.init()
-    pygame.joystick.init()
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks: joy.init()
+    inputs = inputService.shared()
 
     # Game Settings
     CANVAS_W, CANVAS_H = 350, 500
-    WIN_HEIGHT, GRAVITY, JUMP_STRENGTH, MOVE_SPEED = 2500, 0.6, -15, 9
+    WIN_HEIGHT = 2500
+    # Rates are per second; the loop steps them at a fixed 60 Hz
+    GRAVITY, JUMP_STRENGTH, MOVE_SPEED = 2160, -900, 540
 
     state = {
         "active": True,
-        "frame": 0,
+        "time": 0.0,
         "A": {"x": 175, "y": 400, "vy": 0, "cam": 0, "platforms": [], "color": "blue", "facing": "right"},
         "B": {"x": 175, "y": 400, "vy": 0, "cam": 0, "platforms": [], "color": "pink", "facing": "right"},
     }
@@ -62,7 +59,7 @@ def start_game(parent_frame, on_game_over):
                 "y": 450 - (i * 90),
                 "m": i > 5 and random.random() > 0.4,
                 "off": random.uniform(0, 6.28),
-                "speed": 0.05 + (i * 0.002),
+                "speed": 3 + (i * 0.12),  # Radians per second
             })
         return plist
 
@@ -80,22 +77,27 @@ def start_game(parent_frame, on_game_over):
                          highlightbackground="magenta")
     canvas_b.pack(side="right", padx=10, pady=20)
 
-    def update_game():
+    scenes = {"A": canvasScene.Scene(canvas_a), "B": canvasScene.Scene(canvas_b)}
+
+    def platform_x(plt):
+        return plt["x"] + (math.sin(state["time"] * plt.get("speed", 0) + plt["off"]) * 70 if plt["m"] else 0)
+
+    def update(dt):
         # CRASH FIX: If the game is inactive or the container is gone, STOP immediately
         if not state["active"] or not container.winfo_exists():
             return
 
-        state["frame"] += 1
-        pygame.event.pump()
+        state["time"] += dt
+        joysticks = inputs.snapshot().controllers
 
         for i, p_key in enumerate(["A", "B"]):
             p = state[p_key]
-            p["vy"] += GRAVITY
-            p["y"] += p["vy"]
+            p["vy"] += GRAVITY * dt
+            p["y"] += p["vy"] * dt
 
             if len(joysticks) > i:
                 axis_val = joysticks[i].get_axis(AXIS_X)
-                p["x"] += axis_val * MOVE_SPEED
+                p["x"] += axis_val * MOVE_SPEED * dt
                 if axis_val > 0.2:
                     p["facing"] = "right"
                 elif axis_val < -0.2:
@@ -103,17 +105,11 @@ def start_game(parent_frame, on_game_over):
             p["x"] %= CANVAS_W
 
             for plt in p["platforms"]:
-                cx = plt["x"] + (math.sin(state["frame"] * plt.get("speed", 0) + plt["off"]) * 70 if plt["m"] else 0)
+                cx = platform_x(plt)
                 if p["vy"] > 0 and (plt["y"] < p["y"] + 20 < plt["y"] + 30) and (cx - 45 < p["x"] < cx + 45):
                     p["vy"] = JUMP_STRENGTH
             if p["y"] < p["cam"] + 200: p["cam"] = p["y"] - 200
 
-        try:
-            render(canvas_a, "A")
-            render(canvas_b, "B")
-        except tk.TclError:  # Safety for when window closes
-            return
-
         for team in ["A", "B"]:
             p = state[team]
             # --- Output correct win strings ---
@@ -126,22 +122,29 @@ def start_game(parent_frame, on_game_over):
                 end_game(winner_str)
                 return
 
-        parent_frame.after(16, update_game)
+    def render(alpha):
+        if not state["active"]: return
+        try:
+            draw("A")
+            draw("B")
+        except tk.TclError:  # Safety for when window closes
+            return
 
-    def render(canvas, key):
-        if not canvas.winfo_exists(): return
-        canvas.delete("all")
+    def draw(key):
+        scene = scenes[key]
+        if not scene.canvas.winfo_exists(): return
+        scene.begin()
         p = state[key]
         off = p["cam"]
 
-        # Finish line & Platforms
-        canvas.create_rectangle(0, -WIN_HEIGHT - off, CANVAS_W, -WIN_HEIGHT - off + 20, fill="yellow")
-        for plt in p["platforms"]:
-            px = plt["x"] + (math.sin(state["frame"] * plt.get("speed", 0) + plt["off"]) * 70 if plt["m"] else 0)
+        # Finish line & Platforms (off-screen platforms drop out of the scene)
+        scene.rect("finish", 0, -WIN_HEIGHT - off, CANVAS_W, -WIN_HEIGHT - off + 20, fill="yellow")
+        for idx, plt in enumerate(p["platforms"]):
+            px = platform_x(plt)
             py = plt["y"] - off
             if -20 < py < CANVAS_H + 20:
-                canvas.create_rectangle(px - 30, py, px + 30, py + 8, fill="#3498db" if plt["m"] else "white",
-                                        outline="gray")
+                scene.rect(("platform", idx), px - 30, py, px + 30, py + 8, fill="#3498db" if plt["m"] else "white",
+                           outline="gray")
 
         # Sprite logic
         pose = "jump" if p["vy"] < 0 else "crouch"
@@ -151,16 +154,18 @@ def start_game(parent_frame, on_game_over):
         img_obj = parent_frame.sprites[p["color"]].get(sprite_key)
 
         if img_obj:
-            canvas.create_image(p["x"], p["y"] - off, image=img_obj, anchor="center")
+            scene.image("bunny", p["x"], p["y"] - off, image=img_obj, anchor="center")
         else:
             # RECTANGLE FALLBACK
-            canvas.create_rectangle(p["x"] - 15, (p["y"] - off) - 15, p["x"] + 15, (p["y"] - off) + 15, fill=p["color"],
-                                    outline="white")
+            scene.rect("bunny", p["x"] - 15, (p["y"] - off) - 15, p["x"] + 15, (p["y"] - off) + 15, fill=p["color"],
+                       outline="white", layer="sprites")
+        scene.end()
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         if container.winfo_exists():
             container.destroy()
         on_game_over(winner)
 
-    update_game()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
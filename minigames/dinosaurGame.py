@@ -1,9 +1,9 @@
 import tkinter as tk
-import pygame
 import random
-import os
-import time
-from PIL import Image, ImageTk
+
+import assetCache
+import gameLoop
+import inputService
 
 # --- CONFIGURATION ---
 SCALE = 2.0
@@ -12,6 +12,12 @@ DINO_W, DINO_H = int(44 * SCALE), int(47 * SCALE)
 CROUCH_H = int(26 * SCALE)
 GROUND_Y = CANVAS_H - int(80 * (SCALE / 2))
 
+# Rates are per second; the loop steps them at a fixed 60 Hz
+GRAVITY = 2880 * SCALE
+JUMP_POWER = -900 * (SCALE ** 0.5)
+START_SPEED = 420 * SCALE
+SPEED_STEP = 9 * SCALE  # Added once a second
+
 # Colors
 SKY_COLOR = "#D1F2EB"  # Light Teal Sky
 SAND_COLOR = "#EDC9AF"  # Desert Sand
@@ -21,42 +27,36 @@ DINO_ASSETS = {}
 TEAM_COLORS = {"A": "blue", "B": "pink"}
 
 
-def load_all_assets():
-    """Loads and scales all PNG images including the dead skins."""
-    assets = [
-        "blue_run_1", "blue_run_2", "blue_crouch", "blue_dead",
-        "pink_run_1", "pink_run_2", "pink_crouch", "pink_dead",
-        "cactus", "bird", "cloud"
-    ]
-    for name in assets:
-        path = os.path.join("assets", f"{name}.png")
-        if os.path.exists(path):
-            if name == "cloud":
-                w, h = int(90 * SCALE), int(40 * SCALE)
-            else:
-                # Dead skin usually uses standard Dino dimensions
-                w, h = DINO_W, (CROUCH_H if "crouch" in name else DINO_H)
+def sprite_size(name):
+    if name == "cloud":
+        return int(90 * SCALE), int(40 * SCALE)
+    # Dead skin usually uses standard Dino dimensions
+    return DINO_W, (CROUCH_H if "crouch" in name else DINO_H)
+
 
-            img = Image.open(path).convert("RGBA").resize((w, h))
-            DINO_ASSETS[name] = ImageTk.PhotoImage(img)
-        else:
-            print(f"Warning: Missing asset {path}")
+SPRITE_NAMES = [
+    "blue_run_1", "blue_run_2", "blue_crouch", "blue_dead",
+    "pink_run_1", "pink_run_2", "pink_crouch", "pink_dead",
+    "cactus", "bird", "cloud"
+]
+ASSETS = [(f"{name}.png", sprite_size(name), None) for name in SPRITE_NAMES]
+
+
+def load_all_assets():
+    """Fetches all scaled sprites (including the dead skins) from the hub's shared cache."""
+    for name in SPRITE_NAMES:
+        try:
+            DINO_ASSETS[name] = assetCache.shared().photo(f"{name}.png", sprite_size(name))
+        except OSError:
+            print(f"Warning: Missing asset {name}.png")
             DINO_ASSETS[name] = None
 
 
 def start_game(parent_frame, on_game_over):
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    os.chdir(script_dir)
     load_all_assets()
 
-    pygame.init()
-    pygame.joystick.init()
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
-
-    GRAVITY = 0.8 * SCALE
-    JUMP_POWER = -15 * (SCALE ** 0.5)
+    inputs = inputService.shared()
+    reader = inputs.reader()
 
     container = tk.Frame(parent_frame, bg="black")
     container.pack(expand=True, fill="both")
@@ -70,14 +70,14 @@ def start_game(parent_frame, on_game_over):
 
     state = {
         "active": True,
-        "speed": 7 * SCALE,
-        "last_speed_tick": time.time(),
+        "speed": START_SPEED,
+        "speed_timer": 0.0,
         "run_frame": 0,
-        "last_anim_tick": time.time(),
+        "anim_timer": 0.0,
         "clouds": [{"x": random.randint(0, CANVAS_W), "y": random.randint(20, 100)} for _ in range(3)],
-        "A": {"y": GROUND_Y, "vy": 0, "obstacles": [], "score": 0, "crouching": False, "prev_a": False,
+        "A": {"y": GROUND_Y, "vy": 0, "obstacles": [], "score": 0, "crouching": False,
               "is_dead": False},
-        "B": {"y": GROUND_Y, "vy": 0, "obstacles": [], "score": 0, "crouching": False, "prev_a": False,
+        "B": {"y": GROUND_Y, "vy": 0, "obstacles": [], "score": 0, "crouching": False,
               "is_dead": False}
     }
 
@@ -89,22 +89,26 @@ def start_game(parent_frame, on_game_over):
     for team in ["A", "B"]:
         state[team]["obstacles"].append(spawn_obstacle())
 
-    def update():
+    def update(dt):
         if not state["active"]: return
 
-        pygame.event.pump()
+        joysticks = inputs.snapshot().controllers
+        reader.tick()
 
-        if time.time() - state["last_speed_tick"] >= 1:
-            state["speed"] += 0.15 * SCALE
-            state["last_speed_tick"] = time.time()
+        state["speed_timer"] += dt
+        if state["speed_timer"] >= 1:
+            state["speed"] += SPEED_STEP
+            state["speed_timer"] = 0.0
 
-        anim_speed = max(0.05, 0.12 - (state["speed"] / SCALE) * 0.005)
-        if time.time() - state["last_anim_tick"] > anim_speed:
+        # The legs cycle faster as the ground speeds up
+        anim_speed = max(0.05, 0.12 - (state["speed"] / SCALE / 60) * 0.005)
+        state["anim_timer"] += dt
+        if state["anim_timer"] > anim_speed:
             state["run_frame"] = 1 - state["run_frame"]
-            state["last_anim_tick"] = time.time()
+            state["anim_timer"] = 0.0
 
         for cloud in state["clouds"]:
-            cloud["x"] -= (state["speed"] * 0.3)
+            cloud["x"] -= state["speed"] * 0.3 * dt
             if cloud["x"] < -150:
                 cloud["x"] = CANVAS_W + 100
                 cloud["y"] = random.randint(20, 120)
@@ -114,18 +118,16 @@ def start_game(parent_frame, on_game_over):
             if len(joysticks) > i:
                 joy = joysticks[i]
                 p["crouching"] = joy.get_axis(1) > 0.5
-                curr_a = joy.get_button(0)
-                if curr_a and not p["prev_a"] and p["y"] >= GROUND_Y:
+                if reader.pressed(i, 0) and p["y"] >= GROUND_Y:
                     p["vy"] = JUMP_POWER
-                p["prev_a"] = curr_a
 
-            p["vy"] += GRAVITY
-            p["y"] += p["vy"]
+            p["vy"] += GRAVITY * dt
+            p["y"] += p["vy"] * dt
             if p["y"] > GROUND_Y:
                 p["y"], p["vy"] = GROUND_Y, 0
 
             for obs in p["obstacles"]:
-                obs["x"] -= state["speed"]
+                obs["x"] -= state["speed"] * dt
 
             p["obstacles"] = [o for o in p["obstacles"] if o["x"] > -100]
             if not p["obstacles"] or p["obstacles"][-1]["x"] < CANVAS_W - (300 * SCALE):
@@ -144,16 +146,14 @@ def start_game(parent_frame, on_game_over):
 
                     if collision:
                         p["is_dead"] = True
-                        render()  # Draw the dead frame
+                        render(0.0)  # Draw the dead frame
                         # Small delay so the player actually sees the dead skin
                         parent_frame.after(1000, lambda t=team: end_game(f"Team {'B' if t == 'A' else 'A'}"))
                         state["active"] = False
+                        loop.stop()
                         return
 
-        render()
-        parent_frame.after(16, update)
-
-    def render():
+    def render(alpha):
         for team in ["A", "B"]:
             canvas = canvases[team]
             canvas.delete("all")
@@ -194,7 +194,8 @@ def start_game(parent_frame, on_game_over):
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         for widget in parent_frame.winfo_children(): widget.destroy()
         on_game_over(winner)
 
-    update()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
@@ -1,22 +1,31 @@
 import tkinter as tk
 from PIL import Image, ImageTk
-import pygame
-import os
+
+import assetCache
+import gameLoop
+import inputService
 
 # Mapping for Xbox Controllers
 BUTTON_X = 2
 BUTTON_B = 1
 AXIS_X = 0
 
+# Rates are per second; the loop steps them at a fixed 60 Hz
+MOVE_SPEED = 420
+STAMINA_REGEN = 36
+BLOCK_DRAIN = 72
+LUNGE_TIME = 0.2
+
+ASSETS = [
+    ("blue_idle.png", (100, 140), None), ("blue_block.png", (100, 140), None), ("blue_lunge.png", (180, 140), None),
+    ("pink_idle.png", (100, 140), None), ("pink_block.png", (100, 140), None), ("pink_lunge.png", (180, 140), None),
+    ("dead.png", (140, 80), None),
+]
 
-def start_game(parent_frame, on_game_over):
-    # Anchor the path to this specific minigame's directory
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-    pygame.init()
-    pygame.joystick.init()
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks: joy.init()
+def start_game(parent_frame, on_game_over):
+    inputs = inputService.shared()
+    reader = inputs.reader()
 
     main_container = tk.Frame(parent_frame, bg="black")
     main_container.pack(expand=True)
@@ -26,14 +35,10 @@ def start_game(parent_frame, on_game_over):
 
     # --- IMAGE LOADING SECTION ---
     def load_img(name, size=(100, 140)):
-        # Apply the absolute pathing fix
-        path = os.path.join(BASE_DIR, "assets", name)
         try:
-            img = Image.open(path).convert("RGBA")
-            img = img.resize(size, Image.Resampling.LANCZOS)
-            return ImageTk.PhotoImage(img)
+            return assetCache.shared().photo(name, size)
         except Exception as e:
-            print(f"Error loading {path}: {e}")
+            print(f"Error loading {name}: {e}")
             # Fallback placeholder if file is missing
             placeholder = Image.new('RGBA', size, color=(255, 0, 255, 100))
             return ImageTk.PhotoImage(placeholder)
@@ -63,63 +68,78 @@ def start_game(parent_frame, on_game_over):
         "p1_lunge_timer": 0, "p2_lunge_timer": 0,
         "active": True,
         "base_reach": 60,  # Standard reach
-        "lunge_reach": 160,  # Matches the new larger image width
-        "prev_x1": False, "prev_x2": False
+        "lunge_reach": 160  # Matches the new larger image width
     }
 
     # P1 anchored South-West (grows right), P2 anchored South-East (grows left)
     p1_gfx = canvas.create_image(state["p1_pos"], 350, image=parent_frame.assets["blue_idle"], anchor="sw")
     p2_gfx = canvas.create_image(state["p2_pos"], 350, image=parent_frame.assets["pink_idle"], anchor="se")
 
-    def check_inputs():
+    def update(dt):
         if not state["active"]: return
-        pygame.event.pump()
+        joysticks = inputs.snapshot().controllers
+        reader.tick()
 
         # Stamina Regen
-        state["p1_stam"] = min(100.0, state["p1_stam"] + 0.6)
-        state["p2_stam"] = min(100.0, state["p2_stam"] + 0.6)
+        state["p1_stam"] = min(100.0, state["p1_stam"] + STAMINA_REGEN * dt)
+        state["p2_stam"] = min(100.0, state["p2_stam"] + STAMINA_REGEN * dt)
 
         # Player 1 Logic
         if len(joysticks) > 0:
             joy = joysticks[0]
             move_x = joy.get_axis(AXIS_X)
             if abs(move_x) > 0.1:
-                state["p1_pos"] = max(20, min(state["p2_pos"] - 50, state["p1_pos"] + move_x * 7))
+                state["p1_pos"] = max(20, min(state["p2_pos"] - 50, state["p1_pos"] + move_x * MOVE_SPEED * dt))
 
             state["p1_blocking"] = joy.get_button(BUTTON_B) and state["p1_stam"] > 10
-            if state["p1_blocking"]: state["p1_stam"] -= 1.2
+            if state["p1_blocking"]: state["p1_stam"] -= BLOCK_DRAIN * dt
 
-            curr_x = joy.get_button(BUTTON_X)
-            if curr_x and not state["prev_x1"] and not state["p1_blocking"] and state["p1_stam"] >= 30:
+            if reader.pressed(0, BUTTON_X) and not state["p1_blocking"] and state["p1_stam"] >= 30:
                 state["p1_stam"] -= 30
-                state["p1_lunge_timer"] = 12
-            state["prev_x1"] = curr_x
+                state["p1_lunge_timer"] = LUNGE_TIME
 
         # Player 2 Logic
         if len(joysticks) > 1:
             joy = joysticks[1]
             move_x = joy.get_axis(AXIS_X)
             if abs(move_x) > 0.1:
-                state["p2_pos"] = min(780, max(state["p1_pos"] + 50, state["p2_pos"] + move_x * 7))
+                state["p2_pos"] = min(780, max(state["p1_pos"] + 50, state["p2_pos"] + move_x * MOVE_SPEED * dt))
 
             state["p2_blocking"] = joy.get_button(BUTTON_B) and state["p2_stam"] > 10
-            if state["p2_blocking"]: state["p2_stam"] -= 1.2
+            if state["p2_blocking"]: state["p2_stam"] -= BLOCK_DRAIN * dt
 
-            curr_x = joy.get_button(BUTTON_X)
-            if curr_x and not state["prev_x2"] and not state["p2_blocking"] and state["p2_stam"] >= 30:
+            if reader.pressed(1, BUTTON_X) and not state["p2_blocking"] and state["p2_stam"] >= 30:
                 state["p2_stam"] -= 30
-                state["p2_lunge_timer"] = 12
-            state["prev_x2"] = curr_x
+                state["p2_lunge_timer"] = LUNGE_TIME
 
-        if state["p1_lunge_timer"] > 0: state["p1_lunge_timer"] -= 1
-        if state["p2_lunge_timer"] > 0: state["p2_lunge_timer"] -= 1
+        if state["p1_lunge_timer"] > 0: state["p1_lunge_timer"] -= dt
+        if state["p2_lunge_timer"] > 0: state["p2_lunge_timer"] -= dt
 
-        update_visuals_and_collisions()
-        parent_frame.after(16, check_inputs)
+        check_collisions()
 
-    def update_visuals_and_collisions():
-        if not state["active"]: return
+    def check_collisions():
+        # Hit Detection based on current reach
+        s1_tip = state["p1_pos"] + (state["lunge_reach"] if state["p1_lunge_timer"] > 0 else state["base_reach"])
+        s2_tip = state["p2_pos"] - (state["lunge_reach"] if state["p2_lunge_timer"] > 0 else state["base_reach"])
+
+        # P1 Attacks P2
+        if state["p1_lunge_timer"] > 0 and s1_tip >= state["p2_pos"] - 20:
+            if state["p2_blocking"]:
+                state["p1_stam"] = max(0, state["p1_stam"] - 40)
+                state["p1_lunge_timer"] = 0
+            else:
+                animate_death("P2", "BLUE TEAM")
+                return
+
+        # P2 Attacks P1
+        if state["p2_lunge_timer"] > 0 and s2_tip <= state["p1_pos"] + 20:
+            if state["p1_blocking"]:
+                state["p2_stam"] = max(0, state["p2_stam"] - 40)
+                state["p2_lunge_timer"] = 0
+            else:
+                animate_death("P1", "PINK TEAM")
 
+    def render(alpha):
         # Select Sprites based on state
         p1_img = parent_frame.assets["blue_idle"]
         if state["p1_lunge_timer"] > 0:
@@ -140,32 +160,14 @@ def start_game(parent_frame, on_game_over):
         canvas.itemconfig(p2_gfx, image=p2_img)
         canvas.coords(p2_gfx, state["p2_pos"], 350)
 
-        # Hit Detection based on current reach
-        s1_tip = state["p1_pos"] + (state["lunge_reach"] if state["p1_lunge_timer"] > 0 else state["base_reach"])
-        s2_tip = state["p2_pos"] - (state["lunge_reach"] if state["p2_lunge_timer"] > 0 else state["base_reach"])
-
-        # P1 Attacks P2
-        if state["p1_lunge_timer"] > 0 and s1_tip >= state["p2_pos"] - 20:
-            if state["p2_blocking"]:
-                state["p1_stam"] = max(0, state["p1_stam"] - 40)
-                state["p1_lunge_timer"] = 0
-            else:
-                animate_death("P2", "BLUE TEAM")
-
-        # P2 Attacks P1
-        if state["p2_lunge_timer"] > 0 and s2_tip <= state["p1_pos"] + 20:
-            if state["p1_blocking"]:
-                state["p2_stam"] = max(0, state["p2_stam"] - 40)
-                state["p2_lunge_timer"] = 0
-            else:
-                animate_death("P1", "PINK TEAM")
-
         # Update Stamina Bars
         canvas.coords(s_bar_a, 50, 20, 50 + (state["p1_stam"] * 2.5), 40)
         canvas.coords(s_bar_b, 500, 20, 500 + (state["p2_stam"] * 2.5), 40)
 
     def animate_death(loser_id, winner_name):
         state["active"] = False
+        loop.stop()
+        render(0)  # Show the final poses before swapping in the dead sprite
         if loser_id == "P1":
             canvas.itemconfig(p1_gfx, image=parent_frame.assets["dead"], anchor="center")
             canvas.move(p1_gfx, 0, 30)
@@ -179,4 +181,4 @@ def start_game(parent_frame, on_game_over):
         for widget in parent_frame.winfo_children(): widget.destroy()
         on_game_over(winner)
 
-    check_inputs()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
@@ -1,29 +1,22 @@
 import tkinter as tk
-import pygame
 import random
-import os
+
+import assetCache
+import canvasScene
+import gameLoop
+import inputService
 
 # Mapping for Xbox Controllers
 BUTTON_A = 0
 AXIS_LEFT_STICK_Y = 1
 
-
-def flip_image(img):
-    """Manually mirrors a PhotoImage across the Y-axis."""
-    flipped = tk.PhotoImage(width=img.width(), height=img.height())
-    for x in range(img.width()):
-        # Copy column x to column width-x-1
-        flipped.tk.call(flipped, 'copy', img, '-from', x, 0, x + 1, img.height(), '-to', img.width() - x - 1, 0)
-    return flipped
+FISH = ["cyan_fish.png", "green_fish.png", "orange_fish.png", "purple_fish.png"]
+ASSETS = ([(f, 4, None) for f in FISH] + [(f, 4, "mirror") for f in FISH] +
+          [("blue_hook.png", 3, None), ("pink_hook.png", 3, None)])
 
 
 def start_game(parent_frame, on_game_over):
-    pygame.init()
-    pygame.joystick.init()
-
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+    inputs = inputService.shared()
 
     # Colors
     P1_COLOR = "#0074D9"  # Blue
@@ -35,22 +28,24 @@ def start_game(parent_frame, on_game_over):
     canvas.pack(pady=20)
 
     # --- ASSET LOADING ---
-    asset_path = os.path.join("minigames", "assets")
+    cache = assetCache.shared()
 
     try:
         # Load and shrink base variants
-        cyan = tk.PhotoImage(file=os.path.join(asset_path, "cyan_fish.png")).subsample(4, 4)
-        green = tk.PhotoImage(file=os.path.join(asset_path, "green_fish.png")).subsample(4, 4)
-        orange = tk.PhotoImage(file=os.path.join(asset_path, "orange_fish.png")).subsample(4, 4)
-        purple = tk.PhotoImage(file=os.path.join(asset_path, "purple_fish.png")).subsample(4, 4)
+        cyan = cache.photo("cyan_fish.png", 4)
+        green = cache.photo("green_fish.png", 4)
+        orange = cache.photo("orange_fish.png", 4)
+        purple = cache.photo("purple_fish.png", 4)
 
-        # Create flipped versions
-        cyan_f, green_f, orange_f, purple_f = flip_image(cyan), flip_image(green), flip_image(orange), flip_image(
-            purple)
+        # Mirrored versions are cached too, instead of copying them column by column every round
+        cyan_f = cache.photo("cyan_fish.png", 4, "mirror")
+        green_f = cache.photo("green_fish.png", 4, "mirror")
+        orange_f = cache.photo("orange_fish.png", 4, "mirror")
+        purple_f = cache.photo("purple_fish.png", 4, "mirror")
 
         parent_frame.fishing_assets = {
-            "hook_p1": tk.PhotoImage(file=os.path.join(asset_path, "blue_hook.png")).subsample(3, 3),
-            "hook_p2": tk.PhotoImage(file=os.path.join(asset_path, "pink_hook.png")).subsample(3, 3),
+            "hook_p1": cache.photo("blue_hook.png", 3),
+            "hook_p2": cache.photo("pink_hook.png", 3),
             # Side-specific logic: [Cyan, Green, Orange, Purple]
             # Side 0 (Left): C, G, P normal, Orange Mirrored
             "p1_fish": [cyan, green, orange_f, purple],
@@ -81,9 +76,11 @@ def start_game(parent_frame, on_game_over):
         ]
     }
 
-    def update_visuals():
-        canvas.delete("all")
-        canvas.create_line(400, 0, 400, 500, fill="#333333", width=2)
+    scene = canvasScene.Scene(canvas)
+    scene.add("line", 400, 0, 400, 500, fill="#333333", width=2)
+
+    def update_visuals(alpha):
+        scene.begin()
 
         for i in range(2):
             x_center = 200 if i == 0 else 600
@@ -92,50 +89,56 @@ def start_game(parent_frame, on_game_over):
             if state["phase"][i] == "fishing":
                 hook_y = state["p_pos"][i]
                 if (hook_y - SPRITE_H) > 0:
-                    canvas.create_line(x_center, 0, x_center, hook_y - SPRITE_H, fill="white", width=1)
+                    scene.line(("line", i), x_center, 0, x_center, hook_y - SPRITE_H, fill="white", width=1)
 
                 hook_img = assets["hook_p1"] if i == 0 else assets["hook_p2"]
-                canvas.create_image(x_center, hook_y, image=hook_img, anchor="s")
-
-                for fish in state["fish_list"][i]:
-                    fish[0] += fish[2] * fish[3]
-
-                    if i == 0 and fish[0] > 380:
-                        fish[0], fish[1], fish[4] = random.randint(-50, 0), random.randint(150, 450), random.randint(0,
-                                                                                                                     3)
-                    if i == 1 and fish[0] < 420:
-                        fish[0], fish[1], fish[4] = random.randint(800, 850), random.randint(150, 450), random.randint(
-                            0, 3)
+                scene.image(("hook", i), x_center, hook_y, image=hook_img, anchor="s", layer="world")
 
+                for f_idx, fish in enumerate(state["fish_list"][i]):
                     # Select side-appropriate image
                     side_key = "p1_fish" if i == 0 else "p2_fish"
                     fish_img = assets[side_key][fish[4]]
-                    canvas.create_image(fish[0], fish[1], image=fish_img)
-
-                    # NOSE HITBOX: Higher hitbox on hook, center-front of fish
-                    hitbox_y = hook_y - 15
-                    nose_x = fish[0] + (15 * fish[3])
-                    if abs(fish[1] - hitbox_y) < 18 and abs(nose_x - x_center) < 15:
-                        state["phase"][i] = "reeling"
+                    scene.image(("fish", i, f_idx), fish[0], fish[1], image=fish_img)
 
             else:
                 # REELING PHASE
-                canvas.create_text(x_center, 50, text="STEADY...", fill="white", font=("Arial", 16, "bold"))
-                canvas.create_rectangle(x_center - 25, 120, x_center + 25, 380, outline="white", width=2)
+                scene.text(("steady", i), x_center, 50, text="STEADY...", fill="white", font=("Arial", 16, "bold"))
+                scene.rect(("bar", i), x_center - 25, 120, x_center + 25, 380, outline="white", width=2)
                 z_y = state["p_target"][i]
-                canvas.create_rectangle(x_center - 23, z_y - 25, x_center + 23, z_y + 25, fill=ZONE_COLOR)
+                scene.rect(("zone", i), x_center - 23, z_y - 25, x_center + 23, z_y + 25, fill=ZONE_COLOR)
 
                 # Player Tension Dot (Clamped inside visuals)
                 dot_y = state["p_pos"][i]
-                canvas.create_oval(x_center - 10, dot_y - 10, x_center + 10, dot_y + 10, fill=color, outline="white")
+                scene.oval(("dot", i), x_center - 10, dot_y - 10, x_center + 10, dot_y + 10, fill=color,
+                           outline="white", layer="sprites")
 
                 prog_w = (state["p_progress"][i] / state["win_goal"]) * 160
-                canvas.create_rectangle(x_center - 80, 420, x_center + 80, 435, outline="white")
-                canvas.create_rectangle(x_center - 80, 420, x_center - 80 + prog_w, 435, fill=ZONE_COLOR)
-
-    def check_inputs():
+                scene.rect(("progress_box", i), x_center - 80, 420, x_center + 80, 435, outline="white", layer="hud")
+                scene.rect(("progress", i), x_center - 80, 420, x_center - 80 + prog_w, 435, fill=ZONE_COLOR,
+                           layer="hud")
+
+        scene.end()
+
+    def move_fish(i):
+        x_center = 200 if i == 0 else 600
+        hook_y = state["p_pos"][i]
+        for fish in state["fish_list"][i]:
+            fish[0] += fish[2] * fish[3]
+
+            if i == 0 and fish[0] > 380:
+                fish[0], fish[1], fish[4] = random.randint(-50, 0), random.randint(150, 450), random.randint(0, 3)
+            if i == 1 and fish[0] < 420:
+                fish[0], fish[1], fish[4] = random.randint(800, 850), random.randint(150, 450), random.randint(0, 3)
+
+            # NOSE HITBOX: Higher hitbox on hook, center-front of fish
+            hitbox_y = hook_y - 15
+            nose_x = fish[0] + (15 * fish[3])
+            if abs(fish[1] - hitbox_y) < 18 and abs(nose_x - x_center) < 15:
+                state["phase"][i] = "reeling"
+
+    def check_inputs(dt):
         if not state["active"]: return
-        pygame.event.pump()
+        joysticks = inputs.snapshot().controllers
         for i in range(min(len(joysticks), 2)):
             joy = joysticks[i]
             axis_val = joy.get_axis(AXIS_LEFT_STICK_Y)
@@ -158,22 +161,24 @@ def start_game(parent_frame, on_game_over):
                     state["p_target_vel"][i] = random.choice([-4, -3, 3, 4])
 
                 if abs(state["p_pos"][i] - state["p_target"][i]) < 25:
-                    state["p_progress"][i] += 0.016
+                    state["p_progress"][i] += dt  # Progress is seconds spent in the zone
                 else:
-                    state["p_progress"][i] = max(0, state["p_progress"][i] - 0.002)
+                    state["p_progress"][i] = max(0, state["p_progress"][i] - 0.12 * dt)
+
+        for i in range(2):
+            if state["phase"][i] == "fishing":
+                move_fish(i)
 
-        update_visuals()
         if state["p_progress"][0] >= state["win_goal"]:
             end_game("Team A")
         elif state["p_progress"][1] >= state["win_goal"]:
             end_game("Team B")
-        else:
-            parent_frame.after(16, check_inputs)
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         for widget in parent_frame.winfo_children():
             widget.destroy()
         on_game_over(winner)
 
-    check_inputs()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, check_inputs, update_visuals)
\ No newline at end of file
@@ -1,22 +1,27 @@
 import tkinter as tk
-import pygame
 import random
-import os
-import time
+
+import assetCache
+import canvasScene
+import gameLoop
+import inputService
 
 # Mapping for Xbox Controllers
 BUTTON_A = 0
 AXIS_LX = 0
 AXIS_LY = 1
 
+# Rates are per second; the loop steps them at a fixed 60 Hz
+SHIP_SPEED = 720
+BULLET_SPEED = 960
+ALIEN_SPEED = 330
+ALIEN_DRIFT = 180
 
-def start_game(parent_frame, on_game_over):
-    pygame.init()
-    pygame.joystick.init()
+ASSETS = [("blue_ship.png", 5, None), ("pink_ship.png", 5, None)]
 
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+
+def start_game(parent_frame, on_game_over):
+    inputs = inputService.shared()
 
     P1_COLOR, P2_COLOR, BG_COLOR = "#0074D9", "#F012BE", "#020205"
     ALIEN_COLOR = "#2ECC40"
@@ -25,13 +30,10 @@ def start_game(parent_frame, on_game_over):
     canvas.pack()
 
     # --- ASSETS ---
-    current_dir = os.path.dirname(__file__)
-    asset_path = os.path.join(current_dir, "assets")
-
     try:
         # Ships are now 1/5th size (one step smaller than 1/4)
-        p1_img = tk.PhotoImage(file=os.path.join(asset_path, "blue_ship.png")).subsample(5, 5)
-        p2_img = tk.PhotoImage(file=os.path.join(asset_path, "pink_ship.png")).subsample(5, 5)
+        p1_img = assetCache.shared().photo("blue_ship.png", 5)
+        p2_img = assetCache.shared().photo("pink_ship.png", 5)
         parent_frame.space_assets = {"p1": p1_img, "p2": p2_img}
     except Exception as e:
         print(f"Asset Error: {e}")
@@ -41,7 +43,6 @@ def start_game(parent_frame, on_game_over):
     state = {
         "active": True,
         "timer": 10.0,
-        "last_time": time.time(),
         "p_active": [True, True],
         "p_exploding": [0.0, 0.0],  # Countdown for explosion effect
         "p_pos": [[200, 520], [600, 520]],
@@ -52,75 +53,84 @@ def start_game(parent_frame, on_game_over):
         "spawn_timer": 0
     }
 
-    def draw_pixel_alien(canvas, x, y):
-        # Increased pixel size 'p' from 3 to 4 for bigger aliens
-        p = 4
-        pixels = [
-            (-2, -3), (2, -3), (-1, -2), (1, -2),
-            (-3, -1), (-2, -1), (-1, -1), (0, -1), (1, -1), (2, -1), (3, -1),
-            (-4, 0), (-3, 0), (-1, 0), (0, 0), (1, 0), (3, 0), (4, 0),
-            (-4, 1), (-3, 1), (-2, 1), (-1, 1), (0, 1), (1, 1), (2, 1), (3, 1), (4, 1),
-            (-3, 2), (3, 2), (-4, 3), (-2, 3), (2, 3), (4, 3)
-        ]
-        for dx, dy in pixels:
-            canvas.create_rectangle(x + dx * p, y + dy * p, x + (dx + 1) * p, y + (dy + 1) * p, fill=ALIEN_COLOR,
-                                    outline="")
-
-    def draw_explosion(canvas, x, y, color, progress):
+    # Increased pixel size 'p' from 3 to 4 for bigger aliens
+    ALIEN_PIXEL = 4
+    ALIEN_PIXELS = [
+        (-2, -3), (2, -3), (-1, -2), (1, -2),
+        (-3, -1), (-2, -1), (-1, -1), (0, -1), (1, -1), (2, -1), (3, -1),
+        (-4, 0), (-3, 0), (-1, 0), (0, 0), (1, 0), (3, 0), (4, 0),
+        (-4, 1), (-3, 1), (-2, 1), (-1, 1), (0, 1), (1, 1), (2, 1), (3, 1), (4, 1),
+        (-3, 2), (3, 2), (-4, 3), (-2, 3), (2, 3), (4, 3)
+    ]
+
+    def make_alien_image():
+        # Baked into one image so each alien is a single canvas item instead of 33 rectangles
+        p = ALIEN_PIXEL
+        img = tk.PhotoImage(width=9 * p, height=7 * p)
+        for dx, dy in ALIEN_PIXELS:
+            x0, y0 = (dx + 4) * p, (dy + 3) * p
+            img.put(ALIEN_COLOR, to=(x0, y0, x0 + p, y0 + p))
+        return img
+
+    parent_frame.space_assets["alien"] = make_alien_image()
+
+    def draw_explosion(i, x, y, color, progress):
         # Progress goes from 0.5 down to 0
         size = (0.5 - progress) * 100
-        for _ in range(8):
+        for k in range(8):
             rx = x + random.uniform(-size, size)
             ry = y + random.uniform(-size, size)
-            canvas.create_rectangle(rx - 2, ry - 2, rx + 2, ry + 2, fill=random.choice([color, "white", "orange"]))
+            scene.rect(("boom", i, k), rx - 2, ry - 2, rx + 2, ry + 2, fill=random.choice([color, "white", "orange"]),
+                       layer="sprites")
 
-    def update_visuals():
-        canvas.delete("all")
+    # Stars and the header box never change
+    scene = canvasScene.Scene(canvas)
+    for i in range(25):
+        rx, ry = (i * 37) % 800, (i * 89) % 600
+        scene.add("oval", rx, ry, rx + 2, ry + 2, fill="#444444")
+    scene.add("rectangle", 200, 10, 600, 75, fill="#000", outline="#39FF14", width=2, layer="hud")
 
-        # Stars
-        for i in range(25):
-            rx, ry = (i * 37) % 800, (i * 89) % 600
-            canvas.create_oval(rx, ry, rx + 2, ry + 2, fill="#444444")
+    def render(alpha):
+        scene.begin()
 
         # Bullets
         for i in range(2):
             color = P1_COLOR if i == 0 else P2_COLOR
             for b in state["p_bullets"][i]:
-                canvas.create_rectangle(b[0] - 2, b[1], b[0] + 2, b[1] + 12, fill=color, outline="white")
+                scene.rect(("bullet", id(b)), b[0] - 2, b[1], b[0] + 2, b[1] + 12, fill=color, outline="white")
 
         # Aliens
+        p = ALIEN_PIXEL
         for e in state["enemies"]:
-            draw_pixel_alien(canvas, e[0], e[1])
+            scene.image(("alien", id(e)), e[0] - 4 * p, e[1] - 3 * p, image=parent_frame.space_assets["alien"],
+                        anchor="nw", layer="world")
 
         # Ships / Explosions
         for i in range(2):
             color = P1_COLOR if i == 0 else P2_COLOR
             if state["p_exploding"][i] > 0:
-                draw_explosion(canvas, state["p_pos"][i][0], state["p_pos"][i][1], color, state["p_exploding"][i])
+                draw_explosion(i, state["p_pos"][i][0], state["p_pos"][i][1], color, state["p_exploding"][i])
             elif state["p_active"][i]:
                 img = parent_frame.space_assets["p1" if i == 0 else "p2"]
-                canvas.create_image(state["p_pos"][i][0], state["p_pos"][i][1], image=img)
+                scene.image(("ship", i), state["p_pos"][i][0], state["p_pos"][i][1], image=img)
 
         # UI Header
-        canvas.create_rectangle(200, 10, 600, 75, fill="#000", outline="#39FF14", width=2)
         t_color = "white" if state["timer"] > 2.0 else "#FF4136"
-        canvas.create_text(400, 30, text=f"{state['timer']:.1f}s", fill=t_color, font=("Impact", 24))
-        canvas.create_text(280, 45, text=f"P1: {state['p_score'][0]}", fill=P1_COLOR, font=("Arial", 16, "bold"))
-        canvas.create_text(520, 45, text=f"P2: {state['p_score'][1]}", fill=P2_COLOR, font=("Arial", 16, "bold"))
+        scene.text("timer", 400, 30, text=f"{state['timer']:.1f}s", fill=t_color, font=("Impact", 24))
+        scene.text("score_a", 280, 45, text=f"P1: {state['p_score'][0]}", fill=P1_COLOR, font=("Arial", 16, "bold"))
+        scene.text("score_b", 520, 45, text=f"P2: {state['p_score'][1]}", fill=P2_COLOR, font=("Arial", 16, "bold"))
 
-    def check_inputs():
-        if not state["active"]: return
+        scene.end()
 
-        now = time.time()
-        delta = now - state["last_time"]
-        state["last_time"] = now
+    def update(dt):
+        if not state["active"]: return
 
-        state["timer"] -= delta
+        state["timer"] -= dt
 
         # Explosion Logic
         for i in range(2):
             if state["p_exploding"][i] > 0:
-                state["p_exploding"][i] -= delta
+                state["p_exploding"][i] -= dt
                 if state["p_exploding"][i] <= 0:
                     resolve_winner()
                     return
@@ -129,14 +139,14 @@ def start_game(parent_frame, on_game_over):
             resolve_winner()
             return
 
-        pygame.event.pump()
+        joysticks = inputs.snapshot().controllers
         for i in range(min(len(joysticks), 2)):
             if not state["p_active"][i] or state["p_exploding"][i] > 0: continue
             joy = joysticks[i]
 
             lx, ly = joy.get_axis(AXIS_LX), joy.get_axis(AXIS_LY)
-            if abs(lx) > 0.1: state["p_pos"][i][0] = max(20, min(780, state["p_pos"][i][0] + lx * 12))
-            if abs(ly) > 0.1: state["p_pos"][i][1] = max(100, min(560, state["p_pos"][i][1] + ly * 12))
+            if abs(lx) > 0.1: state["p_pos"][i][0] = max(20, min(780, state["p_pos"][i][0] + lx * SHIP_SPEED * dt))
+            if abs(ly) > 0.1: state["p_pos"][i][1] = max(100, min(560, state["p_pos"][i][1] + ly * SHIP_SPEED * dt))
 
             curr_a = joy.get_button(BUTTON_A)
             if curr_a and state["p_cooldown"][i] <= 0:
@@ -144,24 +154,24 @@ def start_game(parent_frame, on_game_over):
                 state["p_cooldown"][i] = 0.2
 
             if state["p_cooldown"][i] > 0:
-                state["p_cooldown"][i] -= delta
+                state["p_cooldown"][i] -= dt
 
         # Enemies Spawn
-        state["spawn_timer"] -= delta
+        state["spawn_timer"] -= dt
         if state["spawn_timer"] <= 0:
-            state["enemies"].append([random.randint(50, 750), -30, random.uniform(-3, 3)])
+            state["enemies"].append([random.randint(50, 750), -30, random.uniform(-ALIEN_DRIFT, ALIEN_DRIFT)])
             state["spawn_timer"] = 0.32
 
             # Bullet Update
         for i in range(2):
             for b in state["p_bullets"][i][:]:
-                b[1] -= 16
+                b[1] -= BULLET_SPEED * dt
                 if b[1] < -20: state["p_bullets"][i].remove(b)
 
         # Alien Update & Collision
         for e in state["enemies"][:]:
-            e[1] += 5.5
-            e[0] += e[2]
+            e[1] += ALIEN_SPEED * dt
+            e[0] += e[2] * dt
             if e[1] > 650: state["enemies"].remove(e)
 
             # Player Hitbox (Area check)
@@ -181,11 +191,9 @@ def start_game(parent_frame, on_game_over):
                         if e in state["enemies"]: state["enemies"].remove(e)
                         if b in state["p_bullets"][i]: state["p_bullets"][i].remove(b)
 
-        update_visuals()
-        parent_frame.after(16, check_inputs)
-
     def resolve_winner():
         state["active"] = False
+        loop.stop()
         s1, s2 = state["p_score"]
         # If someone exploded, they lose immediately regardless of score
         if state["p_exploding"][0] > 0 or not state["p_active"][0]:
@@ -201,4 +209,4 @@ def start_game(parent_frame, on_game_over):
                 winner = "Tie"
         on_game_over(winner)
 
-    check_inputs()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
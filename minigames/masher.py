@@ -1,25 +1,22 @@
 import tkinter as tk
-import pygame
+
+import gameLoop
+import inputService
 
 # Mapping for Xbox Controllers
 BUTTON_A = 0
 
 
 def start_game(parent_frame, on_game_over):
-    # 1. Initialize Pygame Joysticks
-    pygame.init()
-    pygame.joystick.init()
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+    # 1. Controllers come from the hub's input service
+    inputs = inputService.shared()
+    reader = inputs.reader()
 
     # 2. Game Logic Settings
     WIN_MARGIN = 7
     state = {
         "balance": 0,
-        "active": True,
-        "prev_a": False,  # Tracks previous button state for Team A
-        "prev_b": False  # Tracks previous button state for Team B
+        "active": True
     }
 
     # 3. Setup GUI
@@ -40,7 +37,7 @@ def start_game(parent_frame, on_game_over):
     # Center Marker
     canvas.create_line(canvas_w // 2, 0, canvas_w // 2, canvas_h, fill="white", width=3)
 
-    def update_bar():
+    def render(alpha):
         # Map the balance (-7 to 7) to the canvas width
         split_pct = (state["balance"] + WIN_MARGIN) / (WIN_MARGIN * 2)
         split_x = split_pct * canvas_w
@@ -48,44 +45,30 @@ def start_game(parent_frame, on_game_over):
         canvas.coords(bar_a, 0, 0, split_x, canvas_h)
         canvas.coords(bar_b, split_x, 0, canvas_w, canvas_h)
 
-    def update_game():
+    def update(dt):
         if not state["active"]: return
 
-        # A. Handle Inputs (Direct Polling like Pong)
-        pygame.event.pump()
+        # A. Handle Inputs: every "press down" since the last frame counts, even several per frame
+        reader.tick()
 
         # Handle Team A (Joy 0)
-        if len(joysticks) > 0:
-            current_a = joysticks[0].get_button(BUTTON_A)
-            # Only trigger on the "press down" action (current is True, previous was False)
-            if current_a and not state["prev_a"]:
-                state["balance"] -= 1
-            state["prev_a"] = current_a
+        state["balance"] -= reader.presses(0, BUTTON_A)
 
         # Handle Team B (Joy 1)
-        if len(joysticks) > 1:
-            current_b = joysticks[1].get_button(BUTTON_A)
-            if current_b and not state["prev_b"]:
-                state["balance"] += 1
-            state["prev_b"] = current_b
-
-        # B. Update UI
-        update_bar()
+        state["balance"] += reader.presses(1, BUTTON_A)
 
-        # C. Check for Win
+        # B. Check for Win
         if state["balance"] <= -WIN_MARGIN:
             end_game("Team A")
         elif state["balance"] >= WIN_MARGIN:
             end_game("Team B")
-        else:
-            parent_frame.after(16, update_game)  # ~60 FPS
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         canvas.destroy()
         for widget in parent_frame.winfo_children():
             widget.destroy()
         on_game_over(winner)
 
-    # Initial call
-    update_game()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
@@ -1,8 +1,11 @@
 import tkinter as tk
-import pygame
 import random
 import math
 
+import canvasScene
+import gameLoop
+import inputService
+
 # Mapping for Xbox Controllers
 BUTTON_A = 0
 BUTTON_B = 1  # Added B button for backspace
@@ -11,12 +14,8 @@ AXIS_LY = 1
 
 
 def start_game(parent_frame, on_game_over):
-    pygame.init()
-    pygame.joystick.init()
-
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+    inputs = inputService.shared()
+    reader = inputs.reader()
 
     # Colors
     P1_COLOR = "#0074D9"  # Blue
@@ -59,31 +58,30 @@ def start_game(parent_frame, on_game_over):
         "timer": 5.0,
         "p_input": ["", ""],
         "p_cursor": [[0, 0], [0, 0]],
-        "p_cooldown": [0, 0],
-        "prev_a": [False, False],
-        "prev_b": [False, False]  # Added state for B button edge detection
+        "p_cooldown": [0, 0]
     }
 
-    def update_visuals():
-        canvas.delete("all")
+    # Problem, hint and input boxes are fixed for the whole round
+    scene = canvasScene.Scene(canvas)
+    scene.add("text", 400, 50, text=problem_text, fill="white", font=("Courier", 48, "bold"))
+    scene.add("text", 400, 560, text="A: SELECT | B: BACKSPACE", fill="gray", font=("Arial", 10))
+    for x_offset in (200, 600):
+        scene.add("rectangle", x_offset - 80, 150, x_offset + 80, 190, outline="white", width=2)
 
-        # Header
-        canvas.create_text(400, 50, text=problem_text, fill="white", font=("Courier", 48, "bold"))
+    def update_visuals(alpha):
+        scene.begin()
 
         # Timer
         t_color = "white" if state["timer"] > 1.5 else "#FF4136"
-        canvas.create_text(400, 110, text=f"{state['timer']:.1f}s", fill=t_color, font=("Impact", 30))
-
-        # Controls Hint
-        canvas.create_text(400, 560, text="A: SELECT | B: BACKSPACE", fill="gray", font=("Arial", 10))
+        scene.text("timer", 400, 110, text=f"{state['timer']:.1f}s", fill=t_color, font=("Impact", 30))
 
         for p_idx in range(2):
             x_offset = 200 if p_idx == 0 else 600
             p_color = P1_COLOR if p_idx == 0 else P2_COLOR
 
             # Input Area
-            canvas.create_rectangle(x_offset - 80, 150, x_offset + 80, 190, outline="white", width=2)
-            canvas.create_text(x_offset, 170, text=state["p_input"][p_idx], fill="white", font=("Arial", 22, "bold"))
+            scene.text(("input", p_idx), x_offset, 170, text=state["p_input"][p_idx], fill="white",
+                       font=("Arial", 22, "bold"))
 
             # Keypad
             for r in range(4):
@@ -95,19 +93,23 @@ def start_game(parent_frame, on_game_over):
                     bg = p_color if is_selected else "#222222"
                     txt_color = "white" if is_selected else "#888888"
 
-                    canvas.create_rectangle(kx - 30, ky - 30, kx + 30, ky + 30, fill=bg, outline="white", width=1)
+                    scene.rect(("key", p_idx, r, c), kx - 30, ky - 30, kx + 30, ky + 30, fill=bg, outline="white",
+                               width=1)
 
                     label = keys[r][c]
                     if label == "BACK": label = "←"
                     if label == "SUBMIT": label = "✔"
 
-                    canvas.create_text(kx, ky, text=label, fill=txt_color, font=("Arial", 16, "bold"))
+                    scene.text(("label", p_idx, r, c), kx, ky, text=label, fill=txt_color, font=("Arial", 16, "bold"))
 
-    def check_inputs():
+        scene.end()
+
+    def check_inputs(dt):
         if not state["active"]: return
-        pygame.event.pump()
+        joysticks = inputs.snapshot().controllers
+        reader.tick()
 
-        state["timer"] -= 0.016
+        state["timer"] -= dt
         if state["timer"] <= 0:
             end_game("Tie")
             return
@@ -138,8 +140,7 @@ def start_game(parent_frame, on_game_over):
                     state["p_cooldown"][i] = 10
 
                     # 2. Select Button (A)
-            curr_a = joy.get_button(BUTTON_A)
-            if curr_a and not state["prev_a"][i]:
+            if reader.pressed(i, BUTTON_A):
                 row, col = state["p_cursor"][i]
                 val = keys[row][col]
 
@@ -150,23 +151,19 @@ def start_game(parent_frame, on_game_over):
                         end_game("Team A" if i == 0 else "Team B")
                     else:
                         end_game("Team B" if i == 0 else "Team A")
+                    return
                 else:
                     if len(state["p_input"][i]) < 4:
                         state["p_input"][i] += val
-            state["prev_a"][i] = curr_a
 
             # 3. Direct Backspace Button (B)
-            curr_b = joy.get_button(BUTTON_B)
-            if curr_b and not state["prev_b"][i]:
+            if reader.pressed(i, BUTTON_B):
                 # Simply remove the last character
                 state["p_input"][i] = state["p_input"][i][:-1]
-            state["prev_b"][i] = curr_b
-
-        update_visuals()
-        parent_frame.after(16, check_inputs)
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         on_game_over(winner)
 
-    check_inputs()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, check_inputs, update_visuals)
\ No newline at end of file
@@ -1,22 +1,27 @@
 import tkinter as tk
-import pygame
 import random
-import os
-import time
+
+import assetCache
+import canvasScene
+import gameLoop
+import inputService
 
 # Mapping for Xbox Controllers
 BUTTON_A = 0
 AXIS_LX = 0
 AXIS_LY = 1
 
+CURSOR_SPEED = 900  # Pixels per second at full stick; the loop steps it at a fixed 60 Hz
 
-def start_game(parent_frame, on_game_over):
-    pygame.init()
-    pygame.joystick.init()
+# Sprites allowed in the school
+SPRITE_FILES = assetCache.sprite_files(exclude=assetCache.NON_CHARACTER)
+
+ASSETS = [(f, size, None) for size in (4, 5) for f in SPRITE_FILES]
 
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+
+def start_game(parent_frame, on_game_over):
+    inputs = inputService.shared()
+    reader = inputs.reader()
 
     P1_COLOR, P2_COLOR, BG_COLOR = "#0074D9", "#F012BE", "#000000"
 
@@ -24,26 +29,21 @@ def start_game(parent_frame, on_game_over):
     canvas.pack()
 
     # --- ASSET PATHING ---
-    current_dir = os.path.dirname(__file__)
-    asset_path = os.path.join(current_dir, "assets")
-
-    try:
-        all_files = os.listdir(asset_path)
-        # Filters for basic fish sprites
-        fish_files = [f for f in all_files if f.endswith(
-            ".png") and "hook" not in f and "run" not in f and "dead" not in f and "crouch_right" not in f and "jump_right" not in f]
-    except FileNotFoundError:
+    fish_files = SPRITE_FILES
+    if not fish_files:
         on_game_over("Path Error")
         return
 
     target_filename = random.choice(fish_files)
     decoy_pool = [f for f in fish_files if f != target_filename]
 
+    # Same 1/4 and 1/5 sprites as hiddenSprite, so these are usually cache hits
+    cache = assetCache.shared()
     parent_frame.hidden_assets = {}
     for f in fish_files:
-        parent_frame.hidden_assets[f] = tk.PhotoImage(file=os.path.join(asset_path, f)).subsample(4, 4)
+        parent_frame.hidden_assets[f] = cache.photo(f, 4)
 
-    parent_frame.title_img = tk.PhotoImage(file=os.path.join(asset_path, target_filename)).subsample(5, 5)
+    parent_frame.title_img = cache.photo(target_filename, 5)
 
     assets = parent_frame.hidden_assets
     target_img = assets[target_filename]
@@ -65,31 +65,35 @@ def start_game(parent_frame, on_game_over):
     state = {
         "active": True,
         "timer": 5.0,
-        "last_time": time.time(),
         "p_pos": [[200, 350], [600, 350]],
         "p_mistakes": [0, 0],
-        "prev_a": [False, False],
         "target_x": random.randint(100, 700),
         "target_y": random.randint(150, 500),
         "target_vx": random.uniform(-1, 1) * 55,
         "target_vy": random.uniform(-1, 1) * 55
     }
 
-    def update_visuals():
-        canvas.delete("all")
+    # Target swims between the two schools; cursors and the header sit above all of them
+    scene = canvasScene.Scene(canvas, layers=("back_school", "target", "front_school", "cursors", "hud"))
+    scene.add("rectangle", 145, 15, 655, 95, fill="#000", outline="#39FF14", width=3, layer="hud")
+    scene.add("text", 370, 55, text="TARGET:", fill="white", font=("Impact", 22), layer="hud")
+    scene.add("image", 520, 55, image=parent_frame.title_img, layer="hud")
+
+    def render(alpha):
+        scene.begin()
 
         # 1. Background school
         for i in range(75):
             d = decoys[i]
-            canvas.create_image(d["x"], d["y"], image=d["img"])
+            scene.image(("decoy", i), d["x"], d["y"], image=d["img"], layer="back_school")
 
         # 2. THE TARGET
-        canvas.create_image(state["target_x"], state["target_y"], image=target_img)
+        scene.image("target", state["target_x"], state["target_y"], image=target_img, layer="target")
 
         # 3. Foreground school
         for i in range(75, 100):
             d = decoys[i]
-            canvas.create_image(d["x"], d["y"], image=d["img"])
+            scene.image(("decoy", i), d["x"], d["y"], image=d["img"], layer="front_school")
 
         # 4. Outlined Cursors (Drawn above fish but below header)
         for i in range(2):
@@ -97,37 +101,33 @@ def start_game(parent_frame, on_game_over):
             x, y = state["p_pos"][i]
 
             # --- WHITE OUTLINE LAYER ---
-            canvas.create_line(x - 17, y, x + 17, y, fill="white", width=4)
-            canvas.create_line(x, y - 17, x, y + 17, fill="white", width=4)
-            canvas.create_oval(x - 12, y - 12, x + 12, y + 12, outline="white", width=4)
+            scene.line(("outline_h", i), x - 17, y, x + 17, y, fill="white", width=4, layer="cursors")
+            scene.line(("outline_v", i), x, y - 17, x, y + 17, fill="white", width=4, layer="cursors")
+            scene.oval(("outline_ring", i), x - 12, y - 12, x + 12, y + 12, outline="white", width=4, layer="cursors")
 
             # --- COLORED CENTER LAYER ---
-            canvas.create_line(x - 15, y, x + 15, y, fill=color, width=2)
-            canvas.create_line(x, y - 15, x, y + 15, fill=color, width=2)
-            canvas.create_oval(x - 10, y - 10, x + 10, y + 10, outline=color, width=2)
+            scene.line(("cross_h", i), x - 15, y, x + 15, y, fill=color, width=2, layer="cursors")
+            scene.line(("cross_v", i), x, y - 15, x, y + 15, fill=color, width=2, layer="cursors")
+            scene.oval(("ring", i), x - 10, y - 10, x + 10, y + 10, outline=color, width=2, layer="cursors")
 
         # 5. Header (On top of everything)
-        canvas.create_rectangle(145, 15, 655, 95, fill="#000", outline="#39FF14", width=3)
         t_color = "white" if state["timer"] > 1.5 else "#FF4136"
-        canvas.create_text(210, 55, text=f"{state['timer']:.1f}s", fill=t_color, font=("Impact", 24))
-        canvas.create_text(370, 55, text="TARGET:", fill="white", font=("Impact", 22))
-        canvas.create_image(520, 55, image=parent_frame.title_img)
+        scene.text("timer", 210, 55, text=f"{state['timer']:.1f}s", fill=t_color, font=("Impact", 24))
 
         # Mistakes UI
         for i in range(2):
             ui_x = 580 if i == 0 else 610
             for m in range(3):
                 m_color = "red" if state["p_mistakes"][i] > m else "#222"
-                canvas.create_oval(ui_x, 30 + (m * 15), ui_x + 10, 40 + (m * 15), fill=m_color, outline="white")
+                scene.oval(("mistake", i, m), ui_x, 30 + (m * 15), ui_x + 10, 40 + (m * 15), fill=m_color,
+                           outline="white", layer="hud")
 
-    def check_inputs():
-        if not state["active"]: return
+        scene.end()
 
-        current_now = time.time()
-        delta = current_now - state["last_time"]
-        state["last_time"] = current_now
+    def update(dt):
+        if not state["active"]: return
 
-        state["timer"] -= delta
+        state["timer"] -= dt
         if state["timer"] <= 0:
             state["timer"] = 0
             handle_timeout()
@@ -135,26 +135,26 @@ def start_game(parent_frame, on_game_over):
 
         # Bounce Physics
         for d in decoys:
-            d["x"] += d["vx"] * delta
-            d["y"] += d["vy"] * delta
+            d["x"] += d["vx"] * dt
+            d["y"] += d["vy"] * dt
             if d["x"] < 20 or d["x"] > 780: d["vx"] *= -1
             if d["y"] < 110 or d["y"] > 580: d["vy"] *= -1
 
-        state["target_x"] += state["target_vx"] * delta
-        state["target_y"] += state["target_vy"] * delta
+        state["target_x"] += state["target_vx"] * dt
+        state["target_y"] += state["target_vy"] * dt
         if state["target_x"] < 20 or state["target_x"] > 780: state["target_vx"] *= -1
         if state["target_y"] < 110 or state["target_y"] > 580: state["target_vy"] *= -1
 
-        pygame.event.pump()
+        joysticks = inputs.snapshot().controllers
+        reader.tick()
         for i in range(min(len(joysticks), 2)):
             joy = joysticks[i]
             lx, ly = joy.get_axis(AXIS_LX), joy.get_axis(AXIS_LY)
 
-            if abs(lx) > 0.1: state["p_pos"][i][0] = max(10, min(790, state["p_pos"][i][0] + lx * 15))
-            if abs(ly) > 0.1: state["p_pos"][i][1] = max(10, min(590, state["p_pos"][i][1] + ly * 15))
+            if abs(lx) > 0.1: state["p_pos"][i][0] = max(10, min(790, state["p_pos"][i][0] + lx * CURSOR_SPEED * dt))
+            if abs(ly) > 0.1: state["p_pos"][i][1] = max(10, min(590, state["p_pos"][i][1] + ly * CURSOR_SPEED * dt))
 
-            curr_a = joy.get_button(BUTTON_A)
-            if curr_a and not state["prev_a"][i]:
+            if reader.pressed(i, BUTTON_A):
                 px, py = state["p_pos"][i]
                 tx, ty = state["target_x"], state["target_y"]
                 dist = ((px - tx) ** 2 + (py - ty) ** 2) ** 0.5
@@ -166,10 +166,6 @@ def start_game(parent_frame, on_game_over):
                     if state["p_mistakes"][i] >= 3:
                         end_game("Team B" if i == 0 else "Team A")
                         return
-            state["prev_a"][i] = curr_a
-
-        update_visuals()
-        parent_frame.after(16, check_inputs)
 
     def handle_timeout():
         m1, m2 = state["p_mistakes"]
@@ -182,8 +178,9 @@ def start_game(parent_frame, on_game_over):
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         for widget in parent_frame.winfo_children():
             widget.destroy()
         on_game_over(winner)
 
-    check_inputs()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
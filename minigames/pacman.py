@@ -1,80 +1,200 @@
 import tkinter as tk
-from PIL import Image, ImageTk
-import pygame
 import random
 import math
-import os
+import threading
+from array import array
+from collections import deque
+
+import assetCache
+import canvasScene
+import gameLoop
+import inputService
 
 # Mapping for Xbox Controllers
 BUTTON_A = 0
 AXIS_X = 0
 AXIS_Y = 1
 
+# Board size: odd numbers, anything from the classic 13 x 13 up to a full screen (e.g. 23 x 25)
+ROWS, COLS = 13, 13
+BOARD_MAX_PX = (860, 900)  # Room for one player's board (height, width); two sit side by side
+CELL_SIZE = min(35, BOARD_MAX_PX[0] // ROWS, BOARD_MAX_PX[1] // COLS)
+SPRITE_SIZE = CELL_SIZE - 3
+POWER_SIZE = CELL_SIZE * 22 // 35
+
+# Sprites this game asks the asset cache for (read by buildAssets.py)
+ASSETS = [(f"{name}.png", (SPRITE_SIZE, SPRITE_SIZE), None) for name in [
+    "pac_open", "pac_closed", "ghost_red", "ghost_cyan", "ghost_orange", "ghost_pink", "ghost_dead"
+]] + [("power_pellet.png", (POWER_SIZE, POWER_SIZE), None)]
+
+PLAYER_SPAWN = (1, 1)
+GHOST_SPAWN = (ROWS // 2, COLS // 2)  # On the open middle row
+NUM_POWERS = 4  # Number of random power pellets per player
+MAZE_POOL_SIZE = 4  # Ready mazes kept on hand: two rounds' worth
+
+# Rates are per second (speeds in cells); the loop steps them at a fixed 60 Hz
+MOVE_SPEED = 12.0
+GHOST_SPEED = 4.8
+POWER_TIME = 110 / 60
+CHOMP_RATE = 12  # Mouth opens or shuts this many times a second
+
+# Ghost behaviour, in seconds: scatter to their corners for a bit, then chase for longer
+NUM_GHOSTS = 1  # Per player
+SCATTER_TIME = 7.0
+CHASE_TIME = 20.0
+
+UNREACHABLE = 0xFFFF
+
+
+class PathTables:
+    """
+    Shortest paths between every pair of floor cells in one maze, worked out once when the maze is made:
+      distance(a, b)   - steps from a to b (the wrap-around tunnel included)
+      next_cell(a, b)  - the neighbour of a to move to on the way to b
+    Both are one array lookup, so any number of ghosts can re-plan at every cell for free.
+    """
+
+    def __init__(self, maze):
+        rows, cols = len(maze), len(maze[0])
+        self.cells = [(r, c) for r in range(rows) for c in range(cols) if maze[r][c] == 0]
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        n = self.n = len(self.cells)
+
+        self.neighbors = []
+        for r, c in self.cells:
+            around = []
+            for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+                nr, nc = r + dr, (c + dc) % cols  # Only the tunnel row is open at both edges
+                if 0 <= nr < rows and maze[nr][nc] == 0:
+                    around.append(self.index[(nr, nc)])
+            self.neighbors.append(around)
+
+        # Row t holds every cell's distance to t and its first step toward t: one BFS out from each target
+        self._dist = array("H", [UNREACHABLE]) * (n * n)
+        self._next = array("H", [0]) * (n * n)
+        for t in range(n):
+            base = t * n
+            self._dist[base + t] = 0
+            self._next[base + t] = t
+            frontier = deque([t])
+            while frontier:
+                u = frontier.popleft()
+                d = self._dist[base + u] + 1
+                for v in self.neighbors[u]:
+                    if self._dist[base + v] == UNREACHABLE:
+                        self._dist[base + v] = d
+                        self._next[base + v] = u  # From v, u is one step closer to t
+                        frontier.append(v)
+
+    def distance(self, a, b):
+        return self._dist[self.index[b] * self.n + self.index[a]]
+
+    def next_cell(self, a, b):
+        return self.cells[self._next[self.index[b] * self.n + self.index[a]]]
+
+    def cells_around(self, cell):
+        return [self.cells[i] for i in self.neighbors[self.index[cell]]]
+
+    def nearest(self, r, c):
+        """The floor cell closest (as the crow flies) to any point, e.g. a corner."""
+        return min(self.cells, key=lambda cell: (cell[0] - r) ** 2 + (cell[1] - c) ** 2)
+
+
+# --- MAZES ---
+def generate_maze(rows, cols, rng=random):
+    """Depth-first carve from the player spawn, with an explicit stack so board size isn't capped by recursion."""
+    grid = [[1] * cols for _ in range(rows)]
+    grid[1][1] = 0
+    stack = [(1, 1)]
+    while stack:
+        r, c = stack[-1]
+        options = [(dr, dc) for dr, dc in ((0, 2), (0, -2), (2, 0), (-2, 0))
+                   if 0 < r + dr < rows - 1 and 0 < c + dc < cols - 1 and grid[r + dr][c + dc] == 1]
+        if not options:
+            stack.pop()
+            continue
+        dr, dc = rng.choice(options)
+        grid[r + dr // 2][c + dc // 2] = 0
+        grid[r + dr][c + dc] = 0
+        stack.append((r + dr, c + dc))
+
+    for c in range(cols): grid[rows // 2][c] = 0  # Open middle row, wrapping at both edges
+    return grid
+
+
+def build_maze():
+    """A checked ROWS x COLS maze with its path tables: (maze, PathTables). Retries until one passes validation."""
+    while True:
+        maze = generate_maze(ROWS, COLS)
+        maze[GHOST_SPAWN[0]][GHOST_SPAWN[1]] = 0
+        maze[PLAYER_SPAWN[0]][PLAYER_SPAWN[1]] = 0
+        paths = PathTables(maze)
+        # Every floor cell reachable from the spawn (so every pellet can be eaten), and room for the powers
+        if (all(paths.distance(PLAYER_SPAWN, cell) != UNREACHABLE for cell in paths.cells)
+                and len(paths.cells) > NUM_POWERS + 2):
+            return maze, paths
+        print(f"PACMAN: discarded an invalid {ROWS}x{COLS} maze")
+
+
+_maze_pool = deque()  # (rows, cols, maze, PathTables)
+_pool_lock = threading.Lock()
+
+
+def prefetch():
+    """Tops the maze pool up. The hub calls this off the Tk thread, so rounds start from ready mazes."""
+    with _pool_lock:  # One filler at a time
+        while sum(1 for entry in _maze_pool if entry[:2] == (ROWS, COLS)) < MAZE_POOL_SIZE:
+            _maze_pool.append((ROWS, COLS) + build_maze())
+
+
+def take_maze():
+    """A ready (maze, PathTables) from the pool, or a freshly built one if the pool has run dry."""
+    while _maze_pool:
+        try:
+            rows, cols, maze, paths = _maze_pool.popleft()
+        except IndexError:
+            break
+        if (rows, cols) == (ROWS, COLS):
+            return maze, paths
+    print("PACMAN: maze pool empty, generating on the spot")
+    return build_maze()
+
 
 def start_game(parent_frame, on_game_over):
-    pygame.init()
-    pygame.joystick.init()
-
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+    inputs = inputService.shared()
 
     # --- ASSET LOADING ---
-    # 1. Anchor the path to the directory where pacman.py lives
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    # Decoded sprites come from the hub's shared cache, so replays don't touch the PNGs again
+    assets = assetCache.shared()
 
-    def load_sprite(path, size=(32, 32)):
-        full_path = os.path.join(BASE_DIR, path)
+    def load_sprite(name, size=(SPRITE_SIZE, SPRITE_SIZE)):
         try:
-            img = Image.open(full_path).resize(size, Image.Resampling.LANCZOS)
-            return ImageTk.PhotoImage(img)
+            return assets.photo(name, size)
         except Exception as e:
-            print(f"Error loading {full_path}: {e}")
+            print(f"Error loading {name}: {e}")
             return None
 
     GHOST_COLOR_KEYS = ["ghost_red", "ghost_cyan", "ghost_orange", "ghost_pink"]
 
-    # 2. Attach sprites to parent_frame to prevent Tkinter garbage collection
+    # Attach sprites to parent_frame to prevent Tkinter garbage collection
     parent_frame.sprites = {
-        "pac_open": load_sprite("assets/pac_open.png"),
-        "pac_closed": load_sprite("assets/pac_closed.png"),
-        "ghost_red": load_sprite("assets/ghost_red.png"),
-        "ghost_cyan": load_sprite("assets/ghost_cyan.png"),
-        "ghost_orange": load_sprite("assets/ghost_orange.png"),
-        "ghost_pink": load_sprite("assets/ghost_pink.png"),
-        "ghost_dead": load_sprite("assets/ghost_dead.png"),
-        "power": load_sprite("assets/power_pellet.png", (22, 22))
+        "pac_open": load_sprite("pac_open.png"),
+        "pac_closed": load_sprite("pac_closed.png"),
+        "ghost_red": load_sprite("ghost_red.png"),
+        "ghost_cyan": load_sprite("ghost_cyan.png"),
+        "ghost_orange": load_sprite("ghost_orange.png"),
+        "ghost_pink": load_sprite("ghost_pink.png"),
+        "ghost_dead": load_sprite("ghost_dead.png"),
+        "power": load_sprite("power_pellet.png", (POWER_SIZE, POWER_SIZE))
     }
 
-    def generate_maze(rows, cols):
-        grid = [[1 for _ in range(cols)] for _ in range(rows)]
-        mid_row = rows // 2
-
-        def walk(r, c):
-            grid[r][c] = 0
-            dirs = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-            random.shuffle(dirs)
-            for dr, dc in dirs:
-                nr, nc = r + (dr * 2), c + (dc * 2)
-                if 0 < nr < rows - 1 and 0 < nc < cols - 1 and grid[nr][nc] == 1:
-                    grid[r + dr][c + dc] = 0
-                    walk(nr, nc)
-
-        walk(1, 1)
-        for c in range(cols): grid[mid_row][c] = 0
-        return grid
-
     # UI & Game Settings
     main_container = tk.Frame(parent_frame, bg="black")
     main_container.pack(expand=True, fill="both")
     game_columns = tk.Frame(main_container, bg="black")
     game_columns.pack(expand=True)
 
-    ROWS, COLS = 13, 13
-    CELL_SIZE = 35
-    MOVE_SPEED = 0.20
-    GHOST_SPEED = 0.08
-    NUM_POWERS = 4  # Number of random power pellets per player
+    HALF = CELL_SIZE // 2
 
     canvases = []
     for i in range(2):
@@ -82,19 +202,17 @@ def start_game(parent_frame, on_game_over):
         c.pack(side="left", padx=50)
         canvases.append(c)
 
-    state = {"active": True, "frame_count": 0, "players": []}
+    state = {"active": True, "time": 0.0, "players": []}
 
     for i in range(2):
-        m = generate_maze(ROWS, COLS)
-        m[6][6] = 0  # Ghost spawn
-        m[1][1] = 0  # Player spawn
+        m, paths = take_maze()
 
         # 1. Find all available floor tiles
-        floor_tiles = [(r, c) for r in range(ROWS) for c in range(COLS) if m[r][c] == 0]
+        floor_tiles = list(paths.cells)
 
         # 2. Safety: remove spawns so you don't start on a power pellet
-        if (1, 1) in floor_tiles: floor_tiles.remove((1, 1))
-        if (6, 6) in floor_tiles: floor_tiles.remove((6, 6))
+        if PLAYER_SPAWN in floor_tiles: floor_tiles.remove(PLAYER_SPAWN)
+        if GHOST_SPAWN in floor_tiles: floor_tiles.remove(GHOST_SPAWN)
 
         # 3. Randomize Power Pellet locations
         random_powers = random.sample(floor_tiles, min(NUM_POWERS, len(floor_tiles)))
@@ -102,43 +220,97 @@ def start_game(parent_frame, on_game_over):
         # 4. Every OTHER floor tile becomes a regular pellet
         random_pellets = [tile for tile in floor_tiles if tile not in random_powers]
 
+        # Each ghost haunts its own corner when scattering
+        corners = [paths.nearest(r, c) for r, c in ((0, COLS), (0, 0), (ROWS, COLS), (ROWS, 0))]
+
         state["players"].append({
-            "x": 1.0, "y": 1.0, "vx": MOVE_SPEED, "vy": 0, "maze": m,
-            "pellets": set(random_pellets),
-            "powers": set(random_powers),
+            "x": float(PLAYER_SPAWN[1]), "y": float(PLAYER_SPAWN[0]), "vx": MOVE_SPEED, "vy": 0, "maze": m,
+            # (row, col) -> canvas item id, filled in when the board is drawn
+            "pellets": dict.fromkeys(random_pellets),
+            "powers": dict.fromkeys(random_powers),
             "power_timer": 0,
             "angle": 0,
-            "ghosts": [{"x": 6.0, "y": 6.0, "vx": GHOST_SPEED, "vy": 0, "color": random.choice(GHOST_COLOR_KEYS)}]
+            "paths": paths,
+            "ghosts": [{"x": float(GHOST_SPAWN[1]), "y": float(GHOST_SPAWN[0]), "to": GHOST_SPAWN,
+                        "home": corners[g % len(corners)], "color": random.choice(GHOST_COLOR_KEYS)}
+                       for g in range(NUM_GHOSTS)]
         })
 
-    def draw_screens():
-        state["frame_count"] += 1
-        is_open = (state["frame_count"] // 5) % 2 == 0
+    # Walls and pellets are drawn once per round; an eaten pellet deletes its own item and nothing else is redrawn
+    scenes = []
+    for i in range(2):
+        scene = canvasScene.Scene(canvases[i])
+        p = state["players"][i]
+        maze = p["maze"]
+        for r in range(ROWS):
+            for c in range(COLS):
+                if maze[r][c] == 1:
+                    x1, y1 = c * CELL_SIZE, r * CELL_SIZE
+                    scene.add("rectangle", x1, y1, x1 + CELL_SIZE, y1 + CELL_SIZE, fill="#1919A6", outline="")
+        for (r, c) in p["pellets"]:
+            x1, y1 = c * CELL_SIZE, r * CELL_SIZE
+            p["pellets"][(r, c)] = scene.add("oval", x1 + HALF - 2, y1 + HALF - 2, x1 + HALF + 2, y1 + HALF + 2,
+                                             layer="world", fill="#FFB8AE", outline="")
+        if parent_frame.sprites["power"]:
+            for (r, c) in p["powers"]:
+                p["powers"][(r, c)] = scene.add("image", c * CELL_SIZE + HALF, r * CELL_SIZE + HALF, layer="world",
+                                                image=parent_frame.sprites["power"])
+        scenes.append(scene)
+
+    def eat(i, items, cell):
+        """Removes the pellet at cell, if there is one, along with its canvas item. True if one was eaten."""
+        if cell not in items:
+            return False
+        item = items.pop(cell)
+        if item is not None:
+            canvases[i].delete(item)
+        return True
+
+    def render(alpha):
+        # Only the sprites move; everything else on the board was drawn up front
+        is_open = int(state["time"] * CHOMP_RATE) % 2 == 0
         for i in range(2):
-            canvas = canvases[i]
+            scene = scenes[i]
             p = state["players"][i]
-            canvas.delete("all")
-            for r in range(ROWS):
-                for c in range(COLS):
-                    x1, y1 = c * CELL_SIZE, r * CELL_SIZE
-                    if p["maze"][r][c] == 1:
-                        canvas.create_rectangle(x1, y1, x1 + CELL_SIZE, y1 + CELL_SIZE, fill="#1919A6", outline="")
-                    elif (r, c) in p["powers"]:
-                        # 3. Update dictionary references
-                        if parent_frame.sprites["power"]: canvas.create_image(x1 + 17, y1 + 17,
-                                                                              image=parent_frame.sprites["power"])
-                    elif (r, c) in p["pellets"]:
-                        canvas.create_oval(x1 + 15, y1 + 15, x1 + 19, y1 + 19, fill="#FFB8AE", outline="")
-            for g in p["ghosts"]:
+            scene.begin()
+            for g_idx, g in enumerate(p["ghosts"]):
                 img_key = "ghost_dead" if p["power_timer"] > 0 else g["color"]
                 g_img = parent_frame.sprites.get(img_key)
-                if g_img: canvas.create_image(g["x"] * CELL_SIZE + 17, g["y"] * CELL_SIZE + 17, image=g_img)
+                if g_img: scene.image(("ghost", g_idx), g["x"] * CELL_SIZE + HALF, g["y"] * CELL_SIZE + HALF,
+                                  image=g_img)
             p_img = parent_frame.sprites["pac_open"] if is_open else parent_frame.sprites["pac_closed"]
-            if p_img: canvas.create_image(p["x"] * CELL_SIZE + 17, p["y"] * CELL_SIZE + 17, image=p_img)
-
-    def check_inputs():
+            if p_img: scene.image("pac", p["x"] * CELL_SIZE + HALF, p["y"] * CELL_SIZE + HALF, image=p_img)
+            scene.end()
+
+    def choose_ghost_step(p, g, here):
+        """Next cell for a ghost that has just reached here: flee, scatter or chase, each a table lookup."""
+        paths = p["paths"]
+        pac = (int(round(p["y"])), int(round(p["x"])) % COLS)
+        if pac not in paths.index:
+            pac = here  # Mid-tunnel; hold course for a cell
+        if p["power_timer"] > 0:
+            # Flee: whichever neighbouring cell is farthest from Pac-Man by maze distance
+            return max(paths.cells_around(here), key=lambda cell: paths.distance(cell, pac))
+        scatter = state["time"] % (SCATTER_TIME + CHASE_TIME) < SCATTER_TIME
+        return paths.next_cell(here, g["home"] if scatter else pac)
+
+    def move_ghost(p, g, dt):
+        to_r, to_c = g["to"]
+        dx, dy = to_c - g["x"], to_r - g["y"]
+        if abs(dx) > 1:
+            dx = dy = 0  # Through the tunnel: come out the other side
+        step = GHOST_SPEED * dt
+        if abs(dx) + abs(dy) > step:
+            g["x"] += math.copysign(step, dx) if dx else 0
+            g["y"] += math.copysign(step, dy) if dy else 0
+            return
+        g["x"], g["y"] = float(to_c), float(to_r)
+        g["to"] = choose_ghost_step(p, g, g["to"])
+
+    def update(dt):
         if not state["active"]: return
-        pygame.event.pump()
+        state["time"] += dt
+        joysticks = inputs.snapshot().controllers
         for i in range(min(len(joysticks), 2)):
             joy, p = joysticks[i], state["players"][i]
             raw_x, raw_y = joy.get_axis(AXIS_X), joy.get_axis(AXIS_Y)
@@ -151,8 +323,8 @@ def start_game(parent_frame, on_game_over):
                 if 0 <= ty < ROWS and p["maze"][ty][tx] == 0:
                     p["vx"], p["vy"], p["x"] = 0, (MOVE_SPEED if raw_y > 0 else -MOVE_SPEED), round(p["x"])
 
-            p["x"] += p["vx"]
-            p["y"] += p["vy"]
+            p["x"] += p["vx"] * dt
+            p["y"] += p["vy"] * dt
             if p["x"] < -0.4:
                 p["x"] = COLS - 0.6
             elif p["x"] > COLS - 0.6:
@@ -165,33 +337,21 @@ def start_game(parent_frame, on_game_over):
                 p["vx"], p["vy"], p["x"], p["y"] = 0, 0, round(p["x"]), round(p["y"])
 
             cur = (int(round(p["y"])), int(round(p["x"])))
-            if cur in p["pellets"]: p["pellets"].remove(cur)
-            if cur in p["powers"]:
-                p["powers"].remove(cur)
-                p["power_timer"] = 110
+            eat(i, p["pellets"], cur)
+            if eat(i, p["powers"], cur):
+                p["power_timer"] = POWER_TIME
 
-            if p["power_timer"] > 0: p["power_timer"] -= 1
+            if p["power_timer"] > 0: p["power_timer"] -= dt
 
             for g in p["ghosts"]:
-                nx, ny = g["x"] + g["vx"], g["y"] + g["vy"]
-                if p["maze"][int(round(ny % ROWS))][int(round(nx % COLS))] == 1:
-                    g["vx"], g["vy"] = random.choice(
-                        [(GHOST_SPEED, 0), (-GHOST_SPEED, 0), (0, GHOST_SPEED), (0, -GHOST_SPEED)])
-                else:
-                    g["x"], g["y"] = nx, ny
-
-                if g["x"] < 0:
-                    g["x"] = COLS - 1
-                elif g["x"] > COLS - 1:
-                    g["x"] = 0
+                move_ghost(p, g, dt)
 
                 if math.dist((p["x"], p["y"]), (g["x"], g["y"])) < 0.6:
                     if p["power_timer"] > 0:
-                        g["x"], g["y"], g["color"] = 6.0, 6.0, random.choice(GHOST_COLOR_KEYS)
+                        g["x"], g["y"], g["to"] = float(GHOST_SPAWN[1]), float(GHOST_SPAWN[0]), GHOST_SPAWN
+                        g["color"] = random.choice(GHOST_COLOR_KEYS)
                     else:
-                        p["x"], p["y"], p["vx"], p["vy"] = 1.0, 1.0, 0, 0
-
-        draw_screens()
+                        p["x"], p["y"], p["vx"], p["vy"] = float(PLAYER_SPAWN[1]), float(PLAYER_SPAWN[0]), 0, 0
 
         # Win condition check
         if not state["players"][0]["pellets"] or not state["players"][1]["pellets"]:
@@ -202,12 +362,11 @@ def start_game(parent_frame, on_game_over):
             else:
                 winner = "Pink Wins"
             end_game(winner)
-        else:
-            parent_frame.after(16, check_inputs)
 
     def end_game(winner_text):
         state["active"] = False
+        loop.stop()
         for widget in parent_frame.winfo_children(): widget.destroy()
         on_game_over(winner_text)
 
-    check_inputs()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
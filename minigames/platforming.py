@@ -1,25 +1,29 @@
 import tkinter as tk
-import pygame
 import random
 import math
-import time
+
+import canvasScene
+import gameLoop
+import inputService
 
 # Xbox Mapping
 STICK_X = 0
 BUTTON_A = 0
 
+# Rates are per second; the loop steps them at a fixed 60 Hz
+GRAVITY = 2880
+JUMP_STRENGTH = -900
+MOVE_SPEED = 420
+CAMERA_LAG = 0.9 ** 60  # Share of the gap to the leader the camera has yet to close after a second
+PLAYER_SIZE = 28
+
+
 def start_game(parent_frame, on_game_over):
-    pygame.init()
-    pygame.joystick.init()
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks: joy.init()
+    inputs = inputService.shared()
+    reader = inputs.reader()
 
     # Constants
     CANVAS_W, CANVAS_H = 800, 600
-    GRAVITY = 0.8
-    JUMP_STRENGTH = -15
-    MOVE_SPEED = 7
-    PLAYER_SIZE = 28
     LAYER_SPACING = 120
     TOTAL_LAYERS = 12
     GAME_TIMEOUT = 10.0 # Increased for better playability
@@ -38,7 +42,7 @@ def start_game(parent_frame, on_game_over):
             moving_platforms.append({
                 "x_start": x_pos, "y": y_pos, "w": 160, "h": 20,
                 "range": random.randint(100, 200),
-                "speed": random.uniform(0.02, 0.04),
+                "speed": random.uniform(1.2, 2.4),  # Radians per second
                 "offset": random.uniform(0, 6), "curr_x": x_pos
             })
         else:
@@ -49,50 +53,63 @@ def start_game(parent_frame, on_game_over):
     goal_platform = {"x": 0, "y": goal_y, "w": 800, "h": 80, "is_goal": True}
 
     state = {
-        "active": True, "camera_y": 0, "frame_count": 0, "start_time": time.time(),
-        "Team A": {"x": 200, "y": 500, "vx": 0, "vy": 0, "color": "blue", "on_ground": False, "prev_a": False},
-        "Team B": {"x": 600, "y": 500, "vx": 0, "vy": 0, "color": "pink", "on_ground": False, "prev_a": False}
+        "active": True, "camera_y": 0, "time": 0.0, "time_left": GAME_TIMEOUT,
+        "Team A": {"x": 200, "y": 500, "vx": 0, "vy": 0, "color": "blue", "on_ground": False},
+        "Team B": {"x": 600, "y": 500, "vx": 0, "vy": 0, "color": "pink", "on_ground": False}
     }
 
     canvas = tk.Canvas(parent_frame, width=CANVAS_W, height=CANVAS_H, bg="#050510", highlightthickness=0)
     canvas.pack(expand=True)
 
-    def resolve_collision(p, all_plats):
+    # Goal and fixed platforms are drawn once in world coordinates and scrolled together with one move()
+    scene = canvasScene.Scene(canvas)
+    gp = goal_platform
+    scene.add("rectangle", gp["x"], gp["y"], gp["x"] + gp["w"], gp["y"] + gp["h"], fill="gold", outline="white",
+              width=3, tags="scroll")
+    scene.add("text", 400, gp["y"] + gp["h"] / 2, text="FINISH LINE", fill="black", font=("Impact", 30),
+              tags="scroll")
+    for p in platforms:
+        scene.add("rectangle", p["x"], p["y"], p["x"] + p["w"], p["y"] + p["h"], fill="#333b4d", outline="white",
+                  tags="scroll")
+    scene.add("rectangle", 0, 0, 800, 50, fill="black", outline="white", width=2, layer="hud")
+    drawn_cam = [0]  # Camera offset the scrolled items currently sit at
+
+    def resolve_collision(p, all_plats, dt):
         p["on_ground"] = False
         for (x, y, w, h) in all_plats:
             # Check if player is within horizontal bounds of platform
             if p["x"] + PLAYER_SIZE > x and p["x"] < x + w:
                 # 1. LANDING (Top of platform)
                 if p["vy"] >= 0:
-                    if (p["y"] + PLAYER_SIZE - p["vy"]) <= y + 12 and (p["y"] + PLAYER_SIZE) >= y:
+                    if (p["y"] + PLAYER_SIZE - p["vy"] * dt) <= y + 12 and (p["y"] + PLAYER_SIZE) >= y:
                         p["y"] = y - PLAYER_SIZE
                         p["vy"] = 0
                         p["on_ground"] = True
                         return
                 # 2. BONKING (Bottom of platform)
                 elif p["vy"] < 0:
-                    if (p["y"] - p["vy"]) >= (y + h - 12) and p["y"] <= (y + h):
+                    if (p["y"] - p["vy"] * dt) >= (y + h - 12) and p["y"] <= (y + h):
                         p["y"] = y + h
                         p["vy"] = 0
                         return
 
-    def update():
+    def update(dt):
         if not state["active"]: return
-        state["frame_count"] += 1
-        pygame.event.pump()
+        state["time"] += dt
+        joysticks = inputs.snapshot().controllers
+        reader.tick()
 
-        elapsed = time.time() - state["start_time"]
-        time_left = max(0, GAME_TIMEOUT - elapsed)
+        state["time_left"] = max(0, state["time_left"] - dt)
 
         # Timer Timeout
-        if time_left <= 0:
+        if state["time_left"] <= 0:
             winner = "Team A" if state["Team A"]["y"] < state["Team B"]["y"] else "Team B"
             if state["Team A"]["y"] == state["Team B"]["y"]: winner = "Tie"
             end_game(winner)
             return
 
         for m in moving_platforms:
-            m["curr_x"] = m["x_start"] + math.sin(state["frame_count"] * m["speed"] + m["offset"]) * m["range"]
+            m["curr_x"] = m["x_start"] + math.sin(state["time"] * m["speed"] + m["offset"]) * m["range"]
 
         # Only standard platforms have physical collisions
         all_plats = [(p["x"], p["y"], p["w"], p["h"]) for p in platforms]
@@ -106,15 +123,13 @@ def start_game(parent_frame, on_game_over):
             if joy:
                 axis = joy.get_axis(STICK_X)
                 p["vx"] = axis * MOVE_SPEED if abs(axis) > 0.1 else 0
-                btn_a = joy.get_button(BUTTON_A)
-                if btn_a and not p["prev_a"] and p["on_ground"]:
+                if reader.pressed(i, BUTTON_A) and p["on_ground"]:
                     p["vy"] = JUMP_STRENGTH
-                p["prev_a"] = btn_a
 
-            p["vy"] += GRAVITY
-            p["x"] = max(0, min(CANVAS_W - PLAYER_SIZE, p["x"] + p["vx"]))
-            p["y"] += p["vy"]
-            resolve_collision(p, all_plats)
+            p["vy"] += GRAVITY * dt
+            p["x"] = max(0, min(CANVAS_W - PLAYER_SIZE, p["x"] + p["vx"] * dt))
+            p["y"] += p["vy"] * dt
+            resolve_collision(p, all_plats, dt)
 
             # --- WIN CONDITION ---
             # If the player's center passes into the goal area
@@ -124,7 +139,7 @@ def start_game(parent_frame, on_game_over):
 
         # Camera Physics
         target_cam = -(leader_y - 350)
-        state["camera_y"] += (target_cam - state["camera_y"]) * 0.1
+        state["camera_y"] += (target_cam - state["camera_y"]) * (1 - CAMERA_LAG ** dt)
         cy = state["camera_y"]
 
         # Elimination (Falling off bottom of camera)
@@ -134,35 +149,31 @@ def start_game(parent_frame, on_game_over):
                 end_game("Team B" if team == "Team A" else "Team A")
                 return
 
-        # --- RENDERING ---
-        canvas.delete("all")
-
-        # Goal Platform (Drawn first)
-        gp = goal_platform
-        canvas.create_rectangle(gp["x"], gp["y"] + cy, gp["x"] + gp["w"], gp["y"] + gp["h"] + cy, fill="gold", outline="white", width=3)
-        canvas.create_text(400, gp["y"] + gp["h"]/2 + cy, text="FINISH LINE", fill="black", font=("Impact", 30))
-
-        for p in platforms:
-            canvas.create_rectangle(p["x"], p["y"] + cy, p["x"] + p["w"], p["y"] + p["h"] + cy, fill="#333b4d", outline="white")
+    def render(alpha):
+        cy = state["camera_y"]
+        scene.begin()
+        canvas.move("scroll", 0, cy - drawn_cam[0])
+        drawn_cam[0] = cy
 
-        for m in moving_platforms:
-            canvas.create_rectangle(m["curr_x"], m["y"] + cy, m["curr_x"] + m["w"], m["y"] + m["h"] + cy, fill="#445566", outline="cyan", width=2)
+        for idx, m in enumerate(moving_platforms):
+            scene.rect(("mover", idx), m["curr_x"], m["y"] + cy, m["curr_x"] + m["w"], m["y"] + m["h"] + cy,
+                       fill="#445566", outline="cyan", width=2)
 
         for team in ["Team A", "Team B"]:
             p = state[team]
-            canvas.create_rectangle(p["x"], p["y"] + cy, p["x"] + PLAYER_SIZE, p["y"] + PLAYER_SIZE + cy, fill=p["color"], outline="white", width=2)
+            scene.rect(team, p["x"], p["y"] + cy, p["x"] + PLAYER_SIZE, p["y"] + PLAYER_SIZE + cy, fill=p["color"],
+                       outline="white", width=2, layer="sprites")
 
         # HUD Layer
-        canvas.create_rectangle(0, 0, 800, 50, fill="black", outline="white", width=2)
-        timer_color = "red" if time_left < 5 else "white"
-        canvas.create_text(400, 25, text=f"{time_left:.1f}s", fill=timer_color, font=("Courier", 22, "bold"))
-
-        parent_frame.after(16, update)
+        timer_color = "red" if state["time_left"] < 5 else "white"
+        scene.text("timer", 400, 25, text=f"{state['time_left']:.1f}s", fill=timer_color, font=("Courier", 22, "bold"))
+        scene.end()
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         for widget in parent_frame.winfo_children():
             widget.destroy()
         on_game_over(winner)
 
-    update()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
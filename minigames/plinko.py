@@ -1,20 +1,46 @@
 import tkinter as tk
-import pygame
+import bisect
 import random
 import math
 
+import canvasScene
+import gameLoop
+import inputService
+
 # Mapping for Xbox Controllers
 BUTTON_A = 0
 AXIS_LX = 0
 
+# Token rain (start_game(..., token_rain=True), or the hub's --token-rain): each player holds A to pour a stream
+# of tokens instead of dropping three
+RAIN_TOKENS = 150  # Per player
+RAIN_EVERY = 2  # Updates between tokens while A is held
+
+
+def peg_grid(pegs, reach):
+    """Buckets pegs into square cells one collision reach wide, keyed by (column, row)."""
+    grid = {}
+    for px, py in pegs:
+        grid.setdefault((int(px // reach), int(py // reach)), []).append((px, py))
+    return grid
+
+
+def pegs_near(grid, reach, x, y):
+    """Every peg a token at (x, y) could be touching: the ones in the 3 x 3 cells around its own."""
+    cx, cy = int(x // reach), int(y // reach)
+    for gx in (cx - 1, cx, cx + 1):
+        for gy in (cy - 1, cy, cy + 1):
+            yield from grid.get((gx, gy), ())
+
+
+def slot_at(slot_edges, x):
+    """Index of the slot x lands in, from each slot's right edge left to right (an edge counts as the left one)."""
+    return min(bisect.bisect_left(slot_edges, x), len(slot_edges) - 1)
 
-def start_game(parent_frame, on_game_over):
-    pygame.init()
-    pygame.joystick.init()
 
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+def start_game(parent_frame, on_game_over, token_rain=False):
+    inputs = inputService.shared()
+    reader = inputs.reader()
 
     # Constants
     WIDTH, HEIGHT = 800, 700
@@ -37,6 +63,13 @@ def start_game(parent_frame, on_game_over):
     total_weight = sum(s[3] for s in SLOT_CONFIG)
     pixel_per_weight = WIDTH / total_weight
 
+    # Right edge of each slot, left to right, for slot_at
+    slot_edges = []
+    edge = 0
+    for s in SLOT_CONFIG:
+        edge += s[3] * pixel_per_weight
+        slot_edges.append(edge)
+
     canvas = tk.Canvas(parent_frame, width=WIDTH, height=HEIGHT, bg="#050505", highlightthickness=0)
     canvas.pack()
 
@@ -49,24 +82,42 @@ def start_game(parent_frame, on_game_over):
             px = (c * (WIDTH / cols)) + offset
             py = 150 + (r * 40)
             if 20 < px < WIDTH - 20:
-                pegs.append({"x": px, "y": py})
-
+                pegs.append((px, py))
+
+    # Uniform grid over the pegs, so a token only tests the few pegs around it
+    REACH = TOKEN_RADIUS + PEG_RADIUS
+    grid = peg_grid(pegs, REACH)
+
+    # Slots and pegs never change, so they are drawn once
+    scene = canvasScene.Scene(canvas)
+    current_x = 0
+    for i, (mult, bg_color, text_color, weight) in enumerate(SLOT_CONFIG):
+        w = weight * pixel_per_weight
+        scene.add("rectangle", current_x, HEIGHT - 70, current_x + w, HEIGHT, fill=bg_color, outline="black")
+        scene.add("text", current_x + w / 2, HEIGHT - 35, text=f"{mult}X", fill=text_color,
+                  font=("Impact", 16 if weight < 1 else 18, "bold"))
+        current_x += w
+
+    for px, py in pegs:
+        scene.add("oval", px - PEG_RADIUS, py - PEG_RADIUS, px + PEG_RADIUS, py + PEG_RADIUS, fill="white")
+
+    tokens_each = RAIN_TOKENS if token_rain else 3
     state = {
         "active": True,
         "timer": 5.0,
-        "p_tokens_left": [3, 3],
+        "p_tokens_left": [tokens_each, tokens_each],
+        "rain_wait": [0, 0],
         "p_scores": [0, 0],
         "p_x": [200, 600],
         "falling_tokens": [],
-        "prev_a": [False, False],
         "game_ending": False
     }
 
-    def update_physics():
+    def update_physics(dt):
         if not state["active"]: return
 
         if state["timer"] > 0:
-            state["timer"] -= 0.016
+            state["timer"] -= dt
         else:
             state["timer"] = 0
             state["p_tokens_left"] = [0, 0]
@@ -80,28 +131,18 @@ def start_game(parent_frame, on_game_over):
                 t["vx"] *= -BOUNCE
                 t["x"] = max(TOKEN_RADIUS, min(WIDTH - TOKEN_RADIUS, t["x"]))
 
-            for p in pegs:
-                dx, dy = t["x"] - p["x"], t["y"] - p["y"]
-                dist = math.hypot(dx, dy)
-                if dist < (TOKEN_RADIUS + PEG_RADIUS):
+            for px, py in pegs_near(grid, REACH, t["x"], t["y"]):
+                dx, dy = t["x"] - px, t["y"] - py
+                if dx * dx + dy * dy < REACH * REACH:
                     angle = math.atan2(dy, dx)
-                    t["x"] = p["x"] + (TOKEN_RADIUS + PEG_RADIUS) * math.cos(angle)
-                    t["y"] = p["y"] + (TOKEN_RADIUS + PEG_RADIUS) * math.sin(angle)
+                    t["x"] = px + REACH * math.cos(angle)
+                    t["y"] = py + REACH * math.sin(angle)
                     speed = math.hypot(t["vx"], t["vy"]) * BOUNCE
                     t["vx"] = math.cos(angle) * speed + random.uniform(-0.6, 0.6)
                     t["vy"] = math.sin(angle) * speed
 
             if t["y"] > HEIGHT - 70:
-                # Calculate bucket based on weighted widths
-                current_x = 0
-                bucket_idx = 0
-                for i, s in enumerate(SLOT_CONFIG):
-                    w = s[3] * pixel_per_weight
-                    if current_x <= t["x"] <= current_x + w:
-                        bucket_idx = i
-                        break
-                    current_x += w
-
+                bucket_idx = slot_at(slot_edges, t["x"])
                 state["p_scores"][t["owner"]] += SLOT_CONFIG[bucket_idx][0]
                 state["falling_tokens"].remove(t)
 
@@ -114,65 +155,59 @@ def start_game(parent_frame, on_game_over):
         s1, s2 = state["p_scores"]
         winner = "Blue Wins!" if s1 > s2 else "Pink Wins!" if s2 > s1 else "It's a Tie!"
         state["active"] = False
+        loop.stop()
         on_game_over(winner)
 
-    def draw():
-        canvas.delete("all")
-
-        # Weighted Color Slots
-        current_x = 0
-        for i, (mult, bg_color, text_color, weight) in enumerate(SLOT_CONFIG):
-            w = weight * pixel_per_weight
-            canvas.create_rectangle(current_x, HEIGHT - 70, current_x + w, HEIGHT, fill=bg_color, outline="black")
-            canvas.create_text(current_x + w / 2, HEIGHT - 35, text=f"{mult}X", fill=text_color,
-                               font=("Impact", 16 if weight < 1 else 18, "bold"))
-            current_x += w
-
-        # Pegs
-        for p in pegs:
-            canvas.create_oval(p["x"] - PEG_RADIUS, p["y"] - PEG_RADIUS, p["x"] + PEG_RADIUS, p["y"] + PEG_RADIUS,
-                               fill="white")
+    def draw(alpha):
+        scene.begin()
 
         # Shrunk Timer (Reduced from 45 to 28 font)
         t_color = "white" if state["timer"] > 1.5 else "#FF4136"
-        canvas.create_text(WIDTH / 2, 35, text=f"{state['timer']:.1f}", fill=t_color, font=("Impact", 28))
+        scene.text("timer", WIDTH / 2, 35, text=f"{state['timer']:.1f}", fill=t_color, font=("Impact", 28))
 
         # Players
         for i in range(2):
             color = P1_COLOR if i == 0 else P2_COLOR
             if state["p_tokens_left"][i] > 0 and state["timer"] > 0:
-                canvas.create_oval(state["p_x"][i] - TOKEN_RADIUS, 80, state["p_x"][i] + TOKEN_RADIUS, 100, fill=color,
-                                   outline="white")
-                canvas.create_text(state["p_x"][i], 70, text=f"{state['p_tokens_left'][i]} LEFT", fill="white",
-                                   font=("Arial", 9, "bold"))
+                scene.oval(("aim", i), state["p_x"][i] - TOKEN_RADIUS, 80, state["p_x"][i] + TOKEN_RADIUS, 100,
+                           fill=color, outline="white", layer="sprites")
+                scene.text(("left", i), state["p_x"][i], 70, text=f"{state['p_tokens_left'][i]} LEFT", fill="white",
+                           font=("Arial", 9, "bold"))
 
         # Falling Tokens
         for t in state["falling_tokens"]:
             color = P1_COLOR if t["owner"] == 0 else P2_COLOR
-            canvas.create_oval(t["x"] - TOKEN_RADIUS, t["y"] - TOKEN_RADIUS, t["x"] + TOKEN_RADIUS,
-                               t["y"] + TOKEN_RADIUS, fill=color, outline="white", width=2)
+            scene.oval(("token", id(t)), t["x"] - TOKEN_RADIUS, t["y"] - TOKEN_RADIUS, t["x"] + TOKEN_RADIUS,
+                       t["y"] + TOKEN_RADIUS, fill=color, outline="white", width=2, layer="sprites")
 
         # Scoreboard
-        canvas.create_text(100, 25, text=f"BLUE: {state['p_scores'][0]}", fill=P1_COLOR, font=("Impact", 20))
-        canvas.create_text(WIDTH - 100, 25, text=f"PINK: {state['p_scores'][1]}", fill=P2_COLOR, font=("Impact", 20))
+        scene.text("score_a", 100, 25, text=f"BLUE: {state['p_scores'][0]}", fill=P1_COLOR, font=("Impact", 20))
+        scene.text("score_b", WIDTH - 100, 25, text=f"PINK: {state['p_scores'][1]}", fill=P2_COLOR,
+                   font=("Impact", 20))
 
-    def game_loop():
-        if not state["active"]: return
-        pygame.event.pump()
+        scene.end()
+
+    def update(dt):
+        joysticks = inputs.snapshot().controllers
+        reader.tick()
         for i in range(min(len(joysticks), 2)):
             joy = joysticks[i]
             move = joy.get_axis(AXIS_LX)
             if abs(move) > 0.1:
                 state["p_x"][i] = max(TOKEN_RADIUS, min(WIDTH - TOKEN_RADIUS, state["p_x"][i] + move * 9))
 
-            btn = joy.get_button(BUTTON_A)
-            if btn and not state["prev_a"][i] and state["timer"] > 0 and state["p_tokens_left"][i] > 0:
-                state["falling_tokens"].append({"x": state["p_x"][i], "y": 90, "vx": 0, "vy": 0, "owner": i})
+            if token_rain:
+                state["rain_wait"][i] = max(0, state["rain_wait"][i] - 1)
+                drop = joy.get_button(BUTTON_A) and state["rain_wait"][i] == 0
+            else:
+                drop = reader.pressed(i, BUTTON_A)
+            if drop and state["timer"] > 0 and state["p_tokens_left"][i] > 0:
+                # A little spread so a stream of tokens doesn't stack into one
+                vx = random.uniform(-0.5, 0.5) if token_rain else 0
+                state["falling_tokens"].append({"x": state["p_x"][i], "y": 90, "vx": vx, "vy": 0, "owner": i})
                 state["p_tokens_left"][i] -= 1
-            state["prev_a"][i] = btn
+                state["rain_wait"][i] = RAIN_EVERY
 
-        update_physics()
-        draw()
-        parent_frame.after(16, game_loop)
+        update_physics(dt)
 
-    game_loop()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, draw)
\ No newline at end of file
@@ -1,16 +1,18 @@
 import tkinter as tk
-import pygame
+
+import gameLoop
+import inputService
 
 # Constants for Xbox Controller
 AXIS_LEFT_STICK_Y = 1
 
+# Rates are per second; the loop steps them at a fixed 60 Hz
+PADDLE_SPEED = 420
+BALL_SPEED = 240  # Each axis, at the serve
+
 def start_game(parent_frame, on_game_over):
-    # 1. Initialize Pygame Joysticks
-    pygame.init()
-    pygame.joystick.init()
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+    # 1. Controllers come from the hub's input service
+    inputs = inputService.shared()
 
     # 2. Game Settings
     canvas_width = 600
@@ -18,7 +20,6 @@ def start_game(parent_frame, on_game_over):
     paddle_w = 10
     paddle_h = 60
     ball_size = 10
-    paddle_speed = 7
     border_thickness = 2
 
     # Game State
@@ -26,8 +27,8 @@ def start_game(parent_frame, on_game_over):
         "active": True,
         "ball_x": canvas_width // 2,
         "ball_y": canvas_height // 2,
-        "ball_dx": 4,
-        "ball_dy": 4,
+        "ball_dx": BALL_SPEED,
+        "ball_dy": BALL_SPEED,
         "paddle_a_y": canvas_height // 2 - paddle_h // 2,
         "paddle_b_y": canvas_height // 2 - paddle_h // 2
     }
@@ -47,25 +48,25 @@ def start_game(parent_frame, on_game_over):
     paddle_a_gfx = canvas.create_rectangle(20, 0, 20 + paddle_w, paddle_h, fill="cyan")
     paddle_b_gfx = canvas.create_rectangle(canvas_width - 30, 0, canvas_width - 30 + paddle_w, paddle_h, fill="magenta")
 
-    def update_game():
+    def update(dt):
         if not state["active"]: return
 
         # A. Handle Inputs
-        pygame.event.pump()
+        joysticks = inputs.snapshot().controllers
         if len(joysticks) > 0:
             val_a = joysticks[0].get_axis(AXIS_LEFT_STICK_Y)
-            state["paddle_a_y"] += val_a * paddle_speed
+            state["paddle_a_y"] += val_a * PADDLE_SPEED * dt
         if len(joysticks) > 1:
             val_b = joysticks[1].get_axis(AXIS_LEFT_STICK_Y)
-            state["paddle_b_y"] += val_b * paddle_speed
+            state["paddle_b_y"] += val_b * PADDLE_SPEED * dt
 
         # B. Constrain Paddles
         state["paddle_a_y"] = max(border_thickness, min(canvas_height - paddle_h - border_thickness, state["paddle_a_y"]))
         state["paddle_b_y"] = max(border_thickness, min(canvas_height - paddle_h - border_thickness, state["paddle_b_y"]))
 
         # C. Ball Physics
-        state["ball_x"] += state["ball_dx"]
-        state["ball_y"] += state["ball_dy"]
+        state["ball_x"] += state["ball_dx"] * dt
+        state["ball_y"] += state["ball_dy"] * dt
 
         # Wall Bounce
         if state["ball_y"] <= border_thickness or state["ball_y"] >= canvas_height - ball_size - border_thickness:
@@ -92,16 +93,15 @@ def start_game(parent_frame, on_game_over):
             end_game("Team A")
             return
 
-        # F. Update Graphics
+    def render(alpha):
         canvas.coords(ball_gfx, state["ball_x"], state["ball_y"], state["ball_x"] + ball_size, state["ball_y"] + ball_size)
         canvas.coords(paddle_a_gfx, 20, state["paddle_a_y"], 20 + paddle_w, state["paddle_a_y"] + paddle_h)
         canvas.coords(paddle_b_gfx, canvas_width - 30, state["paddle_b_y"], canvas_width - 30 + paddle_w, state["paddle_b_y"] + paddle_h)
 
-        parent_frame.after(16, update_game)
-
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         canvas.destroy()
         on_game_over(winner)
 
-    update_game()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
@@ -1,5 +1,7 @@
 import tkinter as tk
-import pygame
+
+import gameLoop
+import inputService
 
 # Mapping for Xbox Controllers
 BUTTON_A = 0  # Rock
@@ -8,13 +10,8 @@ BUTTON_X = 2  # Scissors
 
 
 def start_game(parent_frame, on_game_over):
-    # 1. Initialize Pygame Joysticks
-    pygame.init()
-    pygame.joystick.init()
-
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+    # 1. Controllers come from the hub's input service
+    inputs = inputService.shared()
 
     # 2. Setup GUI
     # Using a main container to easily clear the screen for the end sequence
@@ -62,10 +59,10 @@ def start_game(parent_frame, on_game_over):
             status_label.config(text="SHOOT!", fg="white")
             parent_frame.after(400, end_game)
 
-    def check_inputs():
+    def update(dt):
         if not state["active"]: return
 
-        pygame.event.pump()
+        joysticks = inputs.snapshot().controllers
 
         # Check Player 1 (Blue)
         if state["p1_choice"] is None and len(joysticks) > 0:
@@ -79,18 +76,18 @@ def start_game(parent_frame, on_game_over):
                 if joysticks[1].get_button(btn):
                     state["p2_choice"] = btn
 
+        if state["p1_choice"] is not None and state["p2_choice"] is not None:
+            status_label.config(text="BOTH READY!", fg="green")
+            state["active"] = False
+            loop.stop()
+            parent_frame.after(500, run_countdown)
+
+    def render(alpha):
         # Visual feedback for choices
         if state["p1_choice"] is not None and state["p2_choice"] is None:
             status_label.config(text="P1 READY...", fg="blue")
         elif state["p2_choice"] is not None and state["p1_choice"] is None:
             status_label.config(text="P2 READY...", fg="pink")
-        elif state["p1_choice"] is not None and state["p2_choice"] is not None:
-            status_label.config(text="BOTH READY!", fg="green")
-            state["active"] = False
-            parent_frame.after(500, run_countdown)
-            return
-
-        parent_frame.after(16, check_inputs)
 
     def end_game():
         winner = determine_winner()
@@ -129,4 +126,4 @@ def start_game(parent_frame, on_game_over):
         on_game_over(winner_text)
 
     # Start the input polling loop
-    check_inputs()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
@@ -1,7 +1,8 @@
 import tkinter as tk
-import pygame
 import random
-import time
+
+import gameLoop
+import inputService
 
 # Xbox Button Mappings
 BTN_A = 0
@@ -19,12 +20,9 @@ COLORS = {
 
 
 def start_game(parent_frame, on_game_over):
-    # 1. Initialize Pygame Joysticks
-    pygame.init()
-    pygame.joystick.init()
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+    # 1. Controllers come from the hub's input service
+    inputs = inputService.shared()
+    reader = inputs.reader()
 
     # 2. Game State
     state = {
@@ -35,10 +33,8 @@ def start_game(parent_frame, on_game_over):
         "phase": "WATCH",
         "a_idx": 0,
         "b_idx": 0,
-        "round_start_time": 0.0,
-        "time_limit": 4.0,  # 4 Seconds to input the sequence
-        "prev_a": {BTN_A: False, BTN_B: False, BTN_X: False, BTN_Y: False},
-        "prev_b": {BTN_A: False, BTN_B: False, BTN_X: False, BTN_Y: False}
+        "time_left": 0.0,
+        "time_limit": 4.0  # 4 Seconds to input the sequence
     }
 
     state["sequence"] = [random.choice([BTN_A, BTN_B, BTN_X, BTN_Y]) for _ in range(4)]
@@ -106,7 +102,7 @@ def start_game(parent_frame, on_game_over):
             parent_frame.after(600, lambda: play_pattern(index + 1))
         else:
             state["phase"] = "PLAY"
-            state["round_start_time"] = time.time()  # Start the timer!
+            state["time_left"] = state["time_limit"]  # Start the timer!
             header.config(text="YOUR TURN! REPEAT THE PATTERN", fg="yellow")
             state["a_idx"] = 0
             state["b_idx"] = 0
@@ -117,15 +113,16 @@ def start_game(parent_frame, on_game_over):
         header.config(text=f"ROUND {state['round']}: WATCH THE CENTER", fg="white")
         parent_frame.after(1000, lambda: play_pattern(0))
 
-    def check_inputs():
+    def update(dt):
         if not state["active"]: return
+        reader.tick()  # Every phase, so presses made while watching are thrown away
 
         if state["phase"] == "PLAY":
 
             # --- TIMER LOGIC ---
-            time_left = state["time_limit"] - (time.time() - state["round_start_time"])
+            state["time_left"] -= dt
 
-            if time_left <= 0:
+            if state["time_left"] <= 0:
                 timer_label.config(text="TIME: 0.0s", fg="red")
 
                 # Time's up! Check who actually finished.
@@ -139,46 +136,34 @@ def start_game(parent_frame, on_game_over):
                 else:
                     end_game("Tie")  # Neither finished (or both didn't finish, so it's a tie)
                 return
-            else:
-                timer_label.config(text=f"TIME: {time_left:.1f}s", fg="yellow")
 
             # --- INPUT LOGIC ---
-            pygame.event.pump()
+            # Presses are checked in the order they happened, so fast double taps keep their sequence
             buttons_to_check = [BTN_A, BTN_B, BTN_X, BTN_Y]
 
             # TEAM A
-            if len(joysticks) > 0:
-                joy_a = joysticks[0]
-                for btn in buttons_to_check:
-                    current_pressed = joy_a.get_button(btn)
-
-                    if current_pressed and not state["prev_a"][btn]:
-                        if state["a_idx"] < len(state["sequence"]):
-                            expected = state["sequence"][state["a_idx"]]
-                            if btn == expected:
-                                flash_button(canv_a, objs_a, btn)
-                                state["a_idx"] += 1
-                            else:
-                                end_game("Team B")  # Team A messed up instantly
-                                return
-                    state["prev_a"][btn] = current_pressed
+            for btn in reader.button_downs(0):
+                if btn not in buttons_to_check: continue
+                if state["a_idx"] < len(state["sequence"]):
+                    expected = state["sequence"][state["a_idx"]]
+                    if btn == expected:
+                        flash_button(canv_a, objs_a, btn)
+                        state["a_idx"] += 1
+                    else:
+                        end_game("Team B")  # Team A messed up instantly
+                        return
 
             # TEAM B
-            if len(joysticks) > 1:
-                joy_b = joysticks[1]
-                for btn in buttons_to_check:
-                    current_pressed = joy_b.get_button(btn)
-
-                    if current_pressed and not state["prev_b"][btn]:
-                        if state["b_idx"] < len(state["sequence"]):
-                            expected = state["sequence"][state["b_idx"]]
-                            if btn == expected:
-                                flash_button(canv_b, objs_b, btn)
-                                state["b_idx"] += 1
-                            else:
-                                end_game("Team A")  # Team B messed up instantly
-                                return
-                    state["prev_b"][btn] = current_pressed
+            for btn in reader.button_downs(1):
+                if btn not in buttons_to_check: continue
+                if state["b_idx"] < len(state["sequence"]):
+                    expected = state["sequence"][state["b_idx"]]
+                    if btn == expected:
+                        flash_button(canv_b, objs_b, btn)
+                        state["b_idx"] += 1
+                    else:
+                        end_game("Team A")  # Team B messed up instantly
+                        return
 
             # Check if both teams completed the sequence correctly BEFORE time ran out
             if state["a_idx"] == len(state["sequence"]) and state["b_idx"] == len(state["sequence"]):
@@ -194,13 +179,16 @@ def start_game(parent_frame, on_game_over):
                     state["sequence"].append(random.choice([BTN_A, BTN_B, BTN_X, BTN_Y]))
                     parent_frame.after(1500, start_round)
 
-        parent_frame.after(16, check_inputs)
+    def render(alpha):
+        if state["phase"] == "PLAY":
+            timer_label.config(text=f"TIME: {state['time_left']:.1f}s", fg="yellow")
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         for widget in parent_frame.winfo_children():
             widget.destroy()
         on_game_over(winner)
 
     parent_frame.after(500, start_round)
-    check_inputs()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
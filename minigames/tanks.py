@@ -1,26 +1,31 @@
 import tkinter as tk
-import pygame
 import math
 import random
 
+import canvasScene
+import gameLoop
+import inputService
+
 # Mapping for Xbox Controllers
 BUTTON_A = 0
 AXIS_LX = 0
 AXIS_LY = 1
 
+# Rates are per second; the loop steps them at a fixed 60 Hz
+GRAVITY = 900
+SHELL_SPEED = 780
+DRIVE_SPEED = 210
+AIM_SPEED = 150  # Degrees per second
+EXPLOSION_TIME = 0.2
 
-def start_game(parent_frame, on_game_over):
-    pygame.init()
-    pygame.joystick.init()
 
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+def start_game(parent_frame, on_game_over):
+    inputs = inputService.shared()
+    reader = inputs.reader()
 
     # Constants
     WIDTH, HEIGHT = 800, 500
     GROUND_Y = 400
-    GRAVITY = 0.25
     P1_COLOR, P2_COLOR = "#0074D9", "#F012BE"
 
     canvas = tk.Canvas(parent_frame, width=WIDTH, height=HEIGHT, bg="#87CEEB", highlightthickness=0)
@@ -32,17 +37,20 @@ def start_game(parent_frame, on_game_over):
     state = {
         "active": True,
         "tanks": [
-            {"x": 100, "angle": -45, "color": P1_COLOR, "prev_a": False},
-            {"x": 700, "angle": -135, "color": P2_COLOR, "prev_a": False}
+            {"x": 100, "angle": -45, "color": P1_COLOR},
+            {"x": 700, "angle": -135, "color": P2_COLOR}
         ],
         "bullets": [],
-        "explosions": []
+        "explosions": [],
+        "terrain_points": None  # Rebuilt only when an explosion digs into the ground
     }
 
+    scene = canvasScene.Scene(canvas)
+
     def fire_bullet(idx):
         t = state["tanks"][idx]
         rad = math.radians(t["angle"])
-        speed = 13  # Slightly faster for better feel
+        speed = SHELL_SPEED
 
         # Start at the end of the barrel
         barrel_len = 25
@@ -59,20 +67,21 @@ def start_game(parent_frame, on_game_over):
 
     def create_explosion(x, y):
         radius = 40
-        state["explosions"].append({"x": x, "y": y, "r": radius, "life": 12})
+        state["explosions"].append({"x": x, "y": y, "r": radius, "life": EXPLOSION_TIME})
         for tx in range(max(0, int(x - radius)), min(WIDTH, int(x + radius))):
             dist = abs(tx - x)
             depth = math.sqrt(max(0, radius ** 2 - dist ** 2))
             if y + depth > terrain[tx]:
                 terrain[tx] = max(terrain[tx], y + depth)
+        state["terrain_points"] = None
 
-    def update_physics():
+    def update_physics(dt):
         if not state["active"]: return
 
         for b in state["bullets"][:]:
-            b["x"] += b["vx"]
-            b["y"] += b["vy"]
-            b["vy"] += GRAVITY
+            b["x"] += b["vx"] * dt
+            b["y"] += b["vy"] * dt
+            b["vy"] += GRAVITY * dt
 
             # Bullet vs Bullet
             for other in state["bullets"]:
@@ -104,49 +113,55 @@ def start_game(parent_frame, on_game_over):
                 if math.hypot(exp["x"] - tank["x"], exp["y"] - terrain[int(tank["x"])]) < exp["r"]:
                     end_game(f"Player {2 if i == 0 else 1} Wins!")
                     return
-            exp["life"] -= 1
+            exp["life"] -= dt
             if exp["life"] <= 0: state["explosions"].remove(exp)
 
-    def draw():
-        canvas.delete("all")
+    def render(alpha):
+        scene.begin()
 
         # Terrain
-        points = [0, HEIGHT]
-        for x in range(WIDTH): points.extend([x, terrain[x]])
-        points.extend([WIDTH, HEIGHT])
-        canvas.create_polygon(points, fill="#5d4037", outline="#3e2723")
+        if state["terrain_points"] is None:
+            points = [0, HEIGHT]
+            for x in range(WIDTH): points.extend([x, terrain[x]])
+            points.extend([WIDTH, HEIGHT])
+            state["terrain_points"] = tuple(points)
+        scene.polygon("terrain", state["terrain_points"], fill="#5d4037", outline="#3e2723", layer="background")
 
         # Tanks
-        for t in state["tanks"]:
+        for i, t in enumerate(state["tanks"]):
             tx = int(t["x"])
             ty = terrain[tx]
 
             # 1. Treads (Darker version of player color)
-            canvas.create_oval(tx - 22, ty - 8, tx + 22, ty + 2, fill="#333333")
+            scene.oval(("treads", i), tx - 22, ty - 8, tx + 22, ty + 2, fill="#333333")
 
             # 2. Main Hull
-            canvas.create_rectangle(tx - 20, ty - 18, tx + 20, ty - 5, fill=t["color"], outline="black")
+            scene.rect(("hull", i), tx - 20, ty - 18, tx + 20, ty - 5, fill=t["color"], outline="black")
 
             # 3. Turret (Top part)
-            canvas.create_oval(tx - 12, ty - 25, tx + 12, ty - 12, fill=t["color"], outline="black")
+            scene.oval(("turret", i), tx - 12, ty - 25, tx + 12, ty - 12, fill=t["color"], outline="black")
 
             # 4. Rotating Barrel
             rad = math.radians(t["angle"])
             bx, by = tx + math.cos(rad) * 28, (ty - 20) + math.sin(rad) * 28
-            canvas.create_line(tx, ty - 20, bx, by, fill="black", width=6)
+            scene.line(("barrel", i), tx, ty - 20, bx, by, fill="black", width=6)
 
         # Bullets
         for b in state["bullets"]:
-            canvas.create_oval(b["x"] - 4, b["y"] - 4, b["x"] + 4, b["y"] + 4, fill="black")
+            scene.oval(("bullet", id(b)), b["x"] - 4, b["y"] - 4, b["x"] + 4, b["y"] + 4, fill="black",
+                       layer="sprites")
 
         # Explosions
         for e in state["explosions"]:
-            canvas.create_oval(e["x"] - e["r"], e["y"] - e["r"], e["x"] + e["r"], e["y"] + e["r"],
-                               fill="orange", outline="yellow", width=2)
+            scene.oval(("boom", id(e)), e["x"] - e["r"], e["y"] - e["r"], e["x"] + e["r"], e["y"] + e["r"],
+                       fill="orange", outline="yellow", width=2, layer="sprites")
+
+        scene.end()
 
-    def game_loop():
+    def update(dt):
         if not state["active"]: return
-        pygame.event.pump()
+        joysticks = inputs.snapshot().controllers
+        reader.tick()
 
         for i in range(min(len(joysticks), 2)):
             joy = joysticks[i]
@@ -154,25 +169,22 @@ def start_game(parent_frame, on_game_over):
             # Movement
             move = joy.get_axis(AXIS_LX)
             if abs(move) > 0.1:
-                state["tanks"][i]["x"] = max(25, min(WIDTH - 25, state["tanks"][i]["x"] + move * 3.5))
+                state["tanks"][i]["x"] = max(25, min(WIDTH - 25, state["tanks"][i]["x"] + move * DRIVE_SPEED * dt))
 
             # Aiming (Clamped between -180 and 0)
             aim = joy.get_axis(AXIS_LY)
             if abs(aim) > 0.1:
-                state["tanks"][i]["angle"] = max(-180, min(0, state["tanks"][i]["angle"] + aim * 2.5))
+                state["tanks"][i]["angle"] = max(-180, min(0, state["tanks"][i]["angle"] + aim * AIM_SPEED * dt))
 
             # Firing
-            btn = joy.get_button(BUTTON_A)
-            if btn and not state["tanks"][i]["prev_a"]:
+            if reader.pressed(i, BUTTON_A):
                 fire_bullet(i)
-            state["tanks"][i]["prev_a"] = btn
 
-        update_physics()
-        draw()
-        parent_frame.after(16, game_loop)
+        update_physics(dt)
 
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         on_game_over(winner)
 
-    game_loop()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
@@ -1,20 +1,22 @@
 import tkinter as tk
-import pygame
 import random
-import time
+
+import gameLoop
+import inputService
 
 # Xbox Mapping
 BUTTON_A = 0
 AXIS_X = 0
 AXIS_Y = 1
 
+# Rates are per second; the loop steps them at a fixed 60 Hz
+CURSOR_SPEED = 1080
+TURN_TIME = 2.0
+
 def start_game(parent_frame, on_game_over):
-    # 1. Initialize Pygame Joysticks
-    pygame.init()
-    pygame.joystick.init()
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+    # 1. Controllers come from the hub's input service
+    inputs = inputService.shared()
+    reader = inputs.reader()
 
     # 2. Assign Roles Randomly
     teams = ["Team A", "Team B"]
@@ -26,11 +28,11 @@ def start_game(parent_frame, on_game_over):
         "board": [["", "", ""], ["", "", ""], ["", "", ""]],
         "roles": {team_x: "X", team_o: "O"},
         "turn": team_x,  # X always goes first
-        "turn_start": time.time(),
+        "turn_time": 0.0,  # Seconds the current turn has run
         "cursors": {
             # Team A is always Blue, Team B is always Pink
-            "Team A": {"x": 300, "y": 300, "prev_a": False, "color": "blue"},
-            "Team B": {"x": 300, "y": 300, "prev_a": False, "color": "pink"}
+            "Team A": {"x": 300, "y": 300, "color": "blue"},
+            "Team B": {"x": 300, "y": 300, "color": "pink"}
         }
     }
 
@@ -79,14 +81,15 @@ def start_game(parent_frame, on_game_over):
         row = max(0, min(2, int((y - 100) // 200)))
         return row, col
 
-    def update_game():
+    def update(dt):
         if not state["active"]: return
 
-        pygame.event.pump()
-        current_time = time.time()
-        time_elapsed = current_time - state["turn_start"]
+        joysticks = inputs.snapshot().controllers
+        reader.tick()
+        state["turn_time"] += dt
+        time_elapsed = state["turn_time"]
 
-        time_left = 2.0 - time_elapsed
+        time_left = TURN_TIME - time_elapsed
 
         # A. Timer Logic (If time runs out, current turn loses)
         if time_left <= 0:
@@ -94,11 +97,7 @@ def start_game(parent_frame, on_game_over):
             end_game(winner)
             return
 
-        # Clear dynamic elements from previous frame
-        canvas.delete("dynamic")
-
         # B. Process Inputs for BOTH teams
-        cursor_speed = 18
 
         for i, team in enumerate(["Team A", "Team B"]):
             c_state = state["cursors"][team]
@@ -111,17 +110,15 @@ def start_game(parent_frame, on_game_over):
                 axis_y = joy.get_axis(AXIS_Y)
 
                 # Deadzone check
-                if abs(axis_x) > 0.2: c_state["x"] += axis_x * cursor_speed
-                if abs(axis_y) > 0.2: c_state["y"] += axis_y * cursor_speed
+                if abs(axis_x) > 0.2: c_state["x"] += axis_x * CURSOR_SPEED * dt
+                if abs(axis_y) > 0.2: c_state["y"] += axis_y * CURSOR_SPEED * dt
 
                 # Constrain to grid area
                 c_state["x"] = max(0, min(600, c_state["x"]))
                 c_state["y"] = max(100, min(700, c_state["y"]))
 
                 # Button A Logic
-                current_a = joy.get_button(BUTTON_A)
-
-                if current_a and not c_state["prev_a"]:
+                if reader.pressed(i, BUTTON_A):
                     if state["turn"] == team and time_elapsed > 0.1:
 
                         row, col = get_grid_cell(c_state["x"], c_state["y"])
@@ -138,11 +135,15 @@ def start_game(parent_frame, on_game_over):
                                 return
 
                             state["turn"] = "Team B" if team == "Team A" else "Team A"
-                            state["turn_start"] = time.time()
+                            state["turn_time"] = 0.0
 
-                c_state["prev_a"] = current_a
+    def render(alpha):
+        time_left = TURN_TIME - state["turn_time"]
 
-        # C. Draw Dynamic Elements
+        # Clear dynamic elements from previous frame
+        canvas.delete("dynamic")
+
+        # Draw Dynamic Elements
         active_cursor = state["cursors"][state["turn"]]
         row, col = get_grid_cell(active_cursor["x"], active_cursor["y"])
         hx, hy = col * 200, 100 + (row * 200)
@@ -174,11 +175,10 @@ def start_game(parent_frame, on_game_over):
         color_turn = state["cursors"][state["turn"]]["color"]
         canvas.itemconfig(turn_text, text=f"{state['turn']}'s Turn ({state['roles'][state['turn']]})", fill=color_turn)
 
-        parent_frame.after(16, update_game)
-
     def end_game(winner):
         state["active"] = False
+        loop.stop()
         canvas.destroy()
         on_game_over(winner)
 
-    update_game()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, update, render)
\ No newline at end of file
@@ -1,23 +1,37 @@
 import tkinter as tk
-import pygame
-import time
+
+import canvasScene
+import gameLoop
+import inputService
 
 # Mapping for Xbox Controllers
 AXIS_LX = 0
 AXIS_LY = 1
 
+STEP_HZ = 40  # Bikes move one grid cell per step
 
-def start_game(parent_frame, on_game_over):
-    pygame.init()
-    pygame.joystick.init()
+# Arena cell owners
+EMPTY, P1_TRAIL, P2_TRAIL, WALL = 0, 1, 2, 3
 
-    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-    for joy in joysticks:
-        joy.init()
+
+def start_game(parent_frame, on_game_over):
+    inputs = inputService.shared()
 
     # Style
     P1_COLOR, P2_COLOR, BG_COLOR = "#0074D9", "#F012BE", "#050505"
     GRID_SIZE = 8
+    COLS, ROWS = 800 // GRID_SIZE, 600 // GRID_SIZE
+    TRAIL_STYLE = {P1_TRAIL: ("#001f3f", P1_COLOR), P2_TRAIL: ("#2b0022", P2_COLOR)}
+
+    # One byte per cell, row-major: who owns it. The outer ring is the arena wall.
+    grid = bytearray(COLS * ROWS)
+    for c in range(COLS):
+        grid[c] = grid[(ROWS - 1) * COLS + c] = WALL
+    for r in range(ROWS):
+        grid[r * COLS] = grid[r * COLS + COLS - 1] = WALL
+
+    def cell_index(pos):
+        return (pos[1] // GRID_SIZE) * COLS + pos[0] // GRID_SIZE
 
     canvas = tk.Canvas(parent_frame, width=800, height=600, bg=BG_COLOR, highlightthickness=0)
     canvas.pack()
@@ -25,7 +39,6 @@ def start_game(parent_frame, on_game_over):
     state = {
         "active": True,
         "timer": 10.0,
-        "last_time": time.time(),
         # Body format: [(head_x, head_y), (tail_x, tail_y)]
         "p1_body": [(152, 304), (144, 304)],
         "p1_vel": [GRID_SIZE, 0],
@@ -33,49 +46,48 @@ def start_game(parent_frame, on_game_over):
         "p2_body": [(648, 304), (656, 304)],
         "p2_vel": [-GRID_SIZE, 0],
 
-        "trail_p1": set(),
-        "trail_p2": set(),
+        "new_trail": [],  # (cell, owner) left behind since the last render
         "game_ending": False
     }
 
-    def update_visuals():
-        canvas.delete("all")
+    # Arena border and header box never change
+    scene = canvasScene.Scene(canvas)
+    scene.add("rectangle", 0, 0, 800, 600, outline="white", width=4)
+    scene.add("rectangle", 300, 10, 500, 60, fill="black", outline="#39FF14", width=2, layer="hud")
 
-        # --- ARENA BORDER ---
-        canvas.create_rectangle(0, 0, 800, 600, outline="white", width=4)
+    def update_visuals(alpha):
+        # Trails only grow: each cell is drawn once, the frame after it is left behind, and never touched again
+        for cell, owner in state["new_trail"]:
+            fill, outline = TRAIL_STYLE[owner]
+            scene.add("rectangle", cell[0], cell[1], cell[0] + GRID_SIZE, cell[1] + GRID_SIZE,
+                      fill=fill, outline=outline, layer="world")
+        state["new_trail"].clear()
 
-        # Draw Trails
-        for tx, ty in state["trail_p1"]:
-            canvas.create_rectangle(tx, ty, tx + GRID_SIZE, ty + GRID_SIZE, fill="#001f3f", outline=P1_COLOR)
-        for tx, ty in state["trail_p2"]:
-            canvas.create_rectangle(tx, ty, tx + GRID_SIZE, ty + GRID_SIZE, fill="#2b0022", outline=P2_COLOR)
+        scene.begin()
 
         # Draw 2-Segment Bikes (White heads, colored outlines)
         for i in range(2):
             body = state["p1_body"] if i == 0 else state["p2_body"]
             color = P1_COLOR if i == 0 else P2_COLOR
-            for segment in body:
-                canvas.create_rectangle(segment[0], segment[1], segment[0] + GRID_SIZE, segment[1] + GRID_SIZE,
-                                        fill="white", outline=color)
+            for s_idx, segment in enumerate(body):
+                scene.rect(("bike", i, s_idx), segment[0], segment[1], segment[0] + GRID_SIZE,
+                           segment[1] + GRID_SIZE, fill="white", outline=color, layer="sprites")
 
         # Header UI
-        canvas.create_rectangle(300, 10, 500, 60, fill="black", outline="#39FF14", width=2)
         t_color = "white" if state["timer"] > 2.0 else "#FF4136"
-        canvas.create_text(400, 35, text=f"{state['timer']:.1f}s", fill=t_color, font=("Impact", 24))
+        scene.text("timer", 400, 35, text=f"{state['timer']:.1f}s", fill=t_color, font=("Impact", 24))
 
-    def check_inputs():
-        if not state["active"]: return
+        scene.end()
 
-        now = time.time()
-        delta = now - state["last_time"]
-        state["last_time"] = now
+    def check_inputs(dt):
+        if not state["active"]: return
 
-        state["timer"] -= delta
+        state["timer"] -= dt
         if state["timer"] <= 0:
             end_game("Tie")
             return
 
-        pygame.event.pump()
+        joysticks = inputs.snapshot().controllers
         for i in range(min(len(joysticks), 2)):
             joy = joysticks[i]
             lx, ly = joy.get_axis(AXIS_LX), joy.get_axis(AXIS_LY)
@@ -94,12 +106,13 @@ def start_game(parent_frame, on_game_over):
         # --- MOVEMENT LOGIC ---
         for i in range(2):
             p_body = "p1_body" if i == 0 else "p2_body"
-            p_trail = "trail_p1" if i == 0 else "trail_p2"
+            owner = P1_TRAIL if i == 0 else P2_TRAIL
             p_vel = "p1_vel" if i == 0 else "p2_vel"
 
             # 1. Old tail becomes trail
             old_tail = state[p_body].pop()  # Remove the last segment
-            state[p_trail].add(old_tail)
+            grid[cell_index(old_tail)] = owner
+            state["new_trail"].append((old_tail, owner))
 
             # 2. New head based on velocity
             current_head = state[p_body][0]
@@ -113,13 +126,9 @@ def start_game(parent_frame, on_game_over):
         head1, head2 = state["p1_body"][0], state["p2_body"][0]
         tail1, tail2 = state["p1_body"][1], state["p2_body"][1]
 
-        # Wall Check
-        if not (4 <= head1[0] < 792 and 4 <= head1[1] < 592): p1_hit = True
-        if not (4 <= head2[0] < 792 and 4 <= head2[1] < 592): p2_hit = True
-
-        # Trail Check (Hit self or opponent)
-        if head1 in state["trail_p1"] or head1 in state["trail_p2"]: p1_hit = True
-        if head2 in state["trail_p1"] or head2 in state["trail_p2"]: p2_hit = True
+        # Wall and Trail Check (Hit the arena edge, self or opponent): one grid lookup each
+        if grid[cell_index(head1)] != EMPTY: p1_hit = True
+        if grid[cell_index(head2)] != EMPTY: p2_hit = True
 
         # Bike Body Check (Hitting the opponent's tail segment)
         if head1 == head2 or head1 == tail2: p1_hit = True
@@ -132,14 +141,12 @@ def start_game(parent_frame, on_game_over):
             end_game("Team B")
         elif p2_hit:
             end_game("Team A")
-        else:
-            update_visuals()
-            parent_frame.after(25, check_inputs)
 
     def end_game(winner):
         if state["game_ending"]: return
         state["game_ending"] = True
         state["active"] = False
+        loop.stop()
         on_game_over(winner)
 
-    check_inputs()
\ No newline at end of file
+    loop = gameLoop.run(parent_frame, check_inputs, update_visuals, step_hz=STEP_HZ)
\ No newline at end of file
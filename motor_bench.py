@@ -0,0 +1,159 @@
+# Off-car benchmark for motor_controller.py: runs its real main() against gpiozero's mock pins and feeds it
+# drive packets over localhost UDP, the same way the hub does.
+#
+#   python motor_bench.py                     latency, throughput and failsafe runs with the default settings
+#   python motor_bench.py --latency-s 10      longer latency sample
+#
+# Reports:
+#   latency   - packet built on the "hub" -> first ESC write that follows it (p50 / p90 / p99 / max)
+#   flood     - packets per second the Pi loop keeps up with while the sender goes flat out
+#   failsafe  - last packet -> ramp-down starts, and -> both ESCs at 0
+
+import argparse
+import random
+import socket
+import threading
+import time
+
+from gpiozero.pins.mock import MockFactory, MockPWMPin
+
+import drive_protocol
+import motor_controller
+
+BENCH_PORT = 5055
+HUB_RATE_HZ = 50  # What network_drive_loop sends at
+
+
+class WriteLog:
+    """Collects every ESC write motor_controller reports, stamped with time.time_ns() like packet sent_ns."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.writes = []  # (time_ns, left, right, command)
+
+    def __call__(self, left, right, command):
+        now = time.time_ns()
+        with self.lock:
+            self.writes.append((now, left, right, command))
+
+    def since(self, start_ns):
+        with self.lock:
+            return [w for w in self.writes if w[0] >= start_ns]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def start_controller(port):
+    """Runs motor_controller.main in a thread on mock pins. Returns the Event that stops it."""
+    motor_controller.ARM_TIME = 0.0
+    stop = threading.Event()
+    factory = MockFactory(pin_class=MockPWMPin)
+    thread = threading.Thread(target=motor_controller.main,
+                              kwargs={"pin_factory": factory, "port": port, "stop": stop}, daemon=True)
+    thread.start()
+    time.sleep(0.2)  # Let it bind
+    return stop, thread
+
+
+def run_latency(sock, target, sender, log, seconds):
+    """
+    Sends at the hub's rate, alternating throttle so every command moves the ESCs. Send times are jittered
+    so they land at every point of the Pi's control tick instead of phase-locking to it.
+    """
+    start_ns = time.time_ns()
+    period = 1.0 / HUB_RATE_HZ
+    next_send = time.monotonic()
+    sent = {}  # seq -> sent_ns
+    for i in range(int(seconds * HUB_RATE_HZ)):
+        packet = sender.drive(0.0, 0.6 if i % 2 else 0.9)
+        parsed = drive_protocol.unpack(packet)
+        sent[parsed.seq] = parsed.sent_ns
+        sock.sendto(packet, target)
+        next_send += period * random.uniform(0.5, 1.5)
+        time.sleep(max(0.0, next_send - time.monotonic()))
+    time.sleep(0.1)
+
+    first_write = {}
+    for when, _, _, command in log.since(start_ns):
+        if command is not None and command.seq in sent and command.seq not in first_write:
+            first_write[command.seq] = when
+    latencies = sorted((first_write[seq] - sent[seq]) / 1e6 for seq in first_write)
+    lost = len(sent) - len(latencies)
+
+    print(f"BENCH: latency  {len(latencies)} commands | p50 {percentile(latencies, 50):.2f} ms "
+          f"| p90 {percentile(latencies, 90):.2f} ms | p99 {percentile(latencies, 99):.2f} ms "
+          f"| max {latencies[-1] if latencies else float('nan'):.2f} ms | never applied {lost}")
+
+
+def run_flood(sock, target, sender, seconds):
+    stats = motor_controller.stats
+    received_before, skipped_before = stats["received"], stats["skipped"]
+    sent = 0
+    start = time.monotonic()
+    while time.monotonic() - start < seconds:
+        sock.sendto(sender.drive(0.0, 0.5), target)
+        sent += 1
+    elapsed = time.monotonic() - start
+    time.sleep(0.1)
+
+    received = stats["received"] - received_before
+    skipped = stats["skipped"] - skipped_before
+    print(f"BENCH: flood    sent {sent / elapsed:,.0f} pps | read {received / elapsed:,.0f} pps "
+          f"| superseded {skipped} | dropped by the kernel {sent - received}")
+
+
+def run_failsafe(sock, target, sender, log):
+    """Holds full throttle until the ESCs settle, goes silent, and times the ramp down."""
+    for _ in range(HUB_RATE_HZ):
+        time.sleep(1.0 / HUB_RATE_HZ)
+        sock.sendto(sender.drive(0.0, 1.0), target)
+    last_ns = time.time_ns()
+    time.sleep(motor_controller.SIGNAL_TIMEOUT + 1.5)
+
+    ramp_ns = stopped_ns = None
+    for when, left, right, command in log.since(last_ns):
+        if command is None and ramp_ns is None:
+            ramp_ns = when
+        if left == 0 and right == 0:
+            stopped_ns = when
+            break
+
+    def ms(ns):
+        return f"{(ns - last_ns) / 1e6:.1f} ms" if ns is not None else "never"
+
+    print(f"BENCH: failsafe ramp starts {ms(ramp_ns)} | stopped {ms(stopped_ns)} "
+          f"(SIGNAL_TIMEOUT {motor_controller.SIGNAL_TIMEOUT * 1000:.0f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark motor_controller.py on mock pins over local UDP.")
+    parser.add_argument("--port", type=int, default=BENCH_PORT)
+    parser.add_argument("--latency-s", type=float, default=3.0, help="seconds of hub-rate traffic to time")
+    parser.add_argument("--flood-s", type=float, default=2.0, help="seconds to send as fast as possible")
+    args = parser.parse_args()
+
+    log = WriteLog()
+    motor_controller.add_listener(log)
+    stop, thread = start_controller(args.port)
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    target = ("127.0.0.1", args.port)
+    sender = drive_protocol.Sender()
+    try:
+        run_latency(sock, target, sender, log, args.latency_s)
+        run_flood(sock, target, sender, args.flood_s)
+        run_failsafe(sock, target, sender, log)
+    finally:
+        stop.set()
+        thread.join(timeout=1.0)
+        motor_controller.remove_listener(log)
+        sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,36 @@
-#This program runs on the pi only.
+#This program runs on the pi only. Copy drive_protocol.py next to it.
+#(motor_bench.py runs it on any Linux box against gpiozero's mock pins.)
 
 from gpiozero import Servo
-from gpiozero.pins.pigpio import PiGPIOFactory
+import select
 import socket
 import time
 
-# Hardware-timed PWM
-factory = PiGPIOFactory()
+import drive_protocol
 
 # --- HARDWARE CONFIG ---
 TEAM_NAME = "Team A"  # Change to "Team B" on the other Pi
 UDP_PORT = 5005
+ARM_TIME = 2.0  # ESCs need to see neutral for this long before they accept throttle
+SIGNAL_TIMEOUT = 0.2  # Start ramping down after this long with no drive commands
 
-# Speed Progression
-START_LIMIT = 0.22  # Slightly higher starting floor for better low-end torque
-SPEED_STEP = 0.08
-win_count = 0
+# --- CONTROL LOOP ---
+# The ESCs are written at a fixed rate, easing toward whatever the latest packet asked for,
+# so motor timing doesn't follow Wi-Fi jitter
+CONTROL_HZ = 100
+SLEW_RATE = 5.0  # Max ESC change per second while driving (0 -> full in 0.2 s)
+STOP_SLEW_RATE = 2.5  # Ramp toward 0 on signal loss (full -> stopped in 0.4 s)
+
+# Receive mode: True empties the socket on every wake-up and drives on the newest command only,
+# False applies every datagram in turn (the car lags behind if the Pi ever falls behind the hub)
+DRAIN_SOCKET = True
+DRAIN_LIMIT = 256  # Packets read per wake-up at most, so a flood can't starve the motors
+STATS_INTERVAL = 10.0  # Seconds between skipped-packet reports
+ECHO_COMMANDS = True  # Tell the hub when each drive command reaches the ESCs, for its latency stats
+
+# Speed Progression (the hub owns it and pushes its power level in POWER messages; see minigameRunner.push_car_power)
+START_LIMIT = 0.22  # Until the hub is heard from. Slightly higher starting floor for better low-end torque
+speed_ceiling = START_LIMIT
 
 # --- PHYSICAL CALIBRATION ---
 LEFT_SIDE_FLIP = 1
@@ -24,8 +39,24 @@ LEFT_TRIM = 1.0
 RIGHT_TRIM = 0.96  # Adjust if car veers slightly
 
 # --- HARDWARE SETUP ---
-esc_left = Servo(18, min_pulse_width=1 / 1000, max_pulse_width=2 / 1000, pin_factory=factory)
-esc_right = Servo(19, min_pulse_width=1 / 1000, max_pulse_width=2 / 1000, pin_factory=factory)
+esc_left = None
+esc_right = None
+
+# Receive counters, shared with the bench harness
+stats = {"received": 0, "skipped": 0, "stale": 0, "bad": 0, "duplicate": 0}
+
+
+def setup_hardware(pin_factory=None):
+    """
+    Builds the two ESC outputs. By default they use hardware-timed PWM through pigpio;
+    pass another gpiozero pin factory (e.g. MockFactory) to run without the car.
+    """
+    global esc_left, esc_right
+    if pin_factory is None:
+        from gpiozero.pins.pigpio import PiGPIOFactory  # Needs the pigpio daemon, so only imported on the car
+        pin_factory = PiGPIOFactory()
+    esc_left = Servo(18, min_pulse_width=1 / 1000, max_pulse_width=2 / 1000, pin_factory=pin_factory)
+    esc_right = Servo(19, min_pulse_width=1 / 1000, max_pulse_width=2 / 1000, pin_factory=pin_factory)
 
 
 def arcade_drive(x, y, ceiling):
@@ -55,57 +86,195 @@ def arcade_drive(x, y, ceiling):
     return final_l, final_r
 
 
-def main():
-    global win_count
+def receive_commands(sock, drive_seq, control_seq, timeout=SIGNAL_TIMEOUT):
+    """
+    Waits up to timeout for traffic, then reads what is already queued without blocking again.
+    Returns None on timeout, otherwise (drive, sender, controls): the newest DRIVE packet (or None), the
+    address it came from, and every new control message in arrival order. Older drive commands read in the
+    same wake-up are counted and dropped.
+    Control messages are acked as they are read, including resends of ones already applied.
+    """
+    ready, _, _ = select.select([sock], [], [], timeout)
+    if not ready:
+        return None
+
+    drive = sender = None
+    controls = []
+    for _ in range(DRAIN_LIMIT if DRAIN_SOCKET else 1):
+        try:
+            data, addr = sock.recvfrom(1024)
+        except BlockingIOError:
+            break  # Socket is empty
+
+        stats["received"] += 1
+        packet = drive_protocol.unpack(data)
+        if packet is None:
+            stats["bad"] += 1  # Not ours, or an old text-protocol hub
+            continue
+
+        if packet.type in (drive_protocol.ACK, drive_protocol.ECHO):
+            continue  # Only the hub expects these
+
+        if packet.type != drive_protocol.DRIVE:
+            try:
+                sock.sendto(drive_protocol.ack(packet), addr)
+            except OSError:
+                pass  # The hub resends, and we ack again then
+            if control_seq.accept(packet):
+                controls.append(packet)
+            else:
+                stats["duplicate"] += 1  # Our ack was lost, or it was overtaken by a newer one
+            continue
+
+        # Arrived after a newer command (Wi-Fi reordering); acting on it would jerk the car backwards in time
+        if not drive_seq.accept(packet):
+            stats["stale"] += 1
+            continue
+        if drive is not None:
+            stats["skipped"] += 1  # Superseded before we got to it
+        drive, sender = packet, addr
+
+    return drive, sender, controls
+
+
+def drive_target(x_input, y_input):
+    """ESC values (left, right) for a DRIVE packet's stick x, y."""
+    # Apply Deadzone (Shared with PC logic)
+    if abs(x_input) < 0.12 and abs(y_input) < 0.12:
+        return 0.0, 0.0
+
+    # Calculate Speed Progression
+    # Process Arcade Drive
+    return arcade_drive(x_input, y_input, speed_ceiling)
+
+
+def slew(current, target, max_step):
+    """Moves current toward target by at most max_step."""
+    if target > current:
+        return min(target, current + max_step)
+    return max(target, current - max_step)
+
+
+def main(pin_factory=None, port=UDP_PORT, stop=None, host="0.0.0.0"):
+    """
+    Runs the car until Ctrl+C, or until stop (a threading.Event) is set.
+    pin_factory, port and host are for running it off the car; see motor_bench.py and car_sim.py.
+    """
+    global speed_ceiling
+    if esc_left is None or pin_factory is not None:
+        setup_hardware(pin_factory)
+
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.bind(("0.0.0.0", UDP_PORT))
-    sock.settimeout(0.2)  # Safety timeout
+    sock.bind((host, port))
+    sock.setblocking(False)  # receive_commands does the waiting, up to the next control tick
 
-    print(f"[{TEAM_NAME}] ARMING... Port: {UDP_PORT}")
+    print(f"[{TEAM_NAME}] ARMING... Port: {port}")
     esc_left.value = 0
     esc_right.value = 0
-    time.sleep(2)
+    time.sleep(ARM_TIME)
     print(f"[{TEAM_NAME}] ARCADE LINK ONLINE.")
 
+    drive_seq = drive_protocol.SequenceTracker()
+    control_seq = drive_protocol.SequenceTracker()
+    reported = None
+    next_report = time.monotonic() + STATS_INTERVAL
+
+    period = 1.0 / CONTROL_HZ
+    target_l, target_r = 0.0, 0.0
+    out_l, out_r = 0.0, 0.0
+    command = None  # Drive packet the current target came from
+    command_from = None  # Where to echo it
+    echoed_seq = None
+    last_drive = float("-inf")  # Stay stopped until the hub is heard from
+    next_tick = time.monotonic()
+
     try:
-        while True:
-            try:
-                data, addr = sock.recvfrom(1024)
-                msg = data.decode('utf-8')
+        while stop is None or not stop.is_set():
+            # --- NETWORK: update the target until the next tick is due ---
+            next_tick += period
+            while True:
+                received = receive_commands(sock, drive_seq, control_seq, max(0.0, next_tick - time.monotonic()))
+                if received is None:
+                    break  # Tick is due
+                drive, sender, controls = received
 
-                if msg == "WIN":
-                    win_count += 1
-                    print(f"LEVEL UP! Speed is now {START_LIMIT + (win_count * SPEED_STEP):.2f}")
-                    continue
+                # Control messages are never skipped, and go first so a new ceiling applies to this drive command
+                for packet in controls:
+                    if packet.type == drive_protocol.POWER and packet.a != speed_ceiling:
+                        speed_ceiling = max(0.0, min(1.0, packet.a))
+                        print(f"[{TEAM_NAME}] SPEED SET: ceiling is now {speed_ceiling:.2f}")
 
-                if "," in msg:
-                    parts = msg.split(",")
-                    x_input = float(parts[0])
-                    y_input = float(parts[1])
+                if drive is not None:
+                    command, command_from = drive, sender
+                    last_drive = time.monotonic()
+                if command is not None and (drive is not None or controls):
+                    target_l, target_r = drive_target(command.a, command.b)
 
-                    # Apply Deadzone (Shared with PC logic)
-                    if abs(x_input) < 0.12 and abs(y_input) < 0.12:
-                        esc_left.value, esc_right.value = 0, 0
-                        continue
+            # --- CONTROL TICK ---
+            now = time.monotonic()
+            if now - next_tick > period:
+                next_tick = now  # Fell a whole tick behind (Pi busy); don't try to catch up in a burst
 
-                    # Calculate Speed Progression
-                    ceiling = min(1.0, START_LIMIT + (win_count * SPEED_STEP))
+            if now - last_drive > SIGNAL_TIMEOUT:
+                # SAFE STOP: no signal for 200ms, ease off instead of slamming the ESCs to 0
+                target_l, target_r = 0.0, 0.0
+                command = None
+                max_step = STOP_SLEW_RATE * period
+            else:
+                max_step = SLEW_RATE * period
 
-                    # Process Arcade Drive
-                    l_val, r_val = arcade_drive(x_input, y_input, ceiling)
+            new_l = slew(out_l, target_l, max_step)
+            new_r = slew(out_r, target_r, max_step)
+            if new_l != out_l or new_r != out_r:
+                if new_l != out_l:
+                    esc_left.value = out_l = new_l
+                if new_r != out_r:
+                    esc_right.value = out_r = new_r
+                for listener in list(_listeners):
+                    listener(out_l, out_r, command)
 
-                    # Write to hardware
-                    esc_left.value = l_val
-                    esc_right.value = r_val
+            # The tick a command is first acted on is its apply time, whether or not the outputs had to move
+            if ECHO_COMMANDS and command is not None and command.seq != echoed_seq:
+                echoed_seq = command.seq
+                try:
+                    sock.sendto(drive_protocol.echo(command, time.time_ns(), (time.monotonic() - last_drive) * 1000),
+                                command_from)
+                except OSError:
+                    pass
 
-            except socket.timeout:
-                # SAFE STOP: No signal for 200ms
-                esc_left.value = 0
-                esc_right.value = 0
+            if now >= next_report:
+                next_report = now + STATS_INTERVAL
+                dropped = (stats["skipped"], stats["stale"], stats["bad"], stats["duplicate"])
+                if any(dropped) and dropped != reported:
+                    print(f"[{TEAM_NAME}] Skipped {stats['skipped']} superseded, {stats['stale']} out-of-order, "
+                          f"{stats['bad']} malformed, {stats['duplicate']} repeated control packets so far")
+                    reported = dropped
 
     except KeyboardInterrupt:
+        pass
+    finally:
         esc_left.value = 0
         esc_right.value = 0
+        sock.close()
+
+
+# --- WRITE HOOKS ---
+# motor_bench.py listens here to time each command from the hub to the ESCs, car_sim.py to log them.
+_listeners = []
+
+
+def add_listener(listener):
+    """
+    listener(left, right, command) is called after each tick that changed the ESC outputs.
+    command is the drive Packet being followed, or None while ramping down after signal loss.
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+import time
+import tkinter as tk
+from collections import deque
+
+import canvasScene
+import gameLoop
+import gameSession
+
+TOGGLE_KEY = "<F3>"
+REFRESH_MS = 250
+WINDOW_S = 1.0  # Worst frame / busy share are measured over this much history
+
+
+class PerfOverlay:
+    """
+    Toggleable timing panel in the corner of the window. It only listens to the hub's hooks (gameSession for
+    every after() callback, gameLoop for the update/render split), so games need no extra code.
+
+      update / render - last GameLoop frame (games not on gameLoop show their whole callback as update)
+      idle            - time Tk had between the game's callbacks, averaged over the last second
+      items           - live items on the game's canvases
+      worst           - longest gap between frames in the last second
+    """
+
+    def __init__(self, root, toggle_key=TOGGLE_KEY, visible=False):
+        self.root = root
+        self.visible = False
+        self.session = None  # Whichever game ran a callback most recently
+        self.loop_timing = None
+        self.loop_seen = 0.0
+
+        self._callbacks = deque()  # (start, end) of recent callbacks, perf_counter seconds
+        self._label = tk.Label(root, font=("Courier", 11, "bold"), fg="#39FF14", bg="#000000", justify="left",
+                               anchor="nw", padx=8, pady=6)
+        self._after_id = None
+        root.bind_all(toggle_key, lambda _e: self.toggle())
+        if visible:
+            self.show()
+
+    # --- PUBLIC API ---
+    def toggle(self):
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        if self.visible:
+            return
+        self.visible = True
+        gameSession.add_listener(self._on_callback)
+        gameLoop.add_listener(self._on_loop_frame)
+        self._label.place(relx=1.0, x=-10, y=10, anchor="ne")
+        self._refresh()
+
+    def hide(self):
+        if not self.visible:
+            return
+        self.visible = False
+        gameSession.remove_listener(self._on_callback)
+        gameLoop.remove_listener(self._on_loop_frame)
+        self._label.place_forget()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._callbacks.clear()
+
+    # --- HOOKS ---
+    def _on_callback(self, session, start, end):
+        if session is not self.session:
+            self.session = session
+            self._callbacks.clear()
+            self.loop_timing = None
+        self._callbacks.append((start, end))
+        cutoff = end - WINDOW_S
+        while self._callbacks and self._callbacks[0][0] < cutoff:
+            self._callbacks.popleft()
+
+    def _on_loop_frame(self, loop, timing):
+        self.loop_timing = timing
+        self.loop_seen = time.perf_counter()
+
+    # --- DRAWING ---
+    def _refresh(self):
+        self._after_id = None
+        if not self.visible:
+            return
+        self._label.config(text=self._report())
+        self._label.lift()
+        self._after_id = self.root.after(REFRESH_MS, self._refresh)
+
+    def _report(self):
+        session = self.session
+        if session is None or session.stopped or not self._callbacks:
+            return "PERF  no game running"
+
+        calls = list(self._callbacks)
+        span = max(calls[-1][1] - calls[0][0], 1e-6)
+        busy = sum(end - start for start, end in calls)
+        idle_ms = max(0.0, span - busy) / len(calls) * 1000
+        gaps = [b[0] - a[0] for a, b in zip(calls, calls[1:])]
+        worst_ms = max(gaps) * 1000 if gaps else 0.0
+
+        if self.loop_timing is not None and time.perf_counter() - self.loop_seen < WINDOW_S:
+            update_ms, render_ms = self.loop_timing.update_ms, self.loop_timing.render_ms
+            render = f"{render_ms:5.1f} ms"
+        else:
+            update_ms = (calls[-1][1] - calls[-1][0]) * 1000
+            render_ms = 0.0
+            render = "    - (not on gameLoop)"
+
+        budget_ms = gameLoop.FRAME_BUDGET_MS
+        flag = "  LATE" if worst_ms > 2 * budget_ms or update_ms + render_ms > budget_ms else ""
+        return (f"PERF  {session.name}{flag}\n"
+                f"update {update_ms:5.1f} ms\n"
+                f"render {render}\n"
+                f"idle   {idle_ms:5.1f} ms/frame\n"
+                f"items  {self._item_count(session.frame):5d}\n"
+                f"worst  {worst_ms:5.1f} ms (1 s)")
+
+    @staticmethod
+    def _item_count(frame):
+        total = 0
+        stack = [frame] if frame is not None else []
+        while stack:
+            widget = stack.pop()
+            try:
+                children = widget.winfo_children()
+            except tk.TclError:
+                continue
+            if isinstance(widget, tk.Canvas):
+                total += canvasScene.item_count(widget)
+            stack.extend(children)
+        return total
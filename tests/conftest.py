@@ -0,0 +1,215 @@
+import itertools
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gameLoop  # noqa: E402
+import inputService  # noqa: E402
+
+
+class HeadlessCanvas:
+    """Just enough of tk.Canvas for a game to run with no display. Items are kept as plain dicts."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = options
+        self.items = {}  # item id -> {"kind", "coords", "options", "tags"}
+        if master is not None:
+            master.children.append(self)
+
+    def __getattr__(self, name):
+        if name.startswith("create_"):
+            kind = name[len("create_"):]
+
+            def create(*coords, **options):
+                item = next(self._ids)
+                tags = options.pop("tags", ())
+                self.items[item] = {"kind": kind, "coords": list(_flatten(coords)), "options": options,
+                                    "tags": (tags,) if isinstance(tags, str) else tuple(tags)}
+                return item
+            return create
+        raise AttributeError(name)
+
+    def _find(self, tag_or_id):
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self.items else []
+        if tag_or_id == "all":
+            return list(self.items)
+        return [i for i, item in self.items.items() if tag_or_id in item["tags"]]
+
+    def coords(self, item, *coords):
+        if coords:
+            self.items[item]["coords"] = list(_flatten(coords))
+        return self.items[item]["coords"]
+
+    def move(self, tag_or_id, dx, dy):
+        for item in self._find(tag_or_id):
+            c = self.items[item]["coords"]
+            self.items[item]["coords"] = [v + (dx if n % 2 == 0 else dy) for n, v in enumerate(c)]
+
+    def itemconfig(self, item, **options):
+        self.items[item]["options"].update(options)
+
+    def delete(self, tag_or_id):
+        for item in self._find(tag_or_id):
+            del self.items[item]
+
+    def find_all(self):
+        return tuple(self.items)
+
+    def tag_lower(self, *args):
+        pass
+
+    def pack(self, *args, **kwargs):
+        pass
+
+    def winfo_exists(self):
+        return True
+
+    def destroy(self):
+        if self.master is not None and self in self.master.children:
+            self.master.children.remove(self)
+
+
+class HeadlessFrame:
+    """Stands in for the parent_frame (and any tk.Frame/tk.Label a game makes). after() calls wait in a queue."""
+
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = options
+        self.children = []
+        self.pending = []  # [after id, callback]
+        self._after_ids = itertools.count(1)
+        if master is not None:
+            master.children.append(self)
+
+    def after(self, ms, func=None, *args):
+        after_id = f"after#{next(self._after_ids)}"
+        self.pending.append([after_id, lambda: func(*args)])
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending = [entry for entry in self.pending if entry[0] != after_id]
+
+    def run_pending(self):
+        """Runs every callback queued so far (callbacks they queue wait for the next call)."""
+        queued, self.pending = self.pending, []
+        for _, callback in queued:
+            callback()
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def winfo_exists(self):
+        return True
+
+    def pack(self, *args, **kwargs):
+        pass
+
+    def place(self, *args, **kwargs):
+        pass
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
+
+    def destroy(self):
+        if self.master is not None and self in self.master.children:
+            self.master.children.remove(self)
+
+
+def _flatten(coords):
+    for c in coords:
+        if isinstance(c, (list, tuple)):
+            yield from c
+        else:
+            yield c
+
+
+class HeadlessPhoto:
+    """PhotoImage stand-in: keeps the decoded PIL image so sizes still add up."""
+
+    def __init__(self, image=None, **options):
+        self.image = image
+        self.options = options
+
+    def width(self):
+        return self.image.width if self.image is not None else self.options.get("width", 0)
+
+    def height(self):
+        return self.image.height if self.image is not None else self.options.get("height", 0)
+
+    def put(self, *args, **kwargs):
+        pass
+
+
+class ScriptedInput(inputService.InputService):
+    """The real service and reader, with controller state and button presses set by the test instead of pygame."""
+
+    def __init__(self, controllers=2):
+        super().__init__()
+        self._joy_index = {i: i for i in range(controllers)}
+        self.hold([(0.0, 0.0)] * controllers)
+
+    def hold(self, axes, buttons=()):
+        """axes is one tuple per controller; buttons is the set of (joy, button) held down."""
+        controllers = tuple(
+            inputService.ControllerState(tuple(a), tuple(1 if (joy, b) in buttons else 0 for b in range(10)))
+            for joy, a in enumerate(axes))
+        self._snapshot = inputService.InputSnapshot(self._snapshot.tick + 1, 0.0, controllers)
+
+    def press(self, joy, button):
+        self._record(0, inputService.BUTTON_DOWN, joy, button, 1)
+        self._record(0, inputService.BUTTON_UP, joy, button, 0)
+
+
+class Loops(list):
+    """Every GameLoop a game asked for, built but not started: tests step them by hand."""
+
+    def step(self, n=1):
+        if not self:
+            return
+        loop = self[-1]
+        for _ in range(n):
+            if not loop.running:
+                return
+            loop.update(loop.dt)
+            if loop.running and loop.render is not None:
+                loop.render(0.0)
+
+
+@pytest.fixture
+def headless(monkeypatch):
+    """Runs games with no display: fake Tk widgets, scripted controllers, hand-stepped game loops."""
+    import tkinter as tk
+
+    from PIL import ImageTk
+
+    import assetCache
+
+    monkeypatch.setattr(tk, "Canvas", HeadlessCanvas)
+    monkeypatch.setattr(tk, "Frame", HeadlessFrame)
+    monkeypatch.setattr(tk, "Label", HeadlessFrame)
+    monkeypatch.setattr(tk, "PhotoImage", HeadlessPhoto)
+    monkeypatch.setattr(ImageTk, "PhotoImage", HeadlessPhoto)
+    monkeypatch.setattr(assetCache, "_shared", assetCache.AssetCache())
+
+    service = ScriptedInput()
+    monkeypatch.setattr(inputService, "_shared", service)
+
+    loops = Loops()
+
+    def run(widget, update, render=None, **options):
+        loop = gameLoop.GameLoop(widget, update, render, **options)
+        loop.running = True
+        loops.append(loop)
+        return loop
+
+    monkeypatch.setattr(gameLoop, "run", run)
+    return service, loops
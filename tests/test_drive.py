@@ -0,0 +1,37 @@
+import pytest
+
+import carDrive
+import drive_protocol
+
+motor_controller = pytest.importorskip("motor_controller")  # Needs gpiozero
+
+
+def wheels(stick_x, stick_y, ceiling=0.5, monkeypatch=None):
+    """Stick on the hub -> DRIVE packet -> ESC values on the car, as wheel directions (flips undone)."""
+    packet = drive_protocol.unpack(drive_protocol.Sender().drive(*carDrive.stick_command(stick_x, stick_y)))
+    monkeypatch.setattr(motor_controller, "speed_ceiling", ceiling)
+    left, right = motor_controller.drive_target(packet.a, packet.b)
+    return left * motor_controller.LEFT_SIDE_FLIP, right * motor_controller.RIGHT_SIDE_FLIP
+
+
+def test_forward_drives_both_wheels_forward(monkeypatch):
+    left, right = wheels(0.0, -1.0, monkeypatch=monkeypatch)
+    assert left < 0 and right < 0  # Same direction: the car drives, it doesn't spin
+    assert left == pytest.approx(-0.5)
+    assert right == pytest.approx(-0.5 * motor_controller.RIGHT_TRIM)
+
+
+def test_backward_drives_both_wheels_backward(monkeypatch):
+    left, right = wheels(0.0, 1.0, monkeypatch=monkeypatch)
+    assert left > 0 and right > 0
+
+
+def test_ceiling_scales_output(monkeypatch):
+    slow = wheels(0.0, -1.0, ceiling=0.3, monkeypatch=monkeypatch)
+    fast = wheels(0.0, -1.0, ceiling=0.9, monkeypatch=monkeypatch)
+    assert fast[0] == pytest.approx(3 * slow[0])
+
+
+def test_deadzone_stops(monkeypatch):
+    assert carDrive.stick_command(0.1, -0.15) == (0.0, 0.0)
+    assert wheels(0.1, -0.15, monkeypatch=monkeypatch) == (0.0, 0.0)
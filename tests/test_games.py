@@ -0,0 +1,38 @@
+import importlib
+import os
+import random
+
+import pytest
+
+from conftest import HeadlessFrame
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "minigames")
+GAMES = sorted(f[:-3] for f in os.listdir(GAMES_DIR) if f.endswith(".py") and f != "__init__.py")
+
+SECONDS = 20
+
+
+@pytest.mark.parametrize("game", GAMES)
+def test_game_runs_on_the_game_loop(headless, game):
+    """Every game starts headless, drives itself through gameLoop, and survives 20 s of random play."""
+    service, loops = headless
+    module = importlib.import_module(f"minigames.{game}")
+    rng = random.Random(game)
+    random.seed(game)
+
+    frame = HeadlessFrame()
+    results = []
+    module.start_game(frame, results.append)
+    assert loops, f"{game} doesn't run on gameLoop"
+
+    for step in range(SECONDS * 60):
+        if results:
+            break
+        if step % 10 == 0:
+            service.hold([(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(2)])
+        if step % 7 == 0:
+            service.press(rng.randrange(2), rng.randrange(4))
+        loops.step()
+        frame.run_pending()
+
+    assert len(results) <= 1, f"{game} reported more than one result: {results}"
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from conftest import HeadlessFrame
+from minigames import platforming
+
+FLOOR_Y = 550
+
+
+def player_y(frame, color="blue"):
+    """Team A's world y, read back off the canvas (both it and the floor carry the same camera offset)."""
+    canvas = frame.children[0]
+    rects = [item for item in canvas.items.values() if item["kind"] == "rectangle"]
+    player = next(r for r in rects if r["options"].get("fill") == color)
+    floor = next(r for r in rects if r["coords"][2] - r["coords"][0] == 800 and "scroll" in r["tags"]
+                 and r["options"].get("fill") != "gold")
+    return player["coords"][1] - floor["coords"][1] + FLOOR_Y
+
+
+def start(headless):
+    _, loops = headless
+    random.seed(7)
+    frame = HeadlessFrame()
+    platforming.start_game(frame, lambda winner: None)
+    loops.step(30)  # Drop onto the floor
+    assert player_y(frame) == pytest.approx(FLOOR_Y - platforming.PLAYER_SIZE)
+    return frame
+
+
+def test_press_edge_jumps(headless):
+    service, loops = headless
+    frame = start(headless)
+
+    service.press(0, platforming.BUTTON_A)
+    before = player_y(frame)
+    loops.step()
+
+    # The press sets vy to JUMP_STRENGTH, then one step of gravity and movement
+    dt = loops[-1].dt
+    assert player_y(frame) - before == pytest.approx((platforming.JUMP_STRENGTH + platforming.GRAVITY * dt) * dt)
+
+
+def test_no_press_no_jump(headless):
+    _, loops = headless
+    frame = start(headless)
+    before = player_y(frame)
+    loops.step(5)
+    assert player_y(frame) == pytest.approx(before)
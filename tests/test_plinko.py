@@ -0,0 +1,64 @@
+import math
+import random
+
+from conftest import HeadlessFrame
+from minigames import plinko
+
+
+def token_count(frame):
+    """Falling tokens on the canvas: the only ovals drawn with a width-2 outline."""
+    canvas = frame.children[0]
+    return sum(1 for item in canvas.items.values() if item["kind"] == "oval" and item["options"].get("width") == 2)
+
+
+def test_three_tokens_by_default(headless):
+    _, loops = headless
+    frame = HeadlessFrame()
+    plinko.start_game(frame, lambda winner: None)
+    loops.step()
+    texts = [item["options"]["text"] for item in frame.children[0].items.values() if item["kind"] == "text"]
+    assert texts.count("3 LEFT") == 2
+
+
+def test_token_rain_load_through_grid_and_slots(headless, monkeypatch):
+    """Under a full rain every grid lookup still finds each peg in reach, and every slot matches a linear scan."""
+    service, loops = headless
+    checked = {"lookups": 0, "landed": 0}
+    real_pegs_near, real_slot_at = plinko.pegs_near, plinko.slot_at
+
+    def pegs_near(grid, reach, x, y):
+        found = list(real_pegs_near(grid, reach, x, y))
+        in_reach = {peg for cell in grid.values() for peg in cell if math.dist(peg, (x, y)) < reach}
+        assert in_reach <= set(found)
+        checked["lookups"] += 1
+        return found
+
+    def slot_at(slot_edges, x):
+        slot = real_slot_at(slot_edges, x)
+        assert slot == next((i for i, edge in enumerate(slot_edges) if x <= edge), len(slot_edges) - 1)
+        checked["landed"] += 1
+        return slot
+
+    monkeypatch.setattr(plinko, "pegs_near", pegs_near)
+    monkeypatch.setattr(plinko, "slot_at", slot_at)
+
+    random.seed(11)
+    frame = HeadlessFrame()
+    results = []
+    plinko.start_game(frame, results.append, token_rain=True)
+
+    peak = 0
+    for step in range(60 * 30):
+        if results:
+            break
+        # Both players hold A and sweep their droppers across the board
+        sweep = math.sin(step / 40)
+        service.hold([(sweep, 0.0), (-sweep, 0.0)], buttons={(0, plinko.BUTTON_A), (1, plinko.BUTTON_A)})
+        loops.step()
+        if not results:
+            peak = max(peak, token_count(frame))
+
+    assert results, "the rain never finished"
+    assert peak > 100  # Tokens in the air at once
+    assert checked["landed"] == 2 * plinko.RAIN_TOKENS
+    assert checked["lookups"] > 10000